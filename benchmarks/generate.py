@@ -0,0 +1,103 @@
+# benchmarks/generate.py
+
+import csv
+import datetime
+import random
+
+from budgetbuddy.core.models import UserProfile, Income, Expense
+
+
+# (category, weight, typical amount, spread) for expenses
+EXPENSES = [
+    ("Food", 30, 18.0, 0.8),
+    ("Groceries", 20, 65.0, 0.5),
+    ("Transport", 15, 12.0, 0.7),
+    ("Shopping", 10, 45.0, 1.0),
+    ("Bills", 8, 90.0, 0.4),
+    ("Entertainment", 7, 25.0, 0.8),
+    ("Health", 4, 40.0, 0.9),
+    ("Travel", 3, 300.0, 0.9),
+    ("Rent", 3, 1200.0, 0.05),
+]
+
+INCOMES = [
+    ("Salary", 70, 2500.0, 0.1),
+    ("Freelance", 20, 400.0, 0.8),
+    ("Gift", 10, 50.0, 1.0),
+]
+
+MERCHANTS = {
+    "Food": ["Joe's Coffee", "Pizza Place", "Sushi Bar", "Corner Deli", "Taco Truck"],
+    "Groceries": ["FreshMart", "Green Grocer", "SuperSave", "Farmers Market"],
+    "Transport": ["Metro card", "Ride share", "Fuel", "Parking"],
+    "Shopping": ["Online order", "Bookstore", "Hardware store", "Clothing"],
+    "Bills": ["Electric", "Water", "Phone", "Internet"],
+    "Entertainment": ["Cinema", "Streaming", "Concert", "Games"],
+    "Health": ["Pharmacy", "Dentist", "Gym"],
+    "Travel": ["Airline", "Hotel", "Car rental"],
+    "Rent": ["Monthly rent"],
+    "Salary": ["Payroll"],
+    "Freelance": ["Client invoice", "Consulting"],
+    "Gift": ["Birthday", "Holiday"],
+}
+
+# share of transactions that are income
+INCOME_SHARE = 0.08
+START_DATE = datetime.date(2020, 1, 1)
+# transactions are spread over this many years from START_DATE
+YEARS = 5
+
+
+def _pick(rng, table, weights):
+    category, _, typical, spread = rng.choices(table, weights=weights)[0]
+    # log-normal amounts: mostly near the typical value, with a long tail
+    amount = round(typical * rng.lognormvariate(0.0, spread), 2)
+    description = "{} #{}".format(rng.choice(MERCHANTS[category]), rng.randrange(1000))
+    return category, amount, description
+
+
+def generate_records(n, seed=0, years=YEARS):
+    """
+    Yield n (date, amount, category, description, type) tuples spread over
+    `years` years from START_DATE, in random order (like a merged export).
+
+    The same n and seed always give the same records.
+    """
+    rng = random.Random(seed)
+    days = 365 * years
+    expense_weights = [row[1] for row in EXPENSES]
+    income_weights = [row[1] for row in INCOMES]
+    start = START_DATE.toordinal()
+    for _ in range(n):
+        date = datetime.date.fromordinal(start + rng.randrange(days)).isoformat()
+        if rng.random() < INCOME_SHARE:
+            category, amount, description = _pick(rng, INCOMES, income_weights)
+            yield date, amount, category, description, "income"
+        else:
+            category, amount, description = _pick(rng, EXPENSES, expense_weights)
+            yield date, amount, category, description, "expense"
+
+
+def generated_months(years=YEARS):
+    """(year, month) of every month the generated transactions can fall in."""
+    last = datetime.date.fromordinal(START_DATE.toordinal() + 365 * years - 1)
+    return [(y, m) for y in range(START_DATE.year, last.year + 1) for m in range(1, 13)
+            if (START_DATE.year, START_DATE.month) <= (y, m) <= (last.year, last.month)]
+
+
+def generate_profile(name, n, seed=0, columnar=False):
+    """Return a UserProfile holding n generated transactions."""
+    profile = UserProfile(name, columnar=columnar)
+    profile.extend_transactions(
+        (Income if tx_type == "income" else Expense)(date, amount, category, description)
+        for date, amount, category, description, tx_type in generate_records(n, seed)
+    )
+    return profile
+
+
+def write_csv(path, n, seed=0):
+    """Write n generated transactions to a CSV file in the import/export format."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["date", "amount", "category", "description", "type"])
+        writer.writerows(generate_records(n, seed))
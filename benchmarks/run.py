@@ -0,0 +1,248 @@
+# benchmarks/run.py
+
+"""
+Benchmarks for the main BudgetBuddy operations on large generated profiles.
+
+    python -m benchmarks.run                                # 10k and 100k transactions
+    python -m benchmarks.run --sizes 10000,100000,1000000 --ops load_profiles,month_totals
+    python -m benchmarks.run --save-baseline baseline.json  # record results
+    python -m benchmarks.run --baseline baseline.json       # compare, exit 1 on a regression
+
+For every operation and size the best of --repeat runs is reported as
+time, throughput (transactions handled per second, or queries per second
+for month_totals) and latency per call; peak
+memory comes from one extra run under tracemalloc (which slows it down,
+so it is never timed). Data comes from benchmarks.generate, so the same
+--seed always benchmarks the same transactions.
+"""
+
+import argparse
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.generate import generate_profile, generated_months, write_csv
+from budgetbuddy.core.budget import Budget
+from budgetbuddy.data import csvio, repository
+
+
+DEFAULT_SIZES = [10000, 100000]
+# allowed slowdown / memory growth over the baseline before it counts as a regression
+DEFAULT_TOLERANCE = 0.25
+# month queries are too fast to time once, so every month is queried this many times
+QUERY_ROUNDS = 20
+
+
+# ===== Benchmarks =====
+# Each one is called as bench(size, seed, workdir) and returns (run, calls, items):
+# run() does the work once, calls is how many operations one run makes and
+# items how many things (transactions or queries) it handles, for the throughput.
+
+def bench_load_profiles(size, seed, workdir):
+    profiles = {"bench": generate_profile("bench", size, seed)}
+    repository.save_profiles(profiles)
+    return (lambda: repository.load_profiles()["bench"].transactions), 1, size
+
+
+def bench_save_profiles(size, seed, workdir):
+    profiles = {"bench": generate_profile("bench", size, seed)}
+    return (lambda: repository.save_profiles(profiles)), 1, size
+
+
+def bench_import_csv(size, seed, workdir):
+    path = workdir / "import.csv"
+    write_csv(path, size, seed)
+
+    def run():
+        profile = repository.create_profile({}, "bench")
+        csvio.import_transactions_from_csv(profile, path)
+    return run, 1, size
+
+
+def bench_export_csv(size, seed, workdir):
+    profile = generate_profile("bench", size, seed)
+    path = workdir / "export.csv"
+    return (lambda: csvio.export_profile_to_csv(profile, path)), 1, size
+
+
+def bench_list_transactions(size, seed, workdir):
+    profile = generate_profile("bench", size, seed)
+    months = generated_months()
+
+    def run():
+        for _ in range(QUERY_ROUNDS):
+            for year, month in months:
+                profile.list_transactions(month, year)
+    # every round returns each transaction once
+    return run, len(months) * QUERY_ROUNDS, size * QUERY_ROUNDS
+
+
+def bench_month_totals(size, seed, workdir):
+    profile = generate_profile("bench", size, seed)
+    months = generated_months()
+
+    def run():
+        for _ in range(QUERY_ROUNDS):
+            for year, month in months:
+                Budget(profile).month_totals(month, year)
+    calls = len(months) * QUERY_ROUNDS
+    return run, calls, calls
+
+
+BENCHMARKS = {
+    "load_profiles": bench_load_profiles,
+    "save_profiles": bench_save_profiles,
+    "import_csv": bench_import_csv,
+    "export_csv": bench_export_csv,
+    "list_transactions": bench_list_transactions,
+    "month_totals": bench_month_totals,
+}
+
+
+# ===== Running =====
+
+def measure(bench, size, seed=0, repeat=3):
+    """
+    Run one benchmark for one size in a scratch directory.
+
+    Returns {"seconds", "throughput", "latency", "peak_kb"}.
+    """
+    workdir = Path(tempfile.mkdtemp(prefix="budgetbuddy-bench-"))
+    original_data_file = repository.DATA_FILE
+    repository.DATA_FILE = workdir / "data.json"
+    try:
+        run, calls, items = bench(size, seed, workdir)
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        tracemalloc.start()
+        try:
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    finally:
+        repository.DATA_FILE = original_data_file
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "seconds": best,
+        "throughput": items / best if best else float("inf"),
+        "latency": best / calls,
+        "peak_kb": peak / 1024,
+    }
+
+
+def run_all(names, sizes, seed=0, repeat=3, progress=None):
+    """Return {name: {str(size): result}} for every benchmark and size."""
+    results = {}
+    for name in names:
+        for size in sizes:
+            result = measure(BENCHMARKS[name], size, seed, repeat)
+            results.setdefault(name, {})[str(size)] = result
+            if progress is not None:
+                progress(name, size, result)
+    return results
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare results against baseline results (same layout).
+
+    Returns a list of (name, size, metric, baseline value, new value) for every
+    time or peak memory more than `tolerance` above the baseline.
+    Operations or sizes missing from the baseline are not compared.
+    """
+    regressions = []
+    for name, by_size in results.items():
+        for size, result in by_size.items():
+            base = baseline.get(name, {}).get(size)
+            if base is None:
+                continue
+            for metric in ("seconds", "peak_kb"):
+                if metric in base and result[metric] > base[metric] * (1 + tolerance):
+                    regressions.append((name, size, metric, base[metric], result[metric]))
+    return regressions
+
+
+def load_baseline(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def save_baseline(path, results, seed):
+    data = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def _print_row(name, size, result, base=None):
+    change = ""
+    if base is not None and base.get("seconds"):
+        change = "{:+.0%}".format(result["seconds"] / base["seconds"] - 1)
+    print("{:18} {:>9} {:>10.4f} {:>12,.0f} {:>12.4f} {:>10.1f} {:>8}".format(
+        name, size, result["seconds"], result["throughput"],
+        result["latency"] * 1000, result["peak_kb"] / 1024, change))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark BudgetBuddy operations on generated profiles.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma separated numbers of transactions (default: %(default)s)")
+    parser.add_argument("--ops", default=",".join(BENCHMARKS),
+                        help="comma separated operations (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark, best is kept")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the generated data")
+    parser.add_argument("--baseline", help="JSON file to compare against")
+    parser.add_argument("--save-baseline", help="write the results to this JSON file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown before a regression is reported (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.ops.split(",") if name.strip()]
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error("unknown operation(s): {}. Expected some of {}.".format(
+            ", ".join(unknown), ", ".join(BENCHMARKS)))
+    try:
+        sizes = [int(size) for size in args.sizes.split(",")]
+    except ValueError:
+        parser.error("--sizes must be comma separated integers")
+
+    baseline = load_baseline(args.baseline) if args.baseline else {}
+
+    print("{:18} {:>9} {:>10} {:>12} {:>12} {:>10} {:>8}".format(
+        "operation", "size", "seconds", "per second", "latency ms", "peak MiB", "change"))
+    results = run_all(names, sizes, args.seed, args.repeat,
+                      progress=lambda name, size, result: _print_row(
+                          name, size, result, baseline.get(name, {}).get(str(size))))
+
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results, args.seed)
+        print("\nBaseline saved to {}".format(args.save_baseline))
+
+    if args.baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions (more than {:.0%} over the baseline):".format(args.tolerance))
+            for name, size, metric, old, new in regressions:
+                print("  {} @ {}: {} {:.4g} -> {:.4g}".format(name, size, metric, old, new))
+            return 1
+        print("\nNo regressions against {}".format(args.baseline))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,15 @@
 BudgetBuddy - a simple command-line budget tracking package.
 """
 
-from budgetbuddy.ui.main import BudgetBuddyApp, run  # re-export run()
+from budgetbuddy._lazy import lazy_module
 
-__all__ = ["BudgetBuddyApp", "run"]
\ No newline at end of file
+# name -> module it comes from; imported on first use (PEP 562) so that
+# "import budgetbuddy" stays cheap for short scripted runs
+_LAZY = {
+    "BudgetBuddyApp": "budgetbuddy.ui.main",
+    "run": "budgetbuddy.ui.main",  # re-export run()
+}
+
+__all__ = ["BudgetBuddyApp", "run"]
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY)
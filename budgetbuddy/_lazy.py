@@ -0,0 +1,30 @@
+"""
+Lazy attribute loading (PEP 562) shared by the package __init__ modules.
+"""
+
+import importlib
+import sys
+
+
+def lazy_module(name, mapping):
+    """
+    Return (__getattr__, __dir__) for the module called name.
+
+    mapping is {attribute name: module it comes from}. An attribute is
+    imported on first use and then stored on the module, so later lookups
+    no longer go through __getattr__.
+
+    Usage, at the end of a package __init__:
+        __getattr__, __dir__ = lazy_module(__name__, _LAZY)
+    """
+    def __getattr__(attr):
+        if attr not in mapping:
+            raise AttributeError(f"module {name!r} has no attribute {attr!r}")
+        value = getattr(importlib.import_module(mapping[attr]), attr)
+        setattr(sys.modules[name], attr, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[name])) | set(mapping))
+
+    return __getattr__, __dir__
@@ -1,8 +1,27 @@
 # %%
-from budgetbuddy.core.models import UserProfile, Transaction, Income, Expense
-from budgetbuddy.core.budget import Budget
+from budgetbuddy._lazy import lazy_module
 
-__all__ = ["UserProfile", "Transaction", "Income", "Expense", "Budget"]
+# name -> module it comes from; imported on first use (PEP 562)
+_LAZY = {
+    "UserProfile": "budgetbuddy.core.models",
+    "Transaction": "budgetbuddy.core.models",
+    "Income": "budgetbuddy.core.models",
+    "Expense": "budgetbuddy.core.models",
+    "Budget": "budgetbuddy.core.budget",
+    "TransactionColumns": "budgetbuddy.core.columnar",
+    "RangeIndex": "budgetbuddy.core.ranges",
+    "CashFlowSeries": "budgetbuddy.core.series",
+    "ValidationReport": "budgetbuddy.core.validation",
+    "FingerprintIndex": "budgetbuddy.core.duplicates",
+    "SearchIndex": "budgetbuddy.core.search",
+    "Household": "budgetbuddy.core.household",
+}
+
+__all__ = ["UserProfile", "Transaction", "Income", "Expense", "Budget", "TransactionColumns", "RangeIndex",
+           "CashFlowSeries", "ValidationReport", "FingerprintIndex",
+           "SearchIndex", "Household"]
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY)
 
 
 
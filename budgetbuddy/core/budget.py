@@ -1,6 +1,98 @@
 # %%
-from typing import Dict, List
-from budgetbuddy.core.models import UserProfile, Transaction
+import datetime
+import functools
+import heapq
+import weakref
+from collections import OrderedDict
+from operator import attrgetter
+
+from budgetbuddy.core.models import UserProfile, Transaction, month_key, month_bounds
+
+#how group_by turns a (date, amount, category, description, type) record into a key
+GROUP_KEYS = {
+    "category": lambda r: r[2],
+    "type": lambda r: r[4],
+    "year": lambda r: int(r[0][:4]),
+    "month": lambda r: (int(r[0][:4]), int(r[0][5:7])),
+}
+
+#how many query results are kept per profile
+CACHE_SIZE = 128
+
+#profile -> _QueryCache, shared by every Budget made for that profile
+_caches = weakref.WeakKeyDictionary()
+
+
+class _QueryCache:
+    '''
+    LRU cache of query results for one profile. Keys include the profile's
+    generation, so after any change the old results are never returned;
+    they are dropped as soon as a newer generation is seen.
+    '''
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.generation = None
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, generation, compute):
+        if generation != self.generation:
+            #the profile changed: every stored result is stale
+            self.entries.clear()
+            self.generation = generation
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            value = self.entries[key] = compute()
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+            return value
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+
+def _copy_result(value):
+    #every caller gets its own copy, so changing a result never changes the cache
+    if isinstance(value, list):
+        #a shallow copy is enough: the transactions in it are the profile's own
+        return list(value)
+    if isinstance(value, dict):
+        #summaries nest one level: {month or group: {"income", "expense", ...}}
+        return {key: dict(item) if isinstance(item, dict) else item for key, item in value.items()}
+    copy = getattr(value, "copy", None)
+    return copy() if copy is not None else value
+
+
+def _cached(method):
+    '''
+    Memoizes a Budget query per profile, keyed by (query, arguments, profile generation).
+    Profiles without a generation counter are not cached.
+    Results are copied on the way out (see _copy_result), so callers can change
+    them freely, as when every call computed a fresh result.
+    '''
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        generation = getattr(self.profile, "generation", None)
+        if generation is None:
+            return method(self, *args, **kwargs)
+        key = (name, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+            cache = _caches.get(self.profile)
+        except TypeError:
+            #unhashable arguments (e.g. a list of years) or profile
+            return method(self, *args, **kwargs)
+        if cache is None:
+            cache = _caches[self.profile] = _QueryCache(CACHE_SIZE)
+        return _copy_result(cache.get(key, generation, lambda: method(self, *args, **kwargs)))
+
+    return wrapper
+
 
 class InvalidTransactionError(Exception):
     #user defined exception: for when a transaction has invalid data
@@ -18,6 +110,10 @@ class Budget:
         '''
         Returns dictionary for the month that includes overall income, overall expenses, and net amount.
         '''
+        #UserProfile keeps running totals per month, so this is a dictionary lookup
+        month_summary = getattr(self.profile, "month_summary", None)
+        if month_summary is not None:
+            return month_summary(month, year)
         try: 
             #all transactions for the month and year
             txs = self.profile.list_transactions(month, year)
@@ -40,29 +136,217 @@ class Budget:
         except KeyError:
             return{"income": 0, "expense": 0, "net": 0}
 
+    @_cached
+    def year_summary(self, year: int):
+        '''
+        Returns {month: {"income", "expense", "net"}} for all twelve months of the year.
+        '''
+        return self.years_summary([year])[year]
+
+    def years_summary(self, years):
+        '''
+        Returns {year: {month: {"income", "expense", "net"}}} for each year given,
+        in a single pass over the transactions (or straight from the profile's running totals).
+        '''
+        years = list(years)
+        month_summary = getattr(self.profile, "month_summary", None)
+        if month_summary is not None:
+            return {y: {m: month_summary(m, y) for m in range(1, 13)} for y in years}
+
+        wanted = set(years)
+        #(year, month) -> [income, expense, unknown type count]
+        sums = {}
+        for t in self.profile.transactions:
+            key = month_key(t.date)
+            if key is None or key[0] not in wanted:
+                continue
+            totals = sums.setdefault(key, [0.0, 0.0, 0])
+            if t.get_type() == "income":
+                totals[0] += t.amount
+            elif t.get_type() == "expense":
+                totals[1] += t.amount
+            else:
+                totals[2] += 1
+
+        result = {}
+        for y in years:
+            result[y] = {}
+            for m in range(1, 13):
+                income, expense, unknown = sums.get((y, m), (0.0, 0.0, 0))
+                if unknown:
+                    #matches month_totals for an unknown transaction type
+                    result[y][m] = {"income": 0, "expense": 0, "net": 0}
+                else:
+                    result[y][m] = {"income": income, "expense": expense, "net": income - expense}
+        return result
+
+    @_cached
+    def range_totals(self, start=None, end=None):
+        '''
+        Returns {"income", "expense", "net"} for start <= date <= end ("YYYY-MM-DD",
+        either may be None for an open range), e.g. range_totals("2024-03-15", "2025-02-10").
+        Answered with two binary searches over the profile's prefix sums (see core/ranges.py).
+        Raises ValueError for a malformed date.
+        '''
+        #e.g. the SQLite profile answers with one SQL query
+        range_summary = getattr(self.profile, "range_summary", None)
+        if range_summary is not None:
+            return range_summary(start, end)
+        from budgetbuddy.core.ranges import range_index
+        return range_index(self.profile).totals(start, end)
+
+    @_cached
+    def cash_flow(self, freq="month", start=None, end=None):
+        '''
+        Returns a CashFlowSeries (income, expense, net and running balance per "day",
+        "week" or "month", with rolling_mean()) between two "YYYY-MM-DD" dates.
+        Computed over the date/amount columns, with NumPy when it is installed.
+        '''
+        from budgetbuddy.core.series import cash_flow
+        return cash_flow(self.profile, freq, start, end)
+
+    def _records(self, year=None, month=None):
+        #(date, amount, category, description, type) tuples for the period
+        iter_records = getattr(self.profile, "iter_records", None)
+        if iter_records is None:
+            #plain profile without iter_records: fall back to transaction objects
+            if year is None:
+                txs = self.profile.transactions
+            else:
+                txs = self.profile.list_transactions(month, year)
+            return ((t.date, t.amount, t.category, t.description, t.get_type()) for t in txs)
+        if year is None:
+            return iter_records()
+        first, last = (month, month) if month is not None else (1, 12)
+        start = datetime.date.fromordinal(month_bounds(year, first)[0]).isoformat()
+        end = datetime.date.fromordinal(month_bounds(year, last)[1] - 1).isoformat()
+        return iter_records(start, end)
+
+    @_cached
+    def group_by(self, keys="category", year=None, month=None, tx_type=None):
+        '''
+        Groups transactions and returns {group: {"total", "count", "min", "max", "avg"}},
+        sorted by group, in one pass.
+
+        keys: "category", "type", "year" or "month" (a (year, month) tuple), or a tuple of
+            these, in which case each group is a tuple of values in the same order
+        year, month: only look at that year (and month); only those months are read
+        tx_type: only count "income" or "expense" transactions
+        '''
+        single = isinstance(keys, str)
+        key_funcs = [GROUP_KEYS[k] for k in ((keys,) if single else keys)]
+        if single:
+            key_of = key_funcs[0]
+        else:
+            key_of = lambda r: tuple(f(r) for f in key_funcs)
+
+        #group -> [total, count, min, max]
+        acc = {}
+        for r in self._records(year, month):
+            if tx_type is not None and r[4] != tx_type:
+                continue
+            amount = r[1]
+            group = key_of(r)
+            stats = acc.get(group)
+            if stats is None:
+                acc[group] = [amount, 1, amount, amount]
+            else:
+                stats[0] += amount
+                stats[1] += 1
+                if amount < stats[2]:
+                    stats[2] = amount
+                elif amount > stats[3]:
+                    stats[3] = amount
+
+        return {group: {"total": total, "count": count, "min": low, "max": high, "avg": total / count}
+                for group, (total, count, low, high) in sorted(acc.items())}
+
+    @_cached
     def month_transactions(self, month: int, year: int):
         '''
         returns all transactions for month and year
         '''
         return self.profile.list_transactions(month, year)
 
-    def recent_transactions(self, month: int, year: int):
+    @_cached
+    def recent_transactions(self, month: int, year: int, n=None):
         '''
         Returns latest n transactions for the month (for whatever value of n the user chooses).
         If there are less than n transaction it returns everything.
+        Without n the whole month is returned.
         '''
-        txs = self.month_transactions(month, year)
-        return txs
+        if n is None:
+            return self.month_transactions(month, year)
+        if n <= 0:
+            return []
+        #the month index is date sorted, so this is a slice
+        recent = getattr(self.profile, "recent_transactions", None)
+        if recent is not None:
+            return recent(month, year, n)
+        txs = heapq.nlargest(n, self.month_transactions(month, year), key=attrgetter("date"))
+        return txs[::-1]
 
-    def valid_transaction(self, tx):
+    @_cached
+    def latest_transactions(self, n: int):
+        '''
+        Returns the n most recent transactions of the whole profile (oldest of them first)
+        '''
+        latest = getattr(self.profile, "latest_transactions", None)
+        if latest is not None:
+            return latest(n)
+        if n <= 0:
+            return []
+        return heapq.nlargest(n, self.profile.transactions, key=attrgetter("date"))[::-1]
+
+    @_cached
+    def _top(self, n, tx_type, month, year, category):
+        top = getattr(self.profile, "top_transactions", None)
+        if top is not None:
+            return top(n, tx_type, month, year, category)
+        if n <= 0:
+            return []
+        txs = self.profile.transactions if year is None else self.profile.list_transactions(month, year)
+        txs = (t for t in txs if t.get_type() == tx_type and (category is None or t.category == category))
+        return heapq.nlargest(n, txs, key=attrgetter("amount"))
+
+    def top_expenses(self, n: int, month=None, year=None, category=None):
+        '''
+        Returns the n largest expenses (largest first), for the whole profile or only a year,
+        a month (month and year) and/or a category. Heap selection: O(m log n), no full sort.
+        '''
+        return self._top(n, "expense", month, year, category)
+
+    def top_incomes(self, n: int, month=None, year=None, category=None):
+        '''
+        Returns the n largest incomes (largest first), filtered like top_expenses
+        '''
+        return self._top(n, "income", month, year, category)
+
+    def valid_transaction(self, tx, start=None, end=None):
+        '''
+        Returns True if the transaction passes every check in core/validation.py
+        (amount finite and not negative, date well formed and in range, known type, category set)
+        '''
+        from budgetbuddy.core.validation import transaction_problems, ordinal_range
         #user-defined exception: used to make sure the transaction's data is valid
         try:
-            if tx.amount < 0:
-                raise InvalidTransactionError("Transaction amount can't be negative")
-                return True
-            
+            problems = transaction_problems(tx, *ordinal_range(start, end))
+            if problems:
+                raise InvalidTransactionError(problems[0])
+            return True
         except InvalidTransactionError:
-            return False  
+            return False
+
+    def validate(self, txs=None, start=None, end=None):
+        '''
+        Validates a batch of transactions (default: the whole profile) in one pass with the
+        same checks as valid_transaction. Returns a ValidationReport with the problems per row.
+        start, end: allowed date range (default 1900-01-01 to 2100-12-31)
+        '''
+        from budgetbuddy.core import validation
+        if txs is None:
+            return validation.validate_profile(self.profile, start, end)
+        return validation.validate_transactions(txs, start, end)
 
 # %%
 
@@ -0,0 +1,243 @@
+# budgetbuddy/core/columnar.py
+
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+from budgetbuddy.core.models import Transaction, Income, Expense
+
+
+# Type codes stored in the "types" column
+TYPE_CODES = {"transaction": 0, "income": 1, "expense": 2}
+TYPE_NAMES = ("transaction", "income", "expense")
+TYPE_CLASSES = (Transaction, Income, Expense)
+
+
+class TransactionColumns:
+    '''
+    Columnar storage for a profile's transactions.
+
+    Every transaction is one row spread across parallel arrays
+    (date ordinal, amount, type code, category id, description id).
+    Category and description strings are dictionary-encoded in a shared
+    string table. Rows are kept sorted by date (ties keep insertion order)
+    so a date range is always a contiguous slice.
+
+    Transaction objects are only built when a row is read.
+    '''
+
+    def __init__(self, transactions=()):
+        self.dates = array("i")
+        self.amounts = array("d")
+        self.types = array("b")
+        self.categories = array("I")
+        self.descriptions = array("I")
+        #string table: id -> string and string -> id
+        self.strings = []
+        self._string_ids = {}
+        for tx in transactions:
+            self.append(tx)
+
+    @classmethod
+    def from_arrays(cls, dates, amounts, types, categories, descriptions, strings):
+        '''
+        Wraps ready-made, date sorted columns (e.g. read from a snapshot file) without copying them
+        '''
+        store = cls()
+        store.dates, store.amounts, store.types = dates, amounts, types
+        store.categories, store.descriptions = categories, descriptions
+        store.strings = list(strings)
+        store._string_ids = {text: sid for sid, text in enumerate(store.strings)}
+        return store
+
+    # ===== encoding helpers =====
+
+    def _encode(self, text):
+        '''
+        Returns the id of a string in the string table, adding it if needed
+        '''
+        sid = self._string_ids.get(text)
+        if sid is None:
+            sid = len(self.strings)
+            self.strings.append(text)
+            self._string_ids[text] = sid
+        return sid
+
+    def _materialize(self, row):
+        '''
+        Builds an Income/Expense object for one row
+        '''
+        tx_cls = TYPE_CLASSES[self.types[row]]
+        return tx_cls.from_parts(
+            self.dates[row],
+            self.amounts[row],
+            self.strings[self.categories[row]],
+            self.strings[self.descriptions[row]],
+        )
+
+    # ===== list-like interface =====
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __iter__(self):
+        for row in range(len(self.dates)):
+            yield self._materialize(row)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._materialize(row) for row in range(len(self.dates))[index]]
+        if index < 0:
+            index += len(self.dates)
+        if index < 0 or index >= len(self.dates):
+            raise IndexError("transaction index out of range")
+        return self._materialize(index)
+
+    def __contains__(self, tx):
+        return self.find(tx) is not None
+
+    def append(self, tx):
+        '''
+        Adds a transaction, keeping rows in date order.
+        '''
+        ordinal = tx.ordinal
+        columns = (
+            (self.dates, ordinal),
+            (self.amounts, float(tx.amount)),
+            (self.types, TYPE_CODES[tx.TYPE]),
+            (self.categories, self._encode(tx.category)),
+            (self.descriptions, self._encode(tx.description)),
+        )
+        if not self.dates or ordinal >= self.dates[-1]:
+            #common case: data arrives in date order
+            for column, value in columns:
+                column.append(value)
+        else:
+            row = bisect_right(self.dates, ordinal)
+            for column, value in columns:
+                column.insert(row, value)
+
+    def extend(self, transactions):
+        '''
+        Adds many transactions at once: the batch is appended and, if it is
+        not already after the existing rows, all rows are re-sorted in one go
+        instead of inserting row by row.
+        '''
+        transactions = list(transactions)
+        if not transactions:
+            return
+        start = len(self.dates)
+        for tx in transactions:
+            self.dates.append(tx.ordinal)
+            self.amounts.append(float(tx.amount))
+            self.types.append(TYPE_CODES[tx.TYPE])
+            self.categories.append(self._encode(tx.category))
+            self.descriptions.append(self._encode(tx.description))
+        dates = self.dates
+        if all(dates[i - 1] <= dates[i] for i in range(max(start, 1), len(dates))):
+            return
+        #stable sort keeps insertion order for equal dates
+        order = sorted(range(len(dates)), key=dates.__getitem__)
+        for name in ("dates", "amounts", "types", "categories", "descriptions"):
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, [column[i] for i in order]))
+
+    def find(self, tx):
+        '''
+        Returns the row holding the same values as tx, or None
+        '''
+        ordinal = tx.ordinal
+        code = TYPE_CODES.get(tx.TYPE)
+        cat_id = self._string_ids.get(tx.category)
+        desc_id = self._string_ids.get(tx.description)
+        if cat_id is None or desc_id is None:
+            return None
+        start = bisect_left(self.dates, ordinal)
+        stop = bisect_right(self.dates, ordinal, start)
+        for row in range(start, stop):
+            if (self.amounts[row] == tx.amount and self.types[row] == code
+                    and self.categories[row] == cat_id
+                    and self.descriptions[row] == desc_id):
+                return row
+        return None
+
+    def remove(self, tx):
+        '''
+        Removes the first row matching tx. Raises ValueError (like list.remove) if not found.
+        '''
+        row = self.find(tx)
+        if row is None:
+            raise ValueError("transaction not in store")
+        for column in (self.dates, self.amounts, self.types, self.categories, self.descriptions):
+            del column[row]
+
+    def remove_duplicates(self):
+        '''
+        Drops every row that has the same values as an earlier row, in one pass over the
+        columns. Returns the removed rows as transaction objects.
+        '''
+        columns = (self.dates, self.amounts, self.types, self.categories, self.descriptions)
+        seen = set()
+        keep, dropped = [], []
+        #string ids are unique per string, so they can stand in for the strings
+        for row, key in enumerate(zip(*columns)):
+            if key in seen:
+                dropped.append(row)
+            else:
+                seen.add(key)
+                keep.append(row)
+        if not dropped:
+            return []
+        removed = self.rows(dropped)
+        for name in ("dates", "amounts", "types", "categories", "descriptions"):
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, [column[i] for i in keep]))
+        return removed
+
+    # ===== column access =====
+
+    def between(self, start_ordinal, end_ordinal):
+        '''
+        Returns the row range for dates with start_ordinal <= date < end_ordinal
+        '''
+        start = bisect_left(self.dates, start_ordinal)
+        stop = bisect_left(self.dates, end_ordinal, start)
+        return range(start, stop)
+
+    def largest(self, rows, n, type_code=None, category=None):
+        '''
+        Returns the n rows (from the given range) with the largest amounts, largest first,
+        optionally only rows of one type code and category. A heap of size n, no objects built.
+        '''
+        types, categories = self.types, self.categories
+        candidates = rows
+        if type_code is not None:
+            candidates = (row for row in candidates if types[row] == type_code)
+        if category is not None:
+            cat_id = self._string_ids.get(category)
+            if cat_id is None:
+                return []
+            candidates = (row for row in candidates if categories[row] == cat_id)
+        return heapq.nlargest(n, candidates, key=self.amounts.__getitem__)
+
+    def rows(self, rows):
+        '''
+        Materializes the given rows as transaction objects
+        '''
+        return [self._materialize(row) for row in rows]
+
+    def iter_records(self, rows=None):
+        '''
+        Yields (date, amount, category, description, type) tuples without building objects,
+        for all rows or only the given range of rows
+        '''
+        strings = self.strings
+        dates, amounts, types = self.dates, self.amounts, self.types
+        categories, descriptions = self.categories, self.descriptions
+        if rows is not None:
+            dates, amounts, types = dates[rows.start:rows.stop], amounts[rows.start:rows.stop], types[rows.start:rows.stop]
+            categories, descriptions = categories[rows.start:rows.stop], descriptions[rows.start:rows.stop]
+        for ordinal, amount, code, cat_id, desc_id in zip(dates, amounts, types, categories, descriptions):
+            yield (date.fromordinal(ordinal).isoformat(), amount,
+                   strings[cat_id], strings[desc_id], TYPE_NAMES[code])
@@ -0,0 +1,182 @@
+# %%
+import weakref
+from collections import Counter
+
+from budgetbuddy.core.models import parse_date
+
+#how imports treat rows that are already in the profile
+DUPLICATE_MODES = ("keep", "skip", "flag")
+
+#profile -> its FingerprintIndex (dropped together with the profile)
+_indexes = weakref.WeakKeyDictionary()
+
+#type codes of the columnar store (see columnar.TYPE_NAMES)
+_TYPE_NAMES = ("transaction", "income", "expense")
+
+
+def fingerprint(tx):
+    '''
+    Returns the (date ordinal, amount, category, description, type) key of a transaction
+    '''
+    return (tx.ordinal, tx.amount, tx.category, tx.description, tx.TYPE)
+
+
+def record_fingerprint(data):
+    '''
+    Same key for a transaction dictionary (the to_dict() format)
+    '''
+    return (parse_date(data["date"]), float(data["amount"]), data["category"],
+            data.get("description", ""), data["type"])
+
+
+def check_mode(duplicates):
+    if duplicates not in DUPLICATE_MODES:
+        raise ValueError(f"Unknown duplicates mode '{duplicates}'. Expected one of {', '.join(DUPLICATE_MODES)}.")
+
+
+class FingerprintIndex:
+    '''
+    Count of every transaction fingerprint in one profile, so "is this
+    transaction already there?" is one hash lookup.
+
+    Like RangeIndex it listens to the profile and is kept up to date on every
+    add, edit and delete; it is only built (one pass) on first use.
+    '''
+
+    def __init__(self, profile):
+        #weak, so the index never keeps its profile alive
+        self._profile = weakref.ref(profile)
+        self.counts = Counter()
+        self.stale = True
+        #False for profiles without change notifications: rebuilt for every query
+        self.tracking = False
+        listeners = getattr(profile, "listeners", None)
+        if listeners is not None:
+            listeners.append(self.on_change)
+            self.tracking = True
+
+    def rebuild(self):
+        profile = self._profile()
+        if getattr(profile, "columnar", False):
+            #straight from the arrays, no objects built
+            store = profile.transactions
+            strings = store.strings
+            self.counts = Counter(
+                (ordinal, amount, strings[cat_id], strings[desc_id], _TYPE_NAMES[code])
+                for ordinal, amount, code, cat_id, desc_id
+                in zip(store.dates, store.amounts, store.types, store.categories, store.descriptions))
+        else:
+            self.counts = Counter(map(fingerprint, profile.transactions))
+        self.stale = not self.tracking
+
+    def on_change(self, profile, op, tx, old):
+        '''
+        Profile listener: adds and removes the changed fingerprints
+        '''
+        if self.stale:
+            return
+        counts = self.counts
+        if op == "add":
+            counts[fingerprint(tx)] += 1
+        elif op == "add_many":
+            counts.update(map(fingerprint, tx))
+        elif op == "delete":
+            self._discard(fingerprint(tx))
+        elif op == "delete_many":
+            for t in tx:
+                self._discard(fingerprint(t))
+        elif op == "edit" and old is not None:
+            self._discard(record_fingerprint(old))
+            counts[fingerprint(tx)] += 1
+        else:
+            self.stale = True
+
+    def _discard(self, key):
+        #drop keys that reach 0 so the counter doesn't grow with deleted data
+        count = self.counts[key] - 1
+        if count > 0:
+            self.counts[key] = count
+        else:
+            del self.counts[key]
+
+    # ===== queries =====
+
+    def count(self, key):
+        '''
+        Returns how many transactions of the profile have this fingerprint
+        '''
+        if self.stale:
+            self.rebuild()
+        return self.counts.get(key, 0)
+
+    def __contains__(self, tx):
+        return self.count(fingerprint(tx)) > 0
+
+    def duplicates(self):
+        '''
+        Returns {fingerprint: count} for fingerprints held by more than one transaction
+        '''
+        if self.stale:
+            self.rebuild()
+        return {key: count for key, count in self.counts.items() if count > 1}
+
+
+def fingerprint_index(profile):
+    '''
+    Returns the FingerprintIndex for a profile, creating it on first use
+    '''
+    index = _indexes.get(profile)
+    if index is None:
+        index = _indexes[profile] = FingerprintIndex(profile)
+    return index
+
+
+class DuplicateFilter:
+    '''
+    Tells which incoming transactions (e.g. the rows of an import) are already
+    in a profile. Copies are counted: if the profile has one 4.50 coffee on a
+    day and the file has two, only the first row is a duplicate.
+
+    Works whether or not rows are added to the profile while filtering.
+    Imports that only add their rows at the end and come in several batches
+    (e.g. files) call add() for each row they keep and next_batch() between
+    batches, so every batch is checked as if the earlier ones were already in.
+    '''
+
+    def __init__(self, profile):
+        self.index = fingerprint_index(profile)
+        #fingerprint -> copies in the profile before the import started
+        self._before = {}
+        #fingerprint -> incoming rows seen so far (in this batch)
+        self._seen = Counter()
+        #fingerprint -> rows kept from earlier batches / from this batch
+        self._accepted = Counter()
+        self._added = Counter()
+
+    def is_duplicate(self, key):
+        before = self._before.get(key)
+        if before is None:
+            #first time this key comes in, so nothing of it was added yet
+            before = self._before[key] = self.index.count(key)
+        seen = self._seen[key]
+        self._seen[key] = seen + 1
+        return seen < before + self._accepted[key]
+
+    def add(self, key):
+        '''
+        Records a kept row that will be added to the profile later; it counts
+        as being in the profile from the next batch on
+        '''
+        self._added[key] += 1
+
+    def next_batch(self):
+        '''
+        Starts a new batch of incoming rows (e.g. the next file of an import)
+        '''
+        self._accepted.update(self._added)
+        self._added.clear()
+        self._seen.clear()
+
+
+
+# %%
@@ -0,0 +1,177 @@
+# %%
+import datetime
+import os
+
+from budgetbuddy.core.budget import Budget, GROUP_KEYS
+from budgetbuddy.core.columnar import TYPE_NAMES
+from budgetbuddy.core.models import month_bounds
+
+#columnar profiles with at least this many rows in the period are grouped in a worker process
+PROCESS_MIN_ROWS = 200000
+
+
+def _merge_totals(parts):
+    #sum of {"income", "expense", "net"} dictionaries
+    income = sum(p["income"] for p in parts)
+    expense = sum(p["expense"] for p in parts)
+    return {"income": income, "expense": expense, "net": income - expense}
+
+
+def _merge_groups(parts):
+    '''
+    Combines several group_by() results into one (totals and counts add up,
+    min/max of the mins/maxes, average recomputed)
+    '''
+    acc = {}
+    for groups in parts:
+        for group, stats in groups.items():
+            merged = acc.get(group)
+            if merged is None:
+                acc[group] = [stats["total"], stats["count"], stats["min"], stats["max"]]
+            else:
+                merged[0] += stats["total"]
+                merged[1] += stats["count"]
+                merged[2] = min(merged[2], stats["min"])
+                merged[3] = max(merged[3], stats["max"])
+    return {group: {"total": total, "count": count, "min": low, "max": high, "avg": total / count}
+            for group, (total, count, low, high) in sorted(acc.items())}
+
+
+def _period_rows(store, year, month):
+    #row range of a columnar store for a year / month (everything if year is None)
+    if year is None:
+        return range(0, len(store))
+    first, last = (month, month) if month is not None else (1, 12)
+    return store.between(month_bounds(year, first)[0], month_bounds(year, last)[1])
+
+
+def _group_columns(dates, amounts, types, categories, names, keys, tx_type):
+    '''
+    Same result as Budget.group_by, computed from plain columns so it can run in a
+    worker process: arrays of date ordinals, amounts, type codes and category ids,
+    plus {category id: name}
+    '''
+    single = isinstance(keys, str)
+    key_funcs = [GROUP_KEYS[k] for k in ((keys,) if single else keys)]
+    key_of = key_funcs[0] if single else (lambda r: tuple(f(r) for f in key_funcs))
+    #many rows share a date, so each date is formatted once
+    iso = {}
+    acc = {}
+    for ordinal, amount, code, cat_id in zip(dates, amounts, types, categories):
+        type_name = TYPE_NAMES[code]
+        if tx_type is not None and type_name != tx_type:
+            continue
+        date = iso.get(ordinal)
+        if date is None:
+            date = iso[ordinal] = datetime.date.fromordinal(ordinal).isoformat()
+        group = key_of((date, amount, names[cat_id], "", type_name))
+        stats = acc.get(group)
+        if stats is None:
+            acc[group] = [amount, 1, amount, amount]
+        else:
+            stats[0] += amount
+            stats[1] += 1
+            if amount < stats[2]:
+                stats[2] = amount
+            elif amount > stats[3]:
+                stats[3] = amount
+    return {group: {"total": total, "count": count, "min": low, "max": high, "avg": total / count}
+            for group, (total, count, low, high) in acc.items()}
+
+
+class Household:
+    '''
+    Several profiles (e.g. everyone in a household) looked at together.
+
+    Every query is answered per profile and the results are merged; the
+    transactions of the profiles are never put together in one list.
+    Month and year totals come from each profile's running totals. For
+    group_by, large columnar profiles are sent to worker processes (their
+    columns pickle cheaply) while the others are grouped in this process
+    at the same time.
+
+    profiles: dict name -> UserProfile (as returned by load_profiles) or a list of profiles
+    workers: maximum number of worker processes (default: CPU count)
+    '''
+    def __init__(self, profiles, workers=None):
+        if isinstance(profiles, dict):
+            self.profiles = dict(profiles)
+        else:
+            self.profiles = {p.name: p for p in profiles}
+        self.workers = workers
+
+    def month_totals(self, month: int, year: int):
+        '''
+        Returns {"income", "expense", "net"} for the month, over every profile
+        '''
+        return _merge_totals([Budget(p).month_totals(month, year) for p in self.profiles.values()])
+
+    def year_summary(self, year: int):
+        '''
+        Returns {month: {"income", "expense", "net"}} for the year, over every profile
+        '''
+        summaries = [Budget(p).year_summary(year) for p in self.profiles.values()]
+        return {m: _merge_totals([s[m] for s in summaries]) for m in range(1, 13)}
+
+    def range_totals(self, start=None, end=None):
+        '''
+        Returns {"income", "expense", "net"} between two "YYYY-MM-DD" dates, over every profile
+        '''
+        return _merge_totals([Budget(p).range_totals(start, end) for p in self.profiles.values()])
+
+    def by_profile(self, year: int):
+        '''
+        Returns {name: {"income", "expense", "net"}} with each profile's totals for the year
+        '''
+        return {name: _merge_totals(list(Budget(p).year_summary(year).values()))
+                for name, p in self.profiles.items()}
+
+    def group_by(self, keys="category", year=None, month=None, tx_type=None):
+        '''
+        Budget.group_by over every profile: {group: {"total", "count", "min", "max", "avg"}}
+        '''
+        large, small = [], []
+        for profile in self.profiles.values():
+            if getattr(profile, "columnar", False):
+                rows = _period_rows(profile.transactions, year, month)
+                if len(rows) >= PROCESS_MIN_ROWS:
+                    large.append((profile.transactions, rows))
+                    continue
+            small.append(profile)
+
+        pool = None
+        if large:
+            workers = min(self.workers or os.cpu_count() or 1, len(large))
+            # imported here so the other queries don't pay for it
+            from concurrent.futures import ProcessPoolExecutor
+            try:
+                pool = ProcessPoolExecutor(max_workers=workers)
+            except (OSError, NotImplementedError):
+                # no process support on this platform: group them here instead
+                pool = None
+
+        parts = []
+        futures = []
+        try:
+            for store, rows in large:
+                dates = store.dates[rows.start:rows.stop]
+                categories = store.categories[rows.start:rows.stop]
+                #only the category names are needed, not the whole string table
+                names = {cat_id: store.strings[cat_id] for cat_id in set(categories)}
+                args = (dates, store.amounts[rows.start:rows.stop], store.types[rows.start:rows.stop],
+                        categories, names, keys, tx_type)
+                if pool is not None:
+                    futures.append(pool.submit(_group_columns, *args))
+                else:
+                    parts.append(_group_columns(*args))
+            #the smaller profiles are grouped while the workers run
+            parts.extend(Budget(p).group_by(keys, year, month, tx_type) for p in small)
+            parts.extend(future.result() for future in futures)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return _merge_groups(parts)
+
+
+
+# %%
@@ -1,33 +1,131 @@
 # %%
+import datetime
+import heapq
+import re
+import sys
+import threading
+from bisect import bisect_left, bisect_right
+from operator import attrgetter
+
+
+def parse_date(value):
+    '''
+    Converts a "YYYY-MM-DD" string into a date ordinal (days since 0001-01-01).
+
+    Raises ValueError for anything else.
+    '''
+    #fromisoformat also accepts other ISO forms (e.g. 20250101), so check the shape first
+    if not isinstance(value, str) or len(value) != 10 or value[4] != "-" or value[7] != "-":
+        raise ValueError(f"Invalid date '{value}'. Expected YYYY-MM-DD.")
+    try:
+        return datetime.date.fromisoformat(value).toordinal()
+    except ValueError:
+        raise ValueError(f"Invalid date '{value}'. Expected YYYY-MM-DD.") from None
+
+
+#Y-M-D with 1 or 2 digit month/day and -, / or . between them (see normalize_date)
+_LOOSE_DATE = re.compile(r"\s*(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})\s*")
+
+
+def normalize_date(value):
+    '''
+    Returns a saved date as a "YYYY-MM-DD" string. The app used to store dates
+    as typed, so older data files can hold forms like "2025-1-5" or "2025/01/05".
+
+    Raises ValueError for anything that is not a real date.
+    '''
+    match = _LOOSE_DATE.fullmatch(value) if isinstance(value, str) else None
+    if match is None:
+        raise ValueError(f"Invalid date '{value}' in saved data. Expected YYYY-MM-DD.")
+    try:
+        return datetime.date(*map(int, match.groups())).isoformat()
+    except ValueError:
+        raise ValueError(f"Invalid date '{value}' in saved data. Expected YYYY-MM-DD.") from None
+
+
+def ordinal_month(ordinal):
+    '''
+    Returns (year, month) for a date ordinal
+    '''
+    d = datetime.date.fromordinal(ordinal)
+    return d.year, d.month
+
+
+def month_bounds(year, month):
+    '''
+    Returns the (first, last + 1) date ordinals of a month
+    '''
+    start = datetime.date(year, month, 1).toordinal()
+    end = datetime.date(year + month // 12, month % 12 + 1, 1).toordinal()
+    return start, end
+
+
+def _intern(text):
+    #categories repeat a lot, so share one string object per category
+    return sys.intern(text) if type(text) is str else text
+
+
 class Transaction:
     '''
     Transaction - used for both income and expenses
     '''
+    #no per-instance __dict__; the date is kept as an ordinal and only formatted when read
+    __slots__ = ("ordinal", "amount", "category", "description")
+
+    #type of transaction as a string (income or expense), see get_type()
+    TYPE = "transaction"
+
     def __init__(self, date, amount, category, description=""):
         #empty string as the description if nothing inputted (makes it optional)
-        #date format must be YYYY-MM-DD
+        #date format must be YYYY-MM-DD (ValueError otherwise)
         #category is the type of income or expense (ex: job for income or car payment for expense)
+        self.ordinal = parse_date(date)
+        self.category = _intern(category)
+        self.description = description
         try:
-            self.date = date
             self.amount = float(amount)
-            self.category = category
-            self.description = description
         except ValueError:
             #Happens if input is invalid and cannot be converted to a string
             self.amount = 0.0
             print(f"Invalid amount '{amount}'. Defaulting to 0.0.")
 
+    @classmethod
+    def from_parts(cls, ordinal, amount, category, description):
+        '''
+        Builds a transaction from already validated values (no date parsing)
+        '''
+        tx = cls.__new__(cls)
+        tx.ordinal = ordinal
+        tx.amount = amount
+        tx.category = _intern(category)
+        tx.description = description
+        return tx
+
+    @property
+    def date(self):
+        '''
+        date as a YYYY-MM-DD string
+        '''
+        return datetime.date.fromordinal(self.ordinal).isoformat()
+
+    @date.setter
+    def date(self, value):
+        self.ordinal = parse_date(value)
+
     def to_dict(self):
         '''
         Converts transaction into a dictionary
         '''
-        data = {"date": self.date, "amount": self.amount, "category": self.category, "description": self.description, "type": self.get_type()}
+        data = {"date": self.date, "amount": self.amount, "category": self.category, "description": self.description, "type": self.TYPE}
         return data
 
     @classmethod
     def from_dict(cls, data):
         '''
         uses the transaction dictionary, determines if it is income or an expense and returns the correct object
+
+        Dates in an older form (e.g. "2025-1-5") are rewritten as YYYY-MM-DD; a date
+        that cannot be read raises ValueError so the transaction is never dropped
         '''
         try:
             #pick correct class based on transaction type
@@ -36,28 +134,50 @@ class Transaction:
                 tx_cls = Income
             elif tx_type == "expense":
                 tx_cls = Expense
-            #create object of correct class
-            return tx_cls(date=data["date"], amount=data["amount"], category=data["category"], description=data.get("description", ""))
+            else:
+                tx_cls = Transaction
+            #required fields
+            date, amount, category = data["date"], data["amount"], data["category"]
         except KeyError as key:
             #skips the transaction if a required field is missing
             print(f"Missing required field '{key.args[0]}'. Skipping this transaction.")
             return None
+        description = data.get("description", "")
+        #create object of correct class
+        try:
+            return tx_cls(date, amount, category, description)
+        except ValueError:
+            #only the date can fail here (a bad amount becomes 0.0)
+            pass
+        return tx_cls(normalize_date(date), amount, category, description)
 
     def get_type(self):
         '''
         returns the type of transaction as a string (income or expense)
         '''
-        return "transaction"
+        return self.TYPE
 
 #inherits from Transaction
 class Income(Transaction):
-    def get_type(self):
-        return "income"
+    __slots__ = ()
+    TYPE = "income"
 
 #inherits from Transaction
 class Expense(Transaction):
-    def get_type(self):
-        return "expense"
+    __slots__ = ()
+    TYPE = "expense"
+
+def month_key(date_str):
+    '''
+    Returns (year, month) for a "YYYY-MM-..." date string, or None if the date is malformed
+    '''
+    if not isinstance(date_str, str) or len(date_str) < 8 or date_str[4] != "-" or date_str[7] != "-":
+        return None
+    year, month = date_str[:4], date_str[5:7]
+    if not (year.isdigit() and month.isdigit()):
+        return None
+    return int(year), int(month)
+
 
 #class for User Profile:
 class UserProfile:
@@ -65,45 +185,417 @@ class UserProfile:
     List of transactions for one user
     '''
     
-    def __init__(self, name):
+    def __init__(self, name, columnar=False):
         self.name = name
-        #list to store transaction objects
-        self.transactions = []
+        self.columnar = columnar
+        #True when there are changes that have not been saved yet
+        self.dirty = True
+        #bumped by every change, so cached results can tell they are stale (see Budget)
+        self.generation = 0
+        #where the repository stored this profile (set by the data layer)
+        self.storage_key = None
+        #callables run after each change: listener(profile, op, tx, old)
+        self.listeners = []
+        self._init_storage()
+
+    def _init_storage(self):
+        if self.columnar:
+            #parallel arrays instead of one object per transaction (see core/columnar.py)
+            from budgetbuddy.core.columnar import TransactionColumns
+            self.transactions = TransactionColumns()
+        else:
+            #list to store transaction objects
+            self.transactions = []
+        #(year, month) -> ([date ordinals], [transactions]), both kept sorted by date
+        self._months = {}
+        #(year, month) -> [income, expense, count, other] running totals
+        self._totals = {}
+
+    # ===== deferred loading =====
+
+    @classmethod
+    def deferred(cls, name, load_records, columnar=False):
+        '''
+        Creates a profile whose transactions are only decoded when first used.
+
+        load_records is called once with no arguments and returns the profile's
+        transaction dictionaries (the same format as to_dict()["transactions"]),
+        or, for a columnar profile, a ready-made TransactionColumns store.
+        '''
+        profile = cls.__new__(cls)
+        profile.name = name
+        profile.columnar = columnar
+        profile.dirty = False
+        profile.generation = 0
+        profile.storage_key = None
+        profile.listeners = []
+        profile._load_records = load_records
+        #held while decoding, so a save in another thread never sees a half-built profile
+        profile._load_lock = threading.RLock()
+        return profile
+
+    @property
+    def is_loaded(self):
+        '''
+        False until a deferred profile's transactions have been decoded
+        '''
+        return "_load_records" not in self.__dict__
+
+    def __getattr__(self, attr):
+        #only called for missing attributes, i.e. the storage of a deferred profile
+        if attr not in ("transactions", "_months", "_totals") or "_load_records" not in self.__dict__:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{attr}'")
+        with self._load_lock:
+            #another thread may have decoded it while we waited
+            load_records = self.__dict__.get("_load_records")
+            if load_records is not None:
+                self._decode(load_records)
+        return getattr(self, attr)
+
+    def _decode(self, load_records):
+        #built aside and only then put in place, so nobody sees a partial list
+        loaded = UserProfile(self.name, columnar=self.columnar)
+        records = load_records()
+        if self.columnar and not isinstance(records, list):
+            loaded._adopt_columns(records)
+        else:
+            #decoding saved data is not a change: the scratch profile has no listeners
+            txs = (Transaction.from_dict(tx_data) for tx_data in records)
+            loaded.extend_transactions(tx for tx in txs if tx is not None)
+        self._months, self._totals = loaded._months, loaded._totals
+        self.transactions = loaded.transactions
+        del self._load_records
+
+    def _adopt_columns(self, store):
+        '''
+        Uses a filled TransactionColumns store as this profile's storage and
+        rebuilds the running totals in one pass over its columns
+        '''
+        self.transactions = store
+        self._totals = {}
+        last_ordinal = None
+        for ordinal, amount, code in zip(store.dates, store.amounts, store.types):
+            if ordinal != last_ordinal:
+                totals = self._totals.setdefault(ordinal_month(ordinal), [0.0, 0.0, 0, 0])
+                last_ordinal = ordinal
+            #type codes: 1 income, 2 expense (see core/columnar.py)
+            if code == 1:
+                totals[0] += amount
+            elif code == 2:
+                totals[1] += amount
+            else:
+                totals[3] += 1
+            totals[2] += 1
+
+    # ===== month index =====
+
+    def _index_add(self, tx):
+        '''
+        Puts tx in its (year, month) bucket, after any transactions with the same date
+        '''
+        if self.columnar:
+            #the columnar store is already date sorted
+            return
+        key = ordinal_month(tx.ordinal)
+        bucket = self._months.get(key)
+        if bucket is None:
+            bucket = self._months[key] = ([], [])
+        ordinals, txs = bucket
+        pos = bisect_right(ordinals, tx.ordinal)
+        ordinals.insert(pos, tx.ordinal)
+        txs.insert(pos, tx)
+
+    def _index_remove(self, tx):
+        '''
+        Takes tx out of its (year, month) bucket. Returns True if it was there.
+        '''
+        if self.columnar:
+            return False
+        key = ordinal_month(tx.ordinal)
+        bucket = self._months.get(key)
+        if bucket is None:
+            return False
+        ordinals, txs = bucket
+        for pos in range(bisect_left(ordinals, tx.ordinal), bisect_right(ordinals, tx.ordinal)):
+            if txs[pos] is tx:
+                del ordinals[pos]
+                del txs[pos]
+                if not txs:
+                    del self._months[key]
+                return True
+        return False
+
+    def _month_slice(self, year, month):
+        '''
+        Returns the transactions for one month in date order
+        '''
+        if self.columnar:
+            #rows are date sorted, so the month is one contiguous slice
+            start, end = month_bounds(year, month)
+            return self.transactions.rows(self.transactions.between(start, end))
+        bucket = self._months.get((year, month))
+        if bucket is None:
+            return []
+        return list(bucket[1])
+
+    # ===== monthly totals =====
+
+    def _totals_update(self, tx, sign):
+        '''
+        Adds (sign=1) or subtracts (sign=-1) tx from its month's running totals
+        '''
+        key = ordinal_month(tx.ordinal)
+        totals = self._totals.get(key)
+        if totals is None:
+            totals = self._totals[key] = [0.0, 0.0, 0, 0]
+        tx_type = tx.TYPE
+        if tx_type == "income":
+            totals[0] += sign * tx.amount
+        elif tx_type == "expense":
+            totals[1] += sign * tx.amount
+        else:
+            totals[3] += sign
+        totals[2] += sign
+        if totals[2] == 0:
+            #drop empty months so float rounding never leaves a -0.0000001 behind
+            del self._totals[key]
+
+    def month_summary(self, month, year):
+        '''
+        Returns {"income", "expense", "net"} for the month from the running totals
+        '''
+        totals = self._totals.get((year, month))
+        if totals is None:
+            return {"income": 0.0, "expense": 0.0, "net": 0.0}
+        if totals[3]:
+            #same result Budget.month_totals gives for an unknown transaction type
+            return {"income": 0, "expense": 0, "net": 0}
+        return {"income": totals[0], "expense": totals[1], "net": totals[0] - totals[1]}
+
+    def _changed(self, op, tx, old=None):
+        '''
+        Called after every change to the profile's transactions.
+        op is "add", "edit" or "delete"; for edits old is tx.to_dict() from before the change.
+        For "add_many" (extend_transactions) tx is the list of added transactions,
+        for "delete_many" (remove_duplicates) the list of removed ones.
+        '''
+        self.dirty = True
+        self.generation += 1
+        for listener in self.listeners:
+            listener(self, op, tx, old)
+
+    # ===== transactions =====
 
      # NEW: single-transaction helper used by the rest of the app plus tests   
     def add_transaction(self, tx):
         """Add a single transaction (Income or Expense)."""
         self.transactions.append(tx)
+        self._index_add(tx)
+        self._totals_update(tx, 1)
+        self._changed("add", tx)
 
     def add_transactions(self, tx):
         '''
         Add transaction to the user's profile
         '''
-        self.transactions.append(tx)
+        self.add_transaction(tx)
+
+    def extend_transactions(self, txs):
+        '''
+        Adds many transactions in one operation (used by bulk imports).
+        Month buckets are re-sorted once per month instead of once per transaction.
+        '''
+        txs = list(txs)
+        if not txs:
+            return
+        self.transactions.extend(txs)
+        if not self.columnar:
+            touched = set()
+            for tx in txs:
+                key = ordinal_month(tx.ordinal)
+                bucket = self._months.get(key)
+                if bucket is None:
+                    bucket = self._months[key] = ([], [])
+                bucket[1].append(tx)
+                touched.add(key)
+            for key in touched:
+                ordinals, bucket_txs = self._months[key]
+                #stable sort keeps insertion order for equal dates
+                bucket_txs.sort(key=lambda tx: tx.ordinal)
+                ordinals[:] = [tx.ordinal for tx in bucket_txs]
+        for tx in txs:
+            self._totals_update(tx, 1)
+        #one notification for the whole batch; tx is the list of added transactions
+        self._changed("add_many", txs)
 
     def list_transactions(self, month=None, year=None):
         '''
-        Returns all transactions OR only transactions for the month and year the user picks
+        Returns all transactions OR only transactions for the month and year the user picks.
+        If only the year is given, returns the whole year. Filtered results are in date order.
         '''
-        if month is None or year is None:
+        if year is None:
             #returns all transactions if no month/year given
             return list(self.transactions)
 
-        date_start = f"{year:04d}-{month:02d}-"
+        if month is None:
+            result = []
+            for m in range(1, 13):
+                result.extend(self._month_slice(year, m))
+            return result
+
         #filtered transactions that match the month and year the user chooses
-        result = []
-        for t in self.transactions:
-            if t.date.startswith(date_start):
-                result.append(t)
-        return result
+        return self._month_slice(year, month)
     
+    def _ordinal_range(self, start, end):
+        #"YYYY-MM-DD" bounds (inclusive, either may be None) -> (first, last + 1) ordinals
+        start_ord = None if start is None else parse_date(start)
+        end_ord = None if end is None else parse_date(end) + 1
+        return start_ord, end_ord
+
+    def _column_rows(self, start_ord, end_ord):
+        #row range of a columnar store for an ordinal range (None = open end)
+        if start_ord is None:
+            start_ord = 0
+        if end_ord is None:
+            end_ord = datetime.date.max.toordinal() + 1
+        return self.transactions.between(start_ord, end_ord)
+
+    def iter_transactions(self, start=None, end=None):
+        '''
+        Yields transactions in date order with start <= date <= end
+        ("YYYY-MM-DD" strings, either may be None for an open range).
+        Only the months inside the range are looked at.
+        Raises ValueError for a malformed date.
+        '''
+        start_ord, end_ord = self._ordinal_range(start, end)
+        if self.columnar:
+            store = self.transactions
+            for row in self._column_rows(start_ord, end_ord):
+                yield store[row]
+            return
+        first = None if start_ord is None else ordinal_month(start_ord)
+        last = None if end_ord is None else ordinal_month(end_ord - 1)
+        for key in sorted(self._months):
+            if first is not None and key < first:
+                continue
+            if last is not None and key > last:
+                break
+            ordinals, txs = self._months[key]
+            lo = 0 if start_ord is None else bisect_left(ordinals, start_ord)
+            hi = len(ordinals) if end_ord is None else bisect_left(ordinals, end_ord)
+            yield from txs[lo:hi]
+
+    def iter_records(self, start=None, end=None):
+        '''
+        Like iter_transactions but yields plain (date, amount, category, description, type)
+        tuples; columnar profiles build them straight from the arrays
+        '''
+        if self.columnar:
+            rows = self._column_rows(*self._ordinal_range(start, end))
+            yield from self.transactions.iter_records(rows)
+            return
+        for tx in self.iter_transactions(start, end):
+            yield (tx.date, tx.amount, tx.category, tx.description, tx.TYPE)
+
     def recent_transactions(self, month, year, n):
         '''
-        Returns the most recent n transactions for the given month/year
+        Returns the most recent n transactions (by date) for the given month/year
         '''
+        if n <= 0:
+            return []
         txs = self.list_transactions(month, year)
         return txs[-n:]
 
+    def latest_transactions(self, n):
+        '''
+        Returns the n most recent transactions overall (by date, oldest of them first),
+        reading only the newest months
+        '''
+        if n <= 0:
+            return []
+        if self.columnar:
+            store = self.transactions
+            return store.rows(range(max(0, len(store) - n), len(store)))
+        chunks = []
+        needed = n
+        for key in sorted(self._months, reverse=True):
+            txs = self._months[key][1]
+            chunks.append(txs[-needed:])
+            needed -= len(chunks[-1])
+            if needed <= 0:
+                break
+        return [tx for chunk in reversed(chunks) for tx in chunk]
+
+    def top_transactions(self, n, tx_type=None, month=None, year=None, category=None):
+        '''
+        Returns the n largest transactions by amount (largest first), optionally only one type
+        ("income"/"expense"), month/year and category. Uses a heap of size n instead of sorting.
+        '''
+        if n <= 0:
+            return []
+        if self.columnar:
+            from budgetbuddy.core.columnar import TYPE_CODES
+            store = self.transactions
+            if year is None:
+                rows = range(len(store))
+            elif month is None:
+                rows = store.between(month_bounds(year, 1)[0], month_bounds(year, 12)[1])
+            else:
+                rows = store.between(*month_bounds(year, month))
+            type_code = None if tx_type is None else TYPE_CODES.get(tx_type, -1)
+            return store.rows(store.largest(rows, n, type_code, category))
+
+        txs = self.transactions if year is None else self.list_transactions(month, year)
+        if tx_type is not None:
+            txs = (tx for tx in txs if tx.TYPE == tx_type)
+        if category is not None:
+            txs = (tx for tx in txs if tx.category == category)
+        return heapq.nlargest(n, txs, key=attrgetter("amount"))
+
+    def search(self, query, start=None, end=None):
+        '''
+        Returns the transactions whose category or description has every word of the query
+        (a word ending in "*" is a prefix, e.g. "coff*"), optionally only between two
+        "YYYY-MM-DD" dates, in date order. Answered from an inverted index (see core/search.py).
+        '''
+        from budgetbuddy.core.search import search_index
+        return search_index(self).search(query, start, end)
+
+    def edit_transaction(self, tx, date=None, amount=None, category=None, description=None):
+        '''
+        Changes the given fields of a transaction in this profile (None keeps the old value).
+        '''
+        #convert first so a bad date or amount leaves the transaction untouched
+        if date is not None:
+            ordinal = parse_date(date)
+        if amount is not None:
+            amount = float(amount)
+        if self.columnar:
+            try:
+                self.transactions.remove(tx)
+            except ValueError:
+                print("Error: transaction not found. Cannot edit.")
+                return
+        elif not self._index_remove(tx) and tx not in self.transactions:
+            print("Error: transaction not found. Cannot edit.")
+            return
+        old = tx.to_dict() if self.listeners else None
+        self._totals_update(tx, -1)
+        if date is not None:
+            tx.ordinal = ordinal
+        if amount is not None:
+            tx.amount = amount
+        if category is not None:
+            tx.category = _intern(category)
+        if description is not None:
+            tx.description = description
+        if self.columnar:
+            self.transactions.append(tx)
+        else:
+            self._index_add(tx)
+        self._totals_update(tx, 1)
+        self._changed("edit", tx, old)
+
     def delete_transaction(self, tx):
         '''
         We want users to be able to delete transactions. 
@@ -114,24 +606,77 @@ class UserProfile:
             self.transactions.remove(tx)
         except ValueError:
             print("Error: transaction not found. Cannot delete.")
+            return
+        self._index_remove(tx)
+        self._totals_update(tx, -1)
+        self._changed("delete", tx)
+
+    def remove_duplicates(self):
+        '''
+        Deletes every transaction that is an exact copy (same date, amount, category,
+        description and type) of an earlier one, in one pass instead of one
+        delete_transaction() per copy. Returns the removed transactions.
+        '''
+        if self.columnar:
+            removed = self.transactions.remove_duplicates()
+        else:
+            seen = set()
+            keep, removed = [], []
+            for tx in self.transactions:
+                #same key as core/duplicates.fingerprint()
+                key = (tx.ordinal, tx.amount, tx.category, tx.description, tx.TYPE)
+                if key in seen:
+                    removed.append(tx)
+                else:
+                    seen.add(key)
+                    keep.append(tx)
+            if removed:
+                self.transactions[:] = keep
+                for tx in removed:
+                    self._index_remove(tx)
+        if not removed:
+            return []
+        for tx in removed:
+            self._totals_update(tx, -1)
+        #one notification for the whole batch; tx is the list of removed transactions
+        self._changed("delete_many", removed)
+        return removed
 
     def to_dict(self):
         '''
         Converts the profile into a dictionary.
         '''
-        data = {"name": self.name, "transactions": [t.to_dict() for t in self.transactions]}
+        lock = self.__dict__.get("_load_lock")
+        if lock is None:
+            return self._to_dict()
+        #waits for a decode running in another thread
+        with lock:
+            return self._to_dict()
+
+    def _to_dict(self):
+        fields = ("date", "amount", "category", "description", "type")
+        load_records = self.__dict__.get("_load_records")
+        if load_records is not None and not self.columnar:
+            #never opened: hand back the stored records without decoding them
+            return {"name": self.name, "transactions": list(load_records())}
+        if self.columnar:
+            #read straight from the columns without building objects
+            records = [dict(zip(fields, rec)) for rec in self.transactions.iter_records()]
+        else:
+            records = [t.to_dict() for t in self.transactions]
+        data = {"name": self.name, "transactions": records}
         return data
 
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, columnar=False):
         '''
         creates a user profile from a dictionary
         '''
         #creates a user profile with the given name
-        profile = cls(data["name"])
-        for tx_data in data.get("transactions", []):
-            tx = Transaction.from_dict(tx_data)
-            profile.add_transactions(tx)
+        profile = cls(data["name"], columnar=columnar)
+        txs = (Transaction.from_dict(tx_data) for tx_data in data.get("transactions", []))
+        profile.extend_transactions(tx for tx in txs if tx is not None)
+        profile.dirty = False
         return profile
     
         
@@ -0,0 +1,115 @@
+# %%
+import weakref
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+from budgetbuddy.core.models import parse_date
+
+#profile -> its RangeIndex (dropped together with the profile)
+_indexes = weakref.WeakKeyDictionary()
+
+
+class RangeIndex:
+    '''
+    Date-sorted prefix sums of income and expense for one profile.
+
+    Totals for any date range come from two binary searches:
+    income(start..end) = income_sums[hi] - income_sums[lo].
+
+    The index listens to the profile: transactions appended in date order
+    just extend the sums, anything else (out of order adds, edits, deletes)
+    marks the index stale and it is rebuilt on the next query.
+    '''
+
+    def __init__(self, profile):
+        #weak, so the index never keeps its profile alive
+        self._profile = weakref.ref(profile)
+        #sorted date ordinals, and sums of the first i amounts (so one longer than ordinals)
+        self.ordinals = []
+        self.income_sums = [0.0]
+        self.expense_sums = [0.0]
+        self.stale = True
+        #False for profiles without change notifications: rebuilt for every query
+        self.tracking = False
+        listeners = getattr(profile, "listeners", None)
+        if listeners is not None:
+            listeners.append(self.on_change)
+            self.tracking = True
+
+    # ===== building =====
+
+    def rebuild(self):
+        profile = self._profile()
+        if getattr(profile, "columnar", False):
+            #the arrays are already date sorted (type codes: 1 income, 2 expense)
+            store = profile.transactions
+            self.ordinals = list(store.dates)
+            rows = list(zip(store.amounts, store.types))
+            income = (a if code == 1 else 0.0 for a, code in rows)
+            expense = (a if code == 2 else 0.0 for a, code in rows)
+        else:
+            if hasattr(profile, "iter_transactions"):
+                #already in date order (month index)
+                rows = [(t.ordinal, t.amount, t.get_type()) for t in profile.iter_transactions()]
+            else:
+                #plain profile objects only have date strings
+                rows = sorted(((parse_date(t.date), t.amount, t.get_type()) for t in profile.transactions),
+                              key=lambda row: row[0])
+            self.ordinals = [row[0] for row in rows]
+            income = (row[1] if row[2] == "income" else 0.0 for row in rows)
+            expense = (row[1] if row[2] == "expense" else 0.0 for row in rows)
+        self.income_sums = list(accumulate(income, initial=0.0))
+        self.expense_sums = list(accumulate(expense, initial=0.0))
+        self.stale = not self.tracking
+
+    def _append(self, tx):
+        tx_type = tx.get_type()
+        self.ordinals.append(tx.ordinal)
+        self.income_sums.append(self.income_sums[-1] + (tx.amount if tx_type == "income" else 0.0))
+        self.expense_sums.append(self.expense_sums[-1] + (tx.amount if tx_type == "expense" else 0.0))
+
+    def on_change(self, profile, op, tx, old):
+        '''
+        Profile listener: keeps the sums up to date for appends in date order
+        '''
+        if self.stale:
+            return
+        if op == "add":
+            txs = [tx]
+        elif op == "add_many":
+            txs = sorted(tx, key=lambda t: t.ordinal)
+        else:
+            self.stale = True
+            return
+        if txs and self.ordinals and txs[0].ordinal < self.ordinals[-1]:
+            #lands in the middle of the history: every later sum would change
+            self.stale = True
+            return
+        for t in txs:
+            self._append(t)
+
+    # ===== queries =====
+
+    def totals(self, start=None, end=None):
+        '''
+        Returns {"income", "expense", "net"} for start <= date <= end
+        ("YYYY-MM-DD" strings, either may be None for an open range)
+        '''
+        if self.stale:
+            self.rebuild()
+        lo = 0 if start is None else bisect_left(self.ordinals, parse_date(start))
+        hi = len(self.ordinals) if end is None else bisect_right(self.ordinals, parse_date(end))
+        hi = max(lo, hi)
+        income = self.income_sums[hi] - self.income_sums[lo]
+        expense = self.expense_sums[hi] - self.expense_sums[lo]
+        return {"income": income, "expense": expense, "net": income - expense}
+
+
+def range_index(profile):
+    '''
+    Returns the RangeIndex for a profile, creating it on first use
+    '''
+    index = _indexes.get(profile)
+    if index is None:
+        index = _indexes[profile] = RangeIndex(profile)
+    return index
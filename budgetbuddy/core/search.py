@@ -0,0 +1,259 @@
+# %%
+import datetime
+import re
+import weakref
+from bisect import bisect_left, insort
+from functools import lru_cache
+
+from budgetbuddy.core.models import parse_date
+
+#profile -> its SearchIndex (dropped together with the profile)
+_indexes = weakref.WeakKeyDictionary()
+
+_WORD = re.compile(r"\w+")
+_END_OF_TIME = datetime.date.max.toordinal() + 1
+
+
+def tokenize(text):
+    '''
+    Returns the lowercase words of a text ("Coffee @ Joe's" -> ["coffee", "joe", "s"])
+    '''
+    return _WORD.findall(text.lower()) if isinstance(text, str) else []
+
+
+def parse_query(query):
+    '''
+    Splits a query into (word, is_prefix) terms. A word ending in "*" matches
+    every word starting with it ("coff*" finds "coffee").
+    '''
+    terms = []
+    for piece in query.split():
+        words = tokenize(piece)
+        for i, word in enumerate(words):
+            terms.append((word, piece.endswith("*") and i == len(words) - 1))
+    return terms
+
+
+@lru_cache(maxsize=65536)
+def _words(text):
+    #categories (and many descriptions) repeat, so each text is split once
+    return frozenset(tokenize(text))
+
+
+def _tx_tokens(tx):
+    return _words(tx.category) | _words(tx.description)
+
+
+def matches(tx, terms):
+    '''
+    True if the transaction's category or description has every term
+    '''
+    tokens = _tx_tokens(tx)
+    for word, is_prefix in terms:
+        if is_prefix:
+            if not any(token.startswith(word) for token in tokens):
+                return False
+        elif word not in tokens:
+            return False
+    return True
+
+
+class SearchIndex:
+    '''
+    Inverted index from the words of categories and descriptions to the
+    transactions that contain them, for one profile.
+
+    List profiles: word -> transactions (a dict used as an insertion-ordered
+    set), kept up to date by listening to the profile like RangeIndex.
+    Columnar profiles build their objects on every read, so there the index
+    maps words to string-table ids instead; new strings are indexed as they
+    appear and the matching rows are found by scanning the id columns.
+
+    The words are also kept sorted, so a prefix is one binary search.
+    '''
+
+    def __init__(self, profile):
+        #weak, so the index never keeps its profile alive
+        self._profile = weakref.ref(profile)
+        self.postings = {}
+        self.words = []
+        #columnar: which store was indexed and how many of its strings
+        self._store = None
+        self._indexed_strings = 0
+        self.stale = True
+        #False for profiles without change notifications: rebuilt for every query
+        self.tracking = False
+        listeners = getattr(profile, "listeners", None)
+        if listeners is not None:
+            listeners.append(self.on_change)
+            self.tracking = True
+
+    # ===== building =====
+
+    def rebuild(self):
+        profile = self._profile()
+        self.postings = {}
+        self.words = []
+        self._store = None
+        self._indexed_strings = 0
+        if getattr(profile, "columnar", False):
+            self._index_strings(profile.transactions)
+        else:
+            #one pass with the dict work inlined; the words are sorted once at the end
+            postings = self.postings
+            find = _WORD.findall
+            for tx in profile.transactions:
+                category, description = tx.category, tx.description
+                if isinstance(category, str) and isinstance(description, str):
+                    words = set(find(category.lower() + " " + description.lower()))
+                else:
+                    words = _tx_tokens(tx)
+                for word in words:
+                    items = postings.get(word)
+                    if items is None:
+                        items = postings[word] = {}
+                    items[tx] = None
+            self.words = sorted(postings)
+        self.stale = not self.tracking
+
+    def _post(self, word, item):
+        items = self.postings.get(word)
+        if items is None:
+            items = self.postings[word] = {}
+            insort(self.words, word)
+        items[item] = None
+
+    def _unpost(self, word, item):
+        items = self.postings.get(word)
+        if items is None:
+            return
+        items.pop(item, None)
+        if not items:
+            del self.postings[word]
+            del self.words[bisect_left(self.words, word)]
+
+    def _add(self, tx):
+        for word in _tx_tokens(tx):
+            self._post(word, tx)
+
+    def _remove(self, tx, category, description):
+        for word in _words(category) | _words(description):
+            self._unpost(word, tx)
+
+    def _index_strings(self, store):
+        #the string table only grows, so just index the strings added since last time
+        if store is not self._store:
+            self.postings, self.words = {}, []
+            self._store, self._indexed_strings = store, 0
+        strings = store.strings
+        for sid in range(self._indexed_strings, len(strings)):
+            for word in set(tokenize(strings[sid])):
+                self._post(word, sid)
+        self._indexed_strings = len(strings)
+
+    def on_change(self, profile, op, tx, old):
+        '''
+        Profile listener: updates the postings of the changed transactions
+        '''
+        if self.stale or profile.columnar:
+            #columnar stores are checked for new strings on every query
+            return
+        if op == "add":
+            self._add(tx)
+        elif op == "add_many":
+            for t in tx:
+                self._add(t)
+        elif op == "delete":
+            self._remove(tx, tx.category, tx.description)
+        elif op == "delete_many":
+            for t in tx:
+                self._remove(t, t.category, t.description)
+        elif op == "edit" and old is not None:
+            self._remove(tx, old["category"], old.get("description", ""))
+            self._add(tx)
+        else:
+            self.stale = True
+
+    # ===== queries =====
+
+    def _lookup(self, word, is_prefix):
+        '''
+        Returns the items (transactions or string ids) for one term
+        '''
+        if not is_prefix:
+            return self.postings.get(word, {})
+        words = self.words
+        lo = hi = bisect_left(words, word)
+        while hi < len(words) and words[hi].startswith(word):
+            hi += 1
+        if hi - lo == 1:
+            return self.postings[words[lo]]
+        found = {}
+        for i in range(lo, hi):
+            found.update(self.postings[words[i]])
+        return found
+
+    def search(self, query, start=None, end=None):
+        '''
+        Returns the transactions whose category or description contains every
+        word of the query (see parse_query), between two "YYYY-MM-DD" dates
+        (inclusive, either may be None), in date order
+        '''
+        profile = self._profile()
+        if self.stale:
+            self.rebuild()
+        terms = parse_query(query)
+        if not terms:
+            return []
+        start_ord = None if start is None else parse_date(start)
+        end_ord = None if end is None else parse_date(end) + 1
+        if profile.columnar:
+            return self._search_columns(profile.transactions, terms, start_ord, end_ord)
+
+        #intersect starting from the rarest term
+        postings = sorted((self._lookup(word, is_prefix) for word, is_prefix in terms), key=len)
+        found = list(postings[0])
+        for other in postings[1:]:
+            found = [tx for tx in found if tx in other]
+        if start_ord is not None or end_ord is not None:
+            lo = 0 if start_ord is None else start_ord
+            hi = _END_OF_TIME if end_ord is None else end_ord
+            found = [tx for tx in found if lo <= tx.ordinal < hi]
+        #stable, so equal dates keep the order they were added in
+        found.sort(key=lambda tx: tx.ordinal)
+        return found
+
+    def _search_columns(self, store, terms, start_ord, end_ord):
+        self._index_strings(store)
+        id_sets = sorted((self._lookup(word, is_prefix) for word, is_prefix in terms), key=len)
+        if not id_sets[0]:
+            return []
+        rows = store.between(0 if start_ord is None else start_ord,
+                             _END_OF_TIME if end_ord is None else end_ord)
+        categories, descriptions = store.categories, store.descriptions
+        #one quick pass per column for the rarest term, then check the few candidates
+        ids = id_sets[0]
+        found = [row for row in rows if categories[row] in ids]
+        if found:
+            in_category = set(found)
+            found += [row for row in rows if descriptions[row] in ids and row not in in_category]
+            found.sort()
+        else:
+            found = [row for row in rows if descriptions[row] in ids]
+        for ids in id_sets[1:]:
+            found = [row for row in found if categories[row] in ids or descriptions[row] in ids]
+        return store.rows(found)
+
+
+def search_index(profile):
+    '''
+    Returns the SearchIndex for a profile, creating it on first use
+    '''
+    index = _indexes.get(profile)
+    if index is None:
+        index = _indexes[profile] = SearchIndex(profile)
+    return index
+
+
+
+# %%
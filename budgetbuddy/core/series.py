@@ -0,0 +1,190 @@
+# %%
+import datetime
+from array import array
+
+from budgetbuddy.core.columnar import TYPE_CODES
+from budgetbuddy.core.models import parse_date
+
+#NumPy is optional: used for the vectorized path when installed
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FREQUENCIES = ("day", "week", "month")
+
+#date ordinal of 1970-01-01 (day 0 for numpy datetime64)
+_EPOCH = datetime.date(1970, 1, 1).toordinal()
+_INCOME = TYPE_CODES["income"]
+_EXPENSE = TYPE_CODES["expense"]
+
+
+def _period(ordinal, freq):
+    '''
+    Period number of a date: the ordinal for days, weeks since 0001-01-01
+    (weeks start on Monday) or year * 12 + month - 1
+    '''
+    if freq == "day":
+        return ordinal
+    if freq == "week":
+        return (ordinal - 1) // 7
+    d = datetime.date.fromordinal(ordinal)
+    return d.year * 12 + d.month - 1
+
+
+def _label(period, freq):
+    #"YYYY-MM-DD" for days, the Monday of a week, "YYYY-MM" for months
+    if freq == "day":
+        return datetime.date.fromordinal(period).isoformat()
+    if freq == "week":
+        return datetime.date.fromordinal(period * 7 + 1).isoformat()
+    return "{:04d}-{:02d}".format(period // 12, period % 12 + 1)
+
+
+class CashFlowSeries:
+    '''
+    Income, expense, net and running balance per period (no gaps: periods
+    without transactions are 0). Built by cash_flow().
+
+    opening: balance (net of everything) before the first period
+    '''
+
+    def __init__(self, freq, periods, income, expense, opening=0.0):
+        self.freq = freq
+        #"YYYY-MM-DD" (day / first day of week) or "YYYY-MM" labels
+        self.periods = periods
+        self.income = income
+        self.expense = expense
+        self.net = [i - e for i, e in zip(income, expense)]
+        self.opening = opening
+        balance = opening
+        self.balance = []
+        for value in self.net:
+            balance += value
+            self.balance.append(balance)
+
+    def __len__(self):
+        return len(self.periods)
+
+    def copy(self):
+        '''
+        Returns a copy with its own lists (cached series are handed out as copies)
+        '''
+        other = CashFlowSeries.__new__(CashFlowSeries)
+        other.freq, other.opening = self.freq, self.opening
+        for field in ("periods", "income", "expense", "net", "balance"):
+            setattr(other, field, list(getattr(self, field)))
+        return other
+
+    def rows(self):
+        '''
+        Yields (period, income, expense, net, balance)
+        '''
+        return zip(self.periods, self.income, self.expense, self.net, self.balance)
+
+    def rolling_mean(self, window, field="net"):
+        '''
+        Mean of the last `window` periods of a field ("income", "expense", "net"
+        or "balance"); None until there are `window` periods
+        '''
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        values = getattr(self, field)
+        if np is not None:
+            sums = np.cumsum(np.asarray(values, dtype=float))
+            means = sums[window - 1:].copy()
+            means[1:] -= sums[:-window]
+            return [None] * min(window - 1, len(values)) + (means / window).tolist()
+        result = []
+        total = 0.0
+        for i, value in enumerate(values):
+            total += value
+            if i >= window:
+                total -= values[i - window]
+            result.append(total / window if i >= window - 1 else None)
+        return result
+
+
+def _columns(profile, start_ord, end_ord):
+    '''
+    Returns (date ordinals, amounts, type codes) as arrays for start_ord <= date < end_ord
+    (None = open end), in date order
+    '''
+    if getattr(profile, "columnar", False):
+        #already columns: just slice the date range
+        store = profile.transactions
+        lo = 0 if start_ord is None else start_ord
+        hi = datetime.date.max.toordinal() + 1 if end_ord is None else end_ord
+        rows = store.between(lo, hi)
+        return (store.dates[rows.start:rows.stop], store.amounts[rows.start:rows.stop],
+                store.types[rows.start:rows.stop])
+    start = None if start_ord is None else datetime.date.fromordinal(start_ord).isoformat()
+    end = None if end_ord is None else datetime.date.fromordinal(end_ord - 1).isoformat()
+    txs = list(profile.iter_transactions(start, end))
+    return (array("i", (t.ordinal for t in txs)), array("d", (t.amount for t in txs)),
+            array("b", (TYPE_CODES.get(t.get_type(), 0) for t in txs)))
+
+
+def _sums_numpy(dates, amounts, types, freq, first, count):
+    dates = np.frombuffer(dates, dtype=np.int32) if len(dates) else np.zeros(0, dtype=np.int32)
+    amounts = np.frombuffer(amounts, dtype=np.float64) if len(amounts) else np.zeros(0)
+    types = np.frombuffer(types, dtype=np.int8) if len(types) else np.zeros(0, dtype=np.int8)
+    if freq == "day":
+        periods = dates.astype(np.int64)
+    elif freq == "week":
+        periods = (dates.astype(np.int64) - 1) // 7
+    else:
+        months = (dates.astype(np.int64) - _EPOCH).astype("datetime64[D]").astype("datetime64[M]")
+        periods = months.astype(np.int64) + 1970 * 12
+    index = periods - first
+    income = np.bincount(index, weights=np.where(types == _INCOME, amounts, 0.0), minlength=count)
+    expense = np.bincount(index, weights=np.where(types == _EXPENSE, amounts, 0.0), minlength=count)
+    return income.tolist(), expense.tolist()
+
+
+def _sums_python(dates, amounts, types, freq, first, count):
+    income = [0.0] * count
+    expense = [0.0] * count
+    #many transactions share a day, so work out each day's period once
+    period_of = {}
+    for ordinal, amount, code in zip(dates, amounts, types):
+        period = period_of.get(ordinal)
+        if period is None:
+            period = period_of[ordinal] = _period(ordinal, freq)
+        if code == _INCOME:
+            income[period - first] += amount
+        elif code == _EXPENSE:
+            expense[period - first] += amount
+    return income, expense
+
+
+def cash_flow(profile, freq="month", start=None, end=None):
+    '''
+    Returns a CashFlowSeries for the profile, one entry per day, week or month
+    from start to end ("YYYY-MM-DD", inclusive; by default the first and last
+    transaction). The running balance includes everything before start.
+    Uses NumPy over the date/amount columns when available.
+    '''
+    if freq not in FREQUENCIES:
+        raise ValueError(f"Unknown frequency '{freq}'. Expected one of {', '.join(FREQUENCIES)}.")
+    start_ord = None if start is None else parse_date(start)
+    end_ord = None if end is None else parse_date(end) + 1
+    dates, amounts, types = _columns(profile, start_ord, end_ord)
+
+    first_ord = start_ord if start_ord is not None else (dates[0] if len(dates) else None)
+    last_ord = end_ord - 1 if end_ord is not None else (dates[-1] if len(dates) else None)
+    if first_ord is None or last_ord is None or last_ord < first_ord:
+        return CashFlowSeries(freq, [], [], [])
+    first = _period(first_ord, freq)
+    count = _period(last_ord, freq) - first + 1
+
+    sums = _sums_numpy if np is not None else _sums_python
+    income, expense = sums(dates, amounts, types, freq, first, count)
+    periods = [_label(first + i, freq) for i in range(count)]
+    opening = 0.0
+    if start_ord is not None:
+        #everything before start (prefix sums, see Budget.range_totals)
+        from budgetbuddy.core.budget import Budget
+        before = datetime.date.fromordinal(start_ord - 1).isoformat()
+        opening = Budget(profile).range_totals(end=before)["net"]
+    return CashFlowSeries(freq, periods, income, expense, opening)
@@ -0,0 +1,167 @@
+# %%
+import math
+import sys
+from bisect import bisect_left, bisect_right
+from collections import Counter
+
+from budgetbuddy.core.models import Income, Expense, parse_date
+
+#dates outside this range are almost always typos (e.g. 0205-01-01)
+DEFAULT_START = "1900-01-01"
+DEFAULT_END = "2100-12-31"
+
+VALID_TYPES = ("income", "expense")
+
+#problem messages (also used as keys of ValidationReport.counts())
+NEGATIVE = "Transaction amount can't be negative"
+NOT_FINITE = "amount is not a finite number"
+NOT_NUMBER = "amount is not a number"
+BAD_DATE = "date is malformed"
+OUT_OF_RANGE = "date is outside the allowed range"
+UNKNOWN_TYPE = "unknown transaction type"
+TYPE_MISMATCH = "type does not match the transaction class"
+EMPTY_CATEGORY = "category is empty"
+
+_MAX_ORDINAL = 3652059  # datetime.date.max
+
+#classes whose get_type() is just their TYPE
+_PLAIN_CLASSES = (Income, Expense)
+
+
+class ValidationReport:
+    '''
+    Result of a batch validation: which rows have problems and what they are.
+
+    rows: {row index: [problem, ...]} for invalid rows only (row index is the
+    position in the validated batch, or the row of a columnar store)
+    '''
+    def __init__(self, checked, rows):
+        self.checked = checked
+        self.rows = rows
+
+    @property
+    def ok(self):
+        return not self.rows
+
+    @property
+    def invalid(self):
+        return len(self.rows)
+
+    def counts(self):
+        '''
+        Returns {problem: number of rows with it}
+        '''
+        return Counter(problem for problems in self.rows.values() for problem in problems)
+
+    def __repr__(self):
+        return "ValidationReport(checked={}, invalid={})".format(self.checked, self.invalid)
+
+
+def ordinal_range(start=None, end=None):
+    '''
+    Returns the allowed (first, last) date ordinals for "YYYY-MM-DD" bounds (None = default)
+    '''
+    return (parse_date(DEFAULT_START if start is None else start),
+            parse_date(DEFAULT_END if end is None else end))
+
+
+def transaction_problems(tx, start_ord, end_ord):
+    '''
+    Returns the list of problems with one transaction (empty if it is valid)
+    '''
+    problems = []
+    amount = tx.amount
+    if type(amount) not in (float, int):
+        problems.append(NOT_NUMBER)
+    elif not math.isfinite(amount):
+        problems.append(NOT_FINITE)
+    elif amount < 0:
+        problems.append(NEGATIVE)
+
+    ordinal = getattr(tx, "ordinal", None)
+    if type(ordinal) is not int or not 1 <= ordinal <= _MAX_ORDINAL:
+        problems.append(BAD_DATE)
+    elif not start_ord <= ordinal <= end_ord:
+        problems.append(OUT_OF_RANGE)
+
+    tx_type = tx.get_type()
+    if tx_type not in VALID_TYPES:
+        problems.append(UNKNOWN_TYPE)
+    elif getattr(type(tx), "TYPE", tx_type) != tx_type:
+        problems.append(TYPE_MISMATCH)
+
+    category = tx.category
+    if not isinstance(category, str) or not category.strip():
+        problems.append(EMPTY_CATEGORY)
+    return problems
+
+
+def validate_transactions(txs, start=None, end=None):
+    '''
+    Validates a batch of transactions (e.g. an import before it is added) in one pass.
+    start, end: allowed "YYYY-MM-DD" range (default DEFAULT_START..DEFAULT_END)
+    '''
+    start_ord, end_ord = ordinal_range(start, end)
+    limit = sys.float_info.max
+    rows = {}
+    checked = 0
+    for row, tx in enumerate(txs):
+        checked += 1
+        #quick test that passes nearly every row; anything odd gets the full check
+        amount = tx.amount
+        ordinal = getattr(tx, "ordinal", None)
+        if (type(tx) in _PLAIN_CLASSES and type(amount) is float and 0.0 <= amount <= limit
+                and type(ordinal) is int and start_ord <= ordinal <= end_ord
+                and type(tx.category) is str and tx.category.strip()):
+            continue
+        problems = transaction_problems(tx, start_ord, end_ord)
+        if problems:
+            rows[row] = problems
+    return ValidationReport(checked, rows)
+
+
+def validate_columns(store, start=None, end=None):
+    '''
+    Validates a TransactionColumns store straight from its arrays (no objects built).
+    Dates are sorted, so rows outside the range are found with two binary searches.
+    '''
+    start_ord, end_ord = ordinal_range(start, end)
+    rows = {}
+
+    def add(row, problem):
+        rows.setdefault(row, []).append(problem)
+
+    #NaN and infinities fail this comparison too
+    limit = sys.float_info.max
+    for row in [i for i, a in enumerate(store.amounts) if not 0.0 <= a <= limit]:
+        add(row, NEGATIVE if store.amounts[row] < 0 and math.isfinite(store.amounts[row]) else NOT_FINITE)
+
+    dates = store.dates
+    for row in range(0, bisect_left(dates, start_ord)):
+        add(row, OUT_OF_RANGE)
+    for row in range(bisect_right(dates, end_ord), len(dates)):
+        add(row, OUT_OF_RANGE)
+
+    #type codes: 1 income, 2 expense (see columnar.TYPE_CODES)
+    for row in [i for i, code in enumerate(store.types) if code != 1 and code != 2]:
+        add(row, UNKNOWN_TYPE)
+
+    empty = {sid for sid, text in enumerate(store.strings) if not text.strip()}
+    if empty:
+        for row in [i for i, sid in enumerate(store.categories) if sid in empty]:
+            add(row, EMPTY_CATEGORY)
+
+    #problems in the same order as transaction_problems
+    order = (NOT_NUMBER, NOT_FINITE, NEGATIVE, BAD_DATE, OUT_OF_RANGE, UNKNOWN_TYPE, TYPE_MISMATCH, EMPTY_CATEGORY)
+    for problems in rows.values():
+        problems.sort(key=order.index)
+    return ValidationReport(len(store), dict(sorted(rows.items())))
+
+
+def validate_profile(profile, start=None, end=None):
+    '''
+    Validates every transaction of a profile; columnar profiles are checked from their arrays
+    '''
+    if getattr(profile, "columnar", False):
+        return validate_columns(profile.transactions, start, end)
+    return validate_transactions(profile.transactions, start, end)
@@ -1,9 +1,20 @@
-from budgetbuddy.data.repository import (
-    load_profiles,
-    save_profiles,
-    create_profile,
-    delete_profile,
-    rename_profile,
-)
-from budgetbuddy.data.csvio import export_profile_to_csv, import_transactions_from_csv
+from budgetbuddy._lazy import lazy_module
 
+# name -> module it comes from; imported on first use (PEP 562), so e.g.
+# the csv module is only loaded when CSV import/export is actually used
+_LAZY = {
+    "load_profiles": "budgetbuddy.data.repository",
+    "save_profiles": "budgetbuddy.data.repository",
+    "create_profile": "budgetbuddy.data.repository",
+    "delete_profile": "budgetbuddy.data.repository",
+    "rename_profile": "budgetbuddy.data.repository",
+    "export_profile_to_csv": "budgetbuddy.data.csvio",
+    "export_transactions": "budgetbuddy.data.csvio",
+    "import_transactions_from_csv": "budgetbuddy.data.csvio",
+    "import_transactions_bulk": "budgetbuddy.data.csvio",
+    "import_csv_files": "budgetbuddy.data.csvio",
+}
+
+__all__ = list(_LAZY)
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY)
@@ -0,0 +1,80 @@
+# budgetbuddy/data/autosave.py
+
+import threading
+
+
+class AutoSaver:
+    """
+    Debounced background saving.
+
+    Every change to an attached profile (re)starts a timer; once there have
+    been no changes for `delay` seconds, save() runs on the timer's thread.
+    flush() saves straight away if anything is pending (used on exit).
+
+    save: callable taking no arguments and returning True on success
+        (e.g. lambda: repository.save_profiles(profiles)).
+
+    Saves run while holding `lock`. Code that changes profiles from another
+    thread should hold it too, so a save never sees a half-made change:
+
+        with autosaver.lock:
+            profile.add_transaction(tx)
+    """
+
+    def __init__(self, save, delay=2.0):
+        self.save = save
+        self.delay = delay
+        self.lock = threading.RLock()
+        # guards pending/_timer; never held while saving
+        self._state_lock = threading.Lock()
+        self._timer = None
+        # True when there are changes that have not been saved yet
+        self.pending = False
+
+    def attach(self, profile):
+        """Schedule a save after each change made to profile."""
+        if self._on_change not in profile.listeners:
+            profile.listeners.append(self._on_change)
+
+    def attach_all(self, profiles):
+        for profile in profiles.values():
+            self.attach(profile)
+
+    def _on_change(self, profile, op, tx, old):
+        self.schedule()
+
+    def schedule(self):
+        """Mark changes as pending and restart the quiet-period timer."""
+        with self._state_lock:
+            self.pending = True
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self.flush)
+            # never keep the program alive just for an autosave
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """
+        Save now if there are pending changes. Returns False if the save
+        failed (the changes stay pending and are retried on the next flush).
+        """
+        with self._state_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self.pending:
+                return True
+            self.pending = False
+        with self.lock:
+            saved = self.save()
+        if not saved:
+            with self._state_lock:
+                self.pending = True
+        return saved
+
+    def save_now(self):
+        """Save straight away, whether or not anything is pending."""
+        with self._state_lock:
+            self.pending = True
+        return self.flush()
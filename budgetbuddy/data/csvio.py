@@ -1,6 +1,42 @@
 import csv
+import glob
+import gzip
+import io
+import os
+import time
+from itertools import islice
+from operator import itemgetter
+from pathlib import Path
 
-from budgetbuddy.core.models import Income, Expense
+from budgetbuddy.core.duplicates import DuplicateFilter, check_mode, fingerprint
+from budgetbuddy.core.models import Income, Expense, parse_date
+
+
+FIELDS = ["date", "amount", "category", "description", "type"]
+# columns the bulk imports cannot do without
+REQUIRED_FIELDS = ["date", "amount"]
+
+
+class ImportReport:
+    """Summary returned by import_transactions_bulk()."""
+
+    def __init__(self, path):
+        self.path = path
+        self.rows_read = 0
+        self.accepted = 0
+        self.rejected = 0
+        # rows already in the profile (skipped or flagged, see duplicates=)
+        self.duplicates = 0
+        self.elapsed = 0.0
+        # where rejected rows were written (None if there were none)
+        self.reject_path = None
+        # set if the file could not be read at all (or lacks a required column)
+        self.error = None
+
+    def __repr__(self):
+        return ("ImportReport(path={!r}, rows_read={}, accepted={}, rejected={}, duplicates={}, elapsed={:.3f}s)"
+                .format(str(self.path), self.rows_read, self.accepted, self.rejected, self.duplicates,
+                        self.elapsed))
 
 
 def export_profile_to_csv(profile, path):
@@ -21,19 +57,104 @@ def export_profile_to_csv(profile, path):
                     "amount": tx.amount,
                     "category": tx.category,
                     "description": tx.description,
-                    "type": tx.get_type(),  # "income" or "expense"
+                    "type": tx.TYPE,  # "income" or "expense"
                 })
     except OSError as e:
         # Handle file write errors gracefully (e.g. permission denied, disk full)
         print(f"Error: could not write CSV file '{path}': {e}")
 
 
-def import_transactions_from_csv(profile, path):
+def export_transactions(profile, path, start=None, end=None, tx_type=None, category=None, compress=None):
+    """
+    Stream a filtered export of a profile to a CSV file.
+
+    start, end: "YYYY-MM-DD" bounds (inclusive); only the months in the
+        range are read from the profile.
+    tx_type: "income" or "expense" to export only that type.
+    category: one category name or a collection of names.
+    compress: gzip the output. By default this follows the path
+        (".gz" suffix -> compressed).
+
+    Rows are written as tuples straight from profile.iter_records(), so no
+    dict or list of rows is built. Columns are the same as
+    export_profile_to_csv. The rows go to a temp file that is fsynced and
+    renamed over path, so a failed export never leaves a partial file or
+    truncates an existing one.
+
+    Returns the number of rows written (0 if the file could not be written).
+
+    Raises:
+        ValueError: if start or end is not a valid date.
+    """
+    # iter_records only parses the bounds once it is read, so check them
+    # before anything is written
+    for bound in (start, end):
+        if bound is not None:
+            parse_date(bound)
+    path = Path(path)
+    if compress is None:
+        compress = path.name.endswith(".gz")
+    if isinstance(category, str):
+        category = {category}
+    elif category is not None:
+        category = set(category)
+
+    records = profile.iter_records(start, end)
+    if tx_type is not None:
+        tx_type = tx_type.lower()
+        records = (r for r in records if r[4] == tx_type)
+    if category is not None:
+        records = (r for r in records if r[2] in category)
+
+    tmp = path.with_name(path.name + ".tmp")
+    written = 0
+    try:
+        with open(tmp, "wb") as raw:
+            # GzipFile leaves raw open and stores the real file name in the header
+            binary = gzip.GzipFile(filename=path.name, mode="wb", fileobj=raw) if compress else raw
+            f = io.TextIOWrapper(binary, encoding="utf-8", newline="")
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            for record in records:
+                writer.writerow(record)
+                written += 1
+            f.flush()
+            f.detach()
+            if compress:
+                # writes the gzip trailer
+                binary.close()
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Error: could not write CSV file '{path}': {e}")
+        written = 0
+    finally:
+        # only still there if the export failed
+        tmp.unlink(missing_ok=True)
+    return written
+
+
+def import_transactions_from_csv(profile, path, duplicates="keep"):
     """
     Load transactions from a CSV file into a profile.
 
-    Lines with invalid numeric amounts are skipped with a warning.
+    Lines with invalid numeric amounts or dates are skipped with a warning.
+
+    duplicates: what to do with rows that are already in the profile (same
+        date, amount, category, description and type), e.g. when an
+        overlapping bank export is imported again:
+        "keep" adds them (default), "skip" leaves them out and "flag" adds
+        them with a warning.
+
+    Returns the list of duplicate transactions found (empty for "keep").
+
+    Raises:
+        ValueError: if duplicates is not one of the modes above.
     """
+    check_mode(duplicates)
+    dup_filter = None if duplicates == "keep" else DuplicateFilter(profile)
+    found = []
     try:
         with open(path, newline="", encoding="utf-8") as f:
             reader = csv.DictReader(f)
@@ -50,11 +171,21 @@ def import_transactions_from_csv(profile, path):
                 category = row.get("category", "")
                 description = row.get("description", "")
 
-                if tx_type == "income":
-                    tx = Income(date, amount, category, description)
-                else:
-                    # Treat anything else as an expense
-                    tx = Expense(date, amount, category, description)
+                try:
+                    if tx_type == "income":
+                        tx = Income(date, amount, category, description)
+                    else:
+                        # Treat anything else as an expense
+                        tx = Expense(date, amount, category, description)
+                except ValueError:
+                    print(f"Warning: skipping row with invalid date: {row}")
+                    continue
+
+                if dup_filter is not None and dup_filter.is_duplicate(fingerprint(tx)):
+                    found.append(tx)
+                    if duplicates == "skip":
+                        continue
+                    print(f"Warning: possible duplicate: {row}")
 
                 profile.add_transaction(tx)
 
@@ -62,3 +193,236 @@ def import_transactions_from_csv(profile, path):
         print(f"Error: CSV file '{path}' not found.")
     except OSError as e:
         print(f"Error: could not read CSV file '{path}': {e}")
+    return found
+
+
+def _parse_chunk(rows, columns, first_line):
+    """
+    Validate one chunk of CSV rows (lists of strings).
+
+    Returns (records, rejects): records are plain
+    (ordinal, amount, category, description, is_income) tuples so they can
+    be sent back from a worker process cheaply; rejects are (line, reason, row).
+    Blank lines are skipped, as csv.DictReader does.
+    """
+    date_col, amount_col, cat_col, desc_col, type_col = columns
+    records, rejects = [], []
+    for line, row in enumerate(rows, first_line):
+        if not row:
+            continue
+        try:
+            amount = float(row[amount_col])
+        except (IndexError, TypeError, ValueError):
+            rejects.append((line, "invalid amount", row))
+            continue
+        try:
+            ordinal = parse_date(row[date_col])
+        except (IndexError, ValueError):
+            rejects.append((line, "invalid date", row))
+            continue
+        category = row[cat_col] if cat_col is not None and cat_col < len(row) else ""
+        description = row[desc_col] if desc_col is not None and desc_col < len(row) else ""
+        # Treat anything but income as an expense (same as import_transactions_from_csv)
+        is_income = type_col is not None and type_col < len(row) and row[type_col].lower() == "income"
+        records.append((ordinal, amount, category, description, is_income))
+    return records, rejects
+
+
+def _read_csv_file(path, chunk_size):
+    """
+    Read and validate a whole CSV file in chunks of chunk_size rows.
+
+    Returns (records, rejects, header, rows_read, elapsed). Runs in worker
+    processes for import_csv_files(), so it only returns picklable values.
+
+    Raises:
+        OSError: if the file cannot be read.
+        ValueError: if the header has no date or no amount column.
+    """
+    started = time.perf_counter()
+    records, rejects = [], []
+    rows_read = 0
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = [name.strip().lower() for name in next(reader, [])]
+        missing = [name for name in REQUIRED_FIELDS if name not in header]
+        if missing:
+            # checked once here rather than failing on every row
+            raise ValueError("missing column(s): {}".format(", ".join(missing)))
+        columns = [header.index(name) if name in header else None for name in FIELDS]
+        line = 2  # line 1 is the header
+        while True:
+            rows = list(islice(reader, chunk_size))
+            if not rows:
+                break
+            good, bad = _parse_chunk(rows, columns, line)
+            records.extend(good)
+            rejects.extend(bad)
+            line += len(rows)
+            # blank lines are not rows
+            rows_read += len(rows) - rows.count([])
+    return records, rejects, header, rows_read, time.perf_counter() - started
+
+
+def _build_transactions(records):
+    return [(Income if is_income else Expense).from_parts(ordinal, amount, category, description)
+            for ordinal, amount, category, description, is_income in records]
+
+
+def _drop_duplicates(records, dup_filter, duplicates):
+    """
+    Check parsed records against the profile. Returns (records to add, number of duplicates).
+
+    Kept records are added to dup_filter, so a later batch checked with the
+    same filter (see DuplicateFilter.next_batch) counts them as in the profile.
+    """
+    count = 0
+    kept = []
+    for record in records:
+        ordinal, amount, category, description, is_income = record
+        key = (ordinal, amount, category, description, "income" if is_income else "expense")
+        if dup_filter.is_duplicate(key):
+            count += 1
+            if duplicates == "skip":
+                continue
+        dup_filter.add(key)
+        kept.append(record)
+    return kept, count
+
+
+def _write_rejects(report, reject_path, header, rejects):
+    """Write rejected rows (with line number and reason) and record where in the report."""
+    report.rejected = len(rejects)
+    if not rejects:
+        return
+    report.reject_path = Path(reject_path) if reject_path else Path(str(report.path) + ".rejects.csv")
+    try:
+        with open(report.reject_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["line", "reason"] + header)
+            writer.writerows([line, reason] + row for line, reason, row in rejects)
+    except OSError as e:
+        print(f"Error: could not write reject file '{report.reject_path}': {e}")
+        report.reject_path = None
+
+
+def import_transactions_bulk(profile, path, chunk_size=50000, reject_path=None, duplicates="keep"):
+    """
+    Fast import of a large CSV file into a profile.
+
+    Rows are read and validated in chunks of chunk_size, and all valid
+    transactions are added to the profile in one extend_transactions() call.
+    Nothing is printed per row: rejected rows are written, with the reason,
+    to reject_path (default: "<path>.rejects.csv", only created if needed).
+
+    duplicates: "keep", "skip" or "flag" rows already in the profile, as for
+        import_transactions_from_csv(). Each row is one hash lookup; the
+        number found is report.duplicates ("skip" leaves them out of accepted).
+
+    A file whose header has no date or no amount column is not imported at
+    all; report.error says which column is missing.
+
+    Returns an ImportReport.
+    """
+    check_mode(duplicates)
+    report = ImportReport(path)
+    started = time.perf_counter()
+    try:
+        records, rejects, header, report.rows_read, _ = _read_csv_file(path, chunk_size)
+    except (OSError, ValueError) as e:
+        print(f"Error: could not read CSV file '{path}': {e}")
+        report.error = e
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    if duplicates != "keep":
+        records, report.duplicates = _drop_duplicates(records, DuplicateFilter(profile), duplicates)
+    profile.extend_transactions(_build_transactions(records))
+    report.accepted = len(records)
+    _write_rejects(report, reject_path, header, rejects)
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def _map_files(paths, chunk_size, workers):
+    """
+    Run _read_csv_file on every path, in a process pool when there is more
+    than one file. Yields (path, result or the OSError / ValueError raised)
+    in the order of paths.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(paths))
+    if workers > 1:
+        # imported here so plain CSV import/export doesn't pay for it
+        from concurrent.futures import ProcessPoolExecutor
+        try:
+            pool = ProcessPoolExecutor(max_workers=workers)
+        except (OSError, NotImplementedError):
+            # no process support on this platform, fall back to a serial import
+            pool = None
+        if pool is not None:
+            with pool:
+                futures = [pool.submit(_read_csv_file, path, chunk_size) for path in paths]
+                for path, future in zip(paths, futures):
+                    try:
+                        yield path, future.result()
+                    except (OSError, ValueError) as e:
+                        yield path, e
+            return
+    for path in paths:
+        try:
+            yield path, _read_csv_file(path, chunk_size)
+        except (OSError, ValueError) as e:
+            yield path, e
+
+
+def import_csv_files(profile, paths, workers=None, chunk_size=50000, duplicates="keep"):
+    """
+    Import many CSV files (e.g. a year of monthly statements) into a profile.
+
+    paths: a list of paths, or a glob pattern such as "statements/*.csv"
+        (matching files are imported in sorted name order).
+    workers: number of worker processes parsing files (default: CPU count).
+
+    Files are parsed concurrently and the results merged into the profile in
+    date order with one extend_transactions() call. The result is the same
+    as importing the files one by one in the given order and then sorting by
+    date (ties keep that order). Rejected rows of each file are written to
+    "<file>.rejects.csv" as with import_transactions_bulk().
+
+    duplicates: "keep", "skip" or "flag" rows that are already in the profile
+        or in an earlier file (see import_transactions_bulk()), as a serial
+        import would.
+
+    Returns a list with one ImportReport per file.
+    """
+    check_mode(duplicates)
+    if isinstance(paths, (str, Path)):
+        paths = sorted(glob.glob(str(paths)))
+    paths = list(paths)
+
+    # one filter for all files, fed in path order, so each file is checked
+    # against the profile plus the rows kept from the files before it
+    dup_filter = None if duplicates == "keep" else DuplicateFilter(profile)
+    reports = []
+    records = []
+    for path, result in _map_files(paths, chunk_size, workers):
+        report = ImportReport(path)
+        reports.append(report)
+        if isinstance(result, (OSError, ValueError)):
+            print(f"Error: could not read CSV file '{path}': {result}")
+            report.error = result
+            continue
+        file_records, rejects, header, report.rows_read, report.elapsed = result
+        if dup_filter is not None:
+            file_records, report.duplicates = _drop_duplicates(file_records, dup_filter, duplicates)
+            dup_filter.next_batch()
+        records.extend(file_records)
+        report.accepted = len(file_records)
+        _write_rejects(report, None, header, rejects)
+
+    # stable, so rows with the same date keep file order then row order
+    records.sort(key=itemgetter(0))
+    profile.extend_transactions(_build_transactions(records))
+    return reports
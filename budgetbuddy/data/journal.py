@@ -0,0 +1,177 @@
+# budgetbuddy/data/journal.py
+
+import json
+import os
+
+from budgetbuddy.core.models import Transaction, ordinal_month
+
+
+class Journal:
+    """
+    Append-only log of transaction changes made since the last save.
+
+    The file holds one JSON object per line. The first line is a header
+    {"base": token} naming the snapshot the records apply to; every other
+    line is {"op": "add" | "edit" | "delete", "profile": name, "tx": {...}}
+    (edits also carry "old", the transaction before the change), or
+    {"op": "add_many" | "delete_many", "profile": name, "txs": [...]} for a batch.
+
+    snapshot_token: callable returning the current snapshot token, used for
+        the header of a new journal.
+    compact_bytes: once the journal grows past this size, on_full() is
+        called (normally a full save, which empties the journal).
+    """
+
+    def __init__(self, path, snapshot_token=lambda: None, fsync=True,
+                 compact_bytes=1_000_000, on_full=None):
+        self.path = path
+        self.snapshot_token = snapshot_token
+        self.fsync = fsync
+        self.compact_bytes = compact_bytes
+        self.on_full = on_full
+
+    # ===== Writing =====
+
+    def attach(self, profile):
+        """Start journaling changes made to profile."""
+        if self._record not in profile.listeners:
+            profile.listeners.append(self._record)
+
+    def attach_all(self, profiles):
+        for profile in profiles.values():
+            self.attach(profile)
+
+    def _record(self, profile, op, tx, old):
+        if op in ("add_many", "delete_many"):
+            self.append({"op": op, "profile": profile.name, "txs": [t.to_dict() for t in tx]})
+            return
+        record = {"op": op, "profile": profile.name, "tx": tx.to_dict()}
+        if old is not None:
+            record["old"] = old
+        self.append(record)
+
+    def append(self, record):
+        """Append one record, writing the header first if the journal is new."""
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                if f.tell() == 0:
+                    f.write(json.dumps({"base": self.snapshot_token()}) + "\n")
+                f.write(line)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+                size = f.tell()
+        except OSError as e:
+            print(f"Error: could not write journal {self.path}: {e}")
+            return
+        if self.on_full is not None and size > self.compact_bytes:
+            self.on_full()
+
+    def reset(self, base_token):
+        """
+        Empty the journal after its records were saved in a snapshot.
+
+        The new header is written to a temp file and renamed over the old
+        journal, so a crash leaves either the old or the new journal.
+        """
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"base": base_token}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    # ===== Reading =====
+
+    def records(self):
+        """
+        Return (base token, list of records). A torn last line from a crash is ignored.
+        """
+        base, records = None, []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return base, records
+        for i, line in enumerate(lines):
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError:
+                # only the last line can be half written
+                break
+            if i == 0:
+                base = item.get("base")
+            else:
+                records.append(item)
+        return base, records
+
+    def replay(self, profiles, snapshot_token):
+        """
+        Re-apply journaled changes to freshly loaded profiles.
+
+        Records are only applied when the journal was written against the
+        snapshot that was just loaded; otherwise they are already part of it.
+        Returns the number of records applied.
+        """
+        base, records = self.records()
+        if not records or base != snapshot_token:
+            return 0
+        applied = 0
+        for record in records:
+            profile = profiles.get(record.get("profile"))
+            if profile is None:
+                continue
+            if _apply(profile, record):
+                applied += 1
+        return applied
+
+
+def _find(profile, data):
+    """Return the profile's transaction with the same values as data, or None."""
+    target = Transaction.from_dict(data)
+    if target is None:
+        return None
+    wanted = target.to_dict()
+    year, month = ordinal_month(target.ordinal)
+    for tx in profile.list_transactions(month, year):
+        if tx.to_dict() == wanted:
+            return tx
+    return None
+
+
+def _apply(profile, record):
+    op = record.get("op")
+    if op == "add":
+        tx = Transaction.from_dict(record["tx"])
+        if tx is None:
+            return False
+        profile.add_transaction(tx)
+        return True
+    if op == "add_many":
+        txs = [Transaction.from_dict(data) for data in record["txs"]]
+        profile.extend_transactions(tx for tx in txs if tx is not None)
+        return True
+    if op == "delete":
+        tx = _find(profile, record["tx"])
+        if tx is None:
+            return False
+        profile.delete_transaction(tx)
+        return True
+    if op == "delete_many":
+        applied = False
+        for data in record["txs"]:
+            tx = _find(profile, data)
+            if tx is not None:
+                profile.delete_transaction(tx)
+                applied = True
+        return applied
+    if op == "edit":
+        tx = _find(profile, record["old"])
+        new = record["tx"]
+        if tx is None:
+            return False
+        profile.edit_transaction(tx, date=new["date"], amount=new["amount"],
+                                 category=new["category"], description=new["description"])
+        return True
+    return False
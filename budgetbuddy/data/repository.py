@@ -1,46 +1,141 @@
 # budgetbuddy/data/repository.py
 
 import json
+import os
 from pathlib import Path
 
 from budgetbuddy.core.models import UserProfile
+from budgetbuddy.data.journal import Journal
 
 
-# Main data file used by the application
+# Main data file used by the application. The format follows the suffix:
+#   .json  one JSON document with every profile
+#   .bbs   binary snapshot (see snapshot.py), memory-mapped on load
+#   none   (e.g. Path("budgetbuddy_data")) sharded layout: a directory
+#          with a manifest plus one file per profile
 DATA_FILE = Path("budgetbuddy_data.json")
 
+SNAPSHOT_SUFFIX = ".bbs"
+
+# Names used inside a sharded data directory
+MANIFEST_NAME = "manifest.json"
+SHARD_DIR_NAME = "profiles"
+
 
 class ProfileDataError(Exception):
     """Raised when the profiles data file cannot be read or parsed."""
     pass
 
 
-def load_profiles():
+def _is_sharded(path):
+    """True if the data path uses the one-file-per-profile layout."""
+    return path.suffix == ""
+
+
+def journal_path():
+    """Path of the change journal that goes with DATA_FILE."""
+    return DATA_FILE.with_name(DATA_FILE.name + ".journal")
+
+
+def snapshot_token():
     """
-    Load all profiles from DATA_FILE.
+    Identify the current snapshot on disk (None if there is none yet).
 
-    Returns a dict mapping profile name -> UserProfile.
+    Every save replaces the snapshot (or, in the sharded layout, the
+    manifest) with a new file, so its inode/size/mtime change.
+    """
+    path = DATA_FILE / MANIFEST_NAME if _is_sharded(DATA_FILE) else DATA_FILE
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return f"{st.st_ino}-{st.st_size}-{st.st_mtime_ns}"
 
-    Raises:
-        ProfileDataError: if the JSON file is corrupted or cannot be read.
+
+def open_journal(**options):
+    """Return a Journal for DATA_FILE (see journal.Journal for options)."""
+    return Journal(journal_path(), snapshot_token, **options)
+
+
+def _atomic_write_json(path, data, **dump_options):
     """
-    # If the file does not exist yet, just return an empty dict
-    if not DATA_FILE.exists():
-        return {}
+    Write JSON to a temp file, fsync it and rename it over path, so a crash
+    never leaves a half-written file behind.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(data, f, **dump_options)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
 
+
+def _read_json(path):
+    """Read a JSON file, turning any failure into ProfileDataError."""
     try:
-        with DATA_FILE.open("r", encoding="utf-8") as f:
-            raw = json.load(f)
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
     except json.JSONDecodeError as e:
         # File exists but contains invalid JSON
-        raise ProfileDataError(f"Data file {DATA_FILE} is corrupted.") from e
+        raise ProfileDataError(f"Data file {path} is corrupted.") from e
     except OSError as e:
         # Permission / I/O issues
-        raise ProfileDataError(f"Could not read data file {DATA_FILE}.") from e
+        raise ProfileDataError(f"Could not read data file {path}.") from e
+
+
+def load_profiles(lazy=False):
+    """
+    Load all profiles from DATA_FILE.
+
+    Returns a dict mapping profile name -> UserProfile.
+
+    With lazy=True only the profile names are set up; each profile's
+    transactions are turned into objects the first time it is used.
+    In the sharded layout the profile's file is not even read until then.
+
+    Changes recorded in the journal since the last save are re-applied.
+
+    Dates saved in an older form (e.g. "2025-1-5") are read as YYYY-MM-DD.
+
+    Raises:
+        ProfileDataError: if the JSON file is corrupted or cannot be read, or
+            (when not lazy) holds a date that cannot be read.
+    """
+    profiles = _load_path(DATA_FILE, lazy)
+    if journal_path().exists():
+        open_journal().replay(profiles, snapshot_token())
+    return profiles
+
+
+def _load_path(path, lazy):
+    if _is_sharded(path):
+        return _load_sharded(path, lazy)
+
+    # If the file does not exist yet, just return an empty dict
+    if not path.exists():
+        return {}
+
+    if path.suffix == SNAPSHOT_SUFFIX:
+        # only needed for .bbs files, so imported here to keep startup fast
+        from budgetbuddy.data import snapshot
+        try:
+            return snapshot.read_snapshot(path, lazy)
+        except (OSError, ValueError, snapshot.SnapshotError) as e:
+            raise ProfileDataError(f"Could not read snapshot {path}.") from e
+
+    raw = _read_json(path)
 
     profiles = {}
     for name, pdata in raw.items():
-        profile = UserProfile.from_dict(pdata)
+        if lazy:
+            records = pdata.get("transactions", [])
+            profile = UserProfile.deferred(pdata["name"], lambda records=records: records)
+        else:
+            try:
+                profile = UserProfile.from_dict(pdata)
+            except ValueError as e:
+                # a saved date that cannot be read: refuse rather than drop the row
+                raise ProfileDataError(f"Profile '{name}' in {path} has an invalid transaction: {e}") from e
         profiles[name] = profile
     return profiles
 
@@ -50,15 +145,144 @@ def save_profiles(profiles):
     Save all profiles to DATA_FILE.
 
     profiles: dict mapping name -> UserProfile
+
+    In the sharded layout only profiles with unsaved changes are written.
+    Files are replaced atomically, and once everything is saved the
+    journal is emptied. Returns True if the save succeeded.
+    """
+    saved = _save_path(DATA_FILE, profiles)
+    if saved and journal_path().exists():
+        try:
+            open_journal().reset(snapshot_token())
+        except OSError as e:
+            print(f"Error: could not reset journal {journal_path()}: {e}")
+    return saved
+
+
+def _save_path(path, profiles):
+    if _is_sharded(path):
+        return _save_sharded(path, profiles)
+    if path.suffix == SNAPSHOT_SUFFIX:
+        return _save_binary(path, profiles)
+    return _save_single(path, profiles)
+
+
+def convert_data_file(source, target):
     """
+    Copy all profiles from one data file to another, converting between
+    formats by suffix (e.g. budgetbuddy_data.json -> budgetbuddy_data.bbs).
+
+    Returns True if the target was written.
+    """
+    return _save_path(Path(target), _load_path(Path(source), lazy=True))
+
+
+def _save_binary(path, profiles):
+    from budgetbuddy.data import snapshot
+    try:
+        snapshot.write_snapshot(profiles, path)
+    except OSError as e:
+        print(f"Error: could not save data to {path}: {e}")
+        return False
+
+    for profile in profiles.values():
+        profile.dirty = False
+    return True
+
+
+def _save_single(path, profiles):
     data = {name: profile.to_dict() for name, profile in profiles.items()}
 
     try:
-        with DATA_FILE.open("w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        _atomic_write_json(path, data, indent=2)
     except OSError as e:
         # For CLI use we just print an error message instead of crashing
-        print(f"Error: could not save data to {DATA_FILE}: {e}")
+        print(f"Error: could not save data to {path}: {e}")
+        return False
+
+    for profile in profiles.values():
+        profile.dirty = False
+    return True
+
+
+# ===== Sharded layout =====
+
+def _read_manifest(data_dir):
+    """Return {profile name: shard file name} from the manifest (empty if missing)."""
+    manifest_path = data_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        return {}
+    return _read_json(manifest_path).get("profiles", {})
+
+
+def _load_sharded(data_dir, lazy):
+    profiles = {}
+    for name, shard in _read_manifest(data_dir).items():
+        shard_path = data_dir / SHARD_DIR_NAME / shard
+
+        def load_records(shard_path=shard_path):
+            return _read_json(shard_path).get("transactions", [])
+
+        profile = UserProfile.deferred(name, load_records)
+        if not lazy:
+            # touching the transactions decodes the profile now
+            try:
+                profile.transactions
+            except ValueError as e:
+                raise ProfileDataError(f"Profile '{name}' in {data_dir} has an invalid transaction: {e}") from e
+        profile.storage_key = shard
+        profiles[name] = profile
+    return profiles
+
+
+def _save_sharded(data_dir, profiles):
+    import uuid
+    shard_dir = data_dir / SHARD_DIR_NAME
+    try:
+        shard_dir.mkdir(parents=True, exist_ok=True)
+        old_manifest = _read_manifest(data_dir)
+    except (OSError, ProfileDataError) as e:
+        print(f"Error: could not save data to {data_dir}: {e}")
+        return False
+
+    saved = True
+    written = False
+    known_shards = set(old_manifest.values())
+    manifest = {}
+    for name, profile in profiles.items():
+        if not profile.dirty and profile.storage_key in known_shards:
+            manifest[name] = profile.storage_key
+            continue
+
+        # changed profiles go to a new file; switching the manifest over to it
+        # is what commits the save (the old file is removed afterwards)
+        shard = uuid.uuid4().hex + ".json"
+
+        records = profile.to_dict()["transactions"]
+        try:
+            _atomic_write_json(shard_dir / shard, {"transactions": records}, separators=(",", ":"))
+        except OSError as e:
+            print(f"Error: could not save profile '{name}' to {data_dir}: {e}")
+            saved = False
+            if profile.storage_key in known_shards:
+                manifest[name] = profile.storage_key
+            continue
+        profile.storage_key = shard
+        profile.dirty = False
+        manifest[name] = shard
+        written = True
+
+    try:
+        # the manifest is rewritten after any change so snapshot_token() moves on
+        if written or manifest != old_manifest:
+            _atomic_write_json(data_dir / MANIFEST_NAME, {"profiles": manifest}, indent=2)
+        # remove files of deleted (or rewritten elsewhere) profiles
+        for shard in known_shards - set(manifest.values()):
+            (shard_dir / shard).unlink(missing_ok=True)
+    except OSError as e:
+        print(f"Error: could not save data to {data_dir}: {e}")
+        return False
+    return saved
 
 
 def create_profile(profiles, name):
@@ -0,0 +1,240 @@
+# budgetbuddy/data/snapshot.py
+
+"""
+Compact binary snapshot format for profiles (".bbs" files).
+
+Layout (little-endian):
+
+    header      magic b"BBS1", version, string count, profile count   (4s I I I)
+    directory   per profile: name string id, row count, column offset  (I I Q)
+    strings     (string count + 1) uint32 offsets, then the UTF-8 bytes
+    columns     per profile, 8-byte aligned:
+                amounts float64[n], dates int32[n] (ordinals),
+                categories uint32[n], descriptions uint32[n], types int8[n]
+
+Rows are stored in date order, so a profile's columns are loaded straight
+into a TransactionColumns store. The file is memory-mapped and a profile's
+columns are only copied out of the map when that profile is first used.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from budgetbuddy.core.columnar import TransactionColumns, TYPE_CODES
+from budgetbuddy.core.models import UserProfile
+
+MAGIC = b"BBS1"
+VERSION = 1
+HEADER = struct.Struct("<4sIII")
+ENTRY = struct.Struct("<IIQ")
+
+# (attribute on TransactionColumns, array typecode), in file order
+COLUMNS = (
+    ("amounts", "d"),
+    ("dates", "i"),
+    ("categories", "I"),
+    ("descriptions", "I"),
+    ("types", "b"),
+)
+
+_SWAP = sys.byteorder == "big"
+# bytes per row over all columns
+ROW_SIZE = sum(array(typecode).itemsize for _, typecode in COLUMNS)
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is not a valid BudgetBuddy snapshot."""
+    pass
+
+
+def _pad(size):
+    return -size % 8
+
+
+# ===== Writing =====
+
+class _StringTable:
+    def __init__(self):
+        self.strings = []
+        self.ids = {}
+
+    def id(self, text):
+        sid = self.ids.get(text)
+        if sid is None:
+            sid = self.ids[text] = len(self.strings)
+            self.strings.append(text)
+        return sid
+
+
+def _profile_columns(profile, table):
+    """Return the profile's columns (dict of arrays) using the file-wide string table."""
+    if profile.columnar:
+        store = profile.transactions
+        remap = [table.id(text) for text in store.strings]
+        return {
+            "amounts": array("d", store.amounts),
+            "dates": array("i", store.dates),
+            "categories": array("I", (remap[i] for i in store.categories)),
+            "descriptions": array("I", (remap[i] for i in store.descriptions)),
+            "types": array("b", store.types),
+        }
+    # list-backed profile: sort by date (stable, so ties keep insertion order)
+    txs = sorted(profile.transactions, key=lambda tx: tx.ordinal)
+    return {
+        "amounts": array("d", (tx.amount for tx in txs)),
+        "dates": array("i", (tx.ordinal for tx in txs)),
+        "categories": array("I", (table.id(tx.category) for tx in txs)),
+        "descriptions": array("I", (table.id(tx.description) for tx in txs)),
+        "types": array("b", (TYPE_CODES[tx.TYPE] for tx in txs)),
+    }
+
+
+def write_snapshot(profiles, path):
+    """
+    Write profiles (dict name -> UserProfile) to a snapshot file.
+
+    The file is written to a temp file, fsynced and renamed into place.
+    """
+    table = _StringTable()
+    entries = []
+    for name, profile in profiles.items():
+        entries.append((table.id(name), _profile_columns(profile, table)))
+
+    offsets = array("I", [0])
+    blob = bytearray()
+    for text in table.strings:
+        blob += text.encode("utf-8")
+        offsets.append(len(blob))
+
+    position = HEADER.size + ENTRY.size * len(entries) + offsets.itemsize * len(offsets) + len(blob)
+    position += _pad(position)
+    directory = []
+    for name_id, columns in entries:
+        count = len(columns["dates"])
+        directory.append(ENTRY.pack(name_id, count, position))
+        size = sum(columns[attr].itemsize * count for attr, _ in COLUMNS)
+        position += size + _pad(size)
+
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(table.strings), len(entries)))
+        for entry in directory:
+            f.write(entry)
+        if _SWAP:
+            offsets.byteswap()
+        f.write(offsets.tobytes())
+        f.write(blob)
+        f.write(b"\0" * _pad(f.tell()))
+        for _, columns in entries:
+            size = 0
+            for attr, _ in COLUMNS:
+                column = columns[attr]
+                if _SWAP:
+                    column.byteswap()
+                f.write(column.tobytes())
+                size += column.itemsize * len(column)
+            f.write(b"\0" * _pad(size))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# ===== Reading =====
+
+class _MappedSnapshot:
+    """Keeps the file mapped until every profile has copied its columns out."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.pending = 0
+
+    def columns(self, count, offset, strings):
+        view = memoryview(self.map)
+        arrays = {}
+        try:
+            for attr, typecode in COLUMNS:
+                column = array(typecode)
+                size = column.itemsize * count
+                column.frombytes(view[offset:offset + size])
+                if len(column) != count:
+                    # read_snapshot checks the bounds, so only a file changed since then gets here
+                    raise SnapshotError(f"Snapshot column '{attr}' is cut short.")
+                if _SWAP:
+                    column.byteswap()
+                arrays[attr] = column
+                offset += size
+        finally:
+            view.release()
+        self.done()
+        return TransactionColumns.from_arrays(strings=strings, **arrays)
+
+    def done(self):
+        self.pending -= 1
+        if self.pending <= 0:
+            self.map.close()
+
+
+def read_snapshot(path, lazy=True):
+    """
+    Load profiles (dict name -> UserProfile) from a snapshot file.
+
+    Profiles are columnar. With lazy=True (the default) a profile's columns
+    are copied out of the memory map the first time the profile is used.
+
+    Raises:
+        SnapshotError: if the file is not a valid snapshot.
+    """
+    try:
+        mapped = _MappedSnapshot(path)
+    except ValueError as e:
+        # mmap refuses empty files
+        raise SnapshotError(f"{path} is empty.") from e
+    data = mapped.map
+    try:
+        magic, version, n_strings, n_profiles = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise SnapshotError(f"{path} is not a BudgetBuddy snapshot.")
+        directory = [ENTRY.unpack_from(data, HEADER.size + i * ENTRY.size) for i in range(n_profiles)]
+
+        start = HEADER.size + ENTRY.size * n_profiles
+        offsets = array("I")
+        offsets.frombytes(data[start:start + offsets.itemsize * (n_strings + 1)])
+        if _SWAP:
+            offsets.byteswap()
+        blob_start = start + offsets.itemsize * (n_strings + 1)
+        blob_end = blob_start + offsets[-1]
+        if blob_end > len(data):
+            raise SnapshotError(f"{path} is truncated.")
+        blob = data[blob_start:blob_end]
+        strings = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(n_strings)]
+        # every profile's columns must lie inside the file (and after the strings),
+        # otherwise they would silently come back short when first used
+        for name_id, count, offset in directory:
+            if name_id >= n_strings or offset < blob_end or offset + count * ROW_SIZE > len(data):
+                raise SnapshotError(f"{path} is truncated.")
+    except SnapshotError:
+        mapped.map.close()
+        raise
+    except (struct.error, IndexError, ValueError, UnicodeDecodeError) as e:
+        mapped.map.close()
+        raise SnapshotError(f"{path} is corrupted.") from e
+
+    profiles = {}
+    mapped.pending = len(directory)
+    for name_id, count, offset in directory:
+        name = strings[name_id]
+
+        def load_columns(count=count, offset=offset):
+            return mapped.columns(count, offset, strings)
+
+        profile = UserProfile.deferred(name, load_columns, columnar=True)
+        if not lazy:
+            profile.transactions
+        profiles[name] = profile
+    if not directory:
+        mapped.map.close()
+    return profiles
@@ -0,0 +1,361 @@
+# budgetbuddy/data/sqlite_repository.py
+
+import sqlite3
+from pathlib import Path
+
+from budgetbuddy.core.models import UserProfile, Income, Expense, Transaction, parse_date, month_bounds
+from budgetbuddy.data.repository import ProfileDataError
+
+
+# SQLite database used instead of the JSON data file
+DB_FILE = Path("budgetbuddy_data.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id   INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    id          INTEGER PRIMARY KEY,
+    profile_id  INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    date        INTEGER NOT NULL,
+    amount      REAL NOT NULL,
+    category    TEXT NOT NULL,
+    description TEXT NOT NULL,
+    type        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tx_profile_date ON transactions (profile_id, date);
+CREATE INDEX IF NOT EXISTS tx_profile_category ON transactions (profile_id, category);
+"""
+
+TX_CLASSES = {"income": Income, "expense": Expense}
+
+# one open connection per database path
+_connection = None
+_connection_path = None
+
+
+def connect():
+    """
+    Return the connection to DB_FILE, creating the tables on first use.
+
+    Raises:
+        ProfileDataError: if the database cannot be opened.
+    """
+    global _connection, _connection_path
+    if _connection is not None and _connection_path == DB_FILE:
+        return _connection
+    close()
+    try:
+        conn = sqlite3.connect(str(DB_FILE))
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.executescript(SCHEMA)
+    except sqlite3.Error as e:
+        raise ProfileDataError(f"Could not open database {DB_FILE}.") from e
+    _connection, _connection_path = conn, DB_FILE
+    return conn
+
+
+def close():
+    """Close the open connection (uncommitted changes are discarded)."""
+    global _connection, _connection_path
+    if _connection is not None:
+        _connection.close()
+    _connection, _connection_path = None, None
+
+
+def _build(row):
+    """Turn a (date, amount, category, description, type) row into a transaction."""
+    ordinal, amount, category, description, tx_type = row
+    return TX_CLASSES.get(tx_type, Transaction).from_parts(ordinal, amount, category, description)
+
+
+class SQLiteProfile(UserProfile):
+    """
+    A UserProfile whose transactions live in the database.
+
+    Month and year queries (and so Budget.month_totals / month_transactions)
+    run as indexed SQL queries; nothing is kept in memory. Changes are
+    written straight away and committed by save_profiles().
+    """
+
+    def __init__(self, conn, profile_id, name):
+        # no in-memory storage, so UserProfile.__init__ is not used
+        self.name = name
+        self.columnar = False
+        self.dirty = False
+        self.generation = 0
+        self.storage_key = profile_id
+        self.listeners = []
+        self.conn = conn
+
+    def _select(self, where="", params=(), order="date, id"):
+        sql = ("SELECT date, amount, category, description, type FROM transactions "
+               "WHERE profile_id = ?" + where + " ORDER BY " + order)
+        return [_build(row) for row in self.conn.execute(sql, (self.storage_key,) + params)]
+
+    def _find_id(self, tx):
+        row = self.conn.execute(
+            "SELECT id FROM transactions WHERE profile_id = ? AND date = ? AND amount = ? "
+            "AND category = ? AND description = ? AND type = ? ORDER BY id LIMIT 1",
+            (self.storage_key, tx.ordinal, tx.amount, tx.category, tx.description, tx.TYPE),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def _range_where(self, start, end):
+        """SQL condition and parameters for start <= date <= end (either may be None)."""
+        start_ord, end_ord = self._ordinal_range(start, end)
+        where, params = "", (self.storage_key,)
+        if start_ord is not None:
+            where, params = where + " AND date >= ?", params + (start_ord,)
+        if end_ord is not None:
+            where, params = where + " AND date < ?", params + (end_ord,)
+        return where, params
+
+    @property
+    def transactions(self):
+        """All transactions in the order they were added (reads the whole profile)."""
+        return self._select(order="id")
+
+    def add_transaction(self, tx):
+        self.conn.execute(
+            "INSERT INTO transactions (profile_id, date, amount, category, description, type) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (self.storage_key, tx.ordinal, tx.amount, tx.category, tx.description, tx.TYPE),
+        )
+        self._changed("add", tx)
+
+    def extend_transactions(self, txs):
+        txs = list(txs)
+        self.conn.executemany(
+            "INSERT INTO transactions (profile_id, date, amount, category, description, type) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            ((self.storage_key, tx.ordinal, tx.amount, tx.category, tx.description, tx.TYPE) for tx in txs),
+        )
+        self._changed("add_many", txs)
+
+    def remove_duplicates(self):
+        """Delete exact copies of earlier transactions with one SQL statement."""
+        duplicate_ids = (
+            "SELECT id FROM transactions WHERE profile_id = ? AND id NOT IN "
+            "(SELECT MIN(id) FROM transactions WHERE profile_id = ? "
+            "GROUP BY date, amount, category, description, type)"
+        )
+        params = (self.storage_key, self.storage_key)
+        removed = self._select(" AND id IN (" + duplicate_ids + ")", params, order="id")
+        if not removed:
+            return []
+        self.conn.execute("DELETE FROM transactions WHERE id IN (" + duplicate_ids + ")", params)
+        self._changed("delete_many", removed)
+        return removed
+
+    def list_transactions(self, month=None, year=None):
+        if year is None:
+            return self.transactions
+        if month is None:
+            start, end = month_bounds(year, 1)[0], month_bounds(year, 12)[1]
+        else:
+            start, end = month_bounds(year, month)
+        return self._select(" AND date >= ? AND date < ?", (start, end))
+
+    def iter_transactions(self, start=None, end=None):
+        """Stream transactions in date order from the cursor instead of building a list."""
+        where, params = self._range_where(start, end)
+        sql = ("SELECT date, amount, category, description, type FROM transactions "
+               "WHERE profile_id = ?" + where + " ORDER BY date, id")
+        for row in self.conn.execute(sql, params):
+            yield _build(row)
+
+    def search(self, query, start=None, end=None):
+        """
+        Search with SQL: LIKE narrows the rows down per word, then the exact
+        word match is checked on the (few) rows that come back.
+        """
+        from budgetbuddy.core.search import parse_query, matches
+        terms = parse_query(query)
+        if not terms:
+            return []
+        where, params = self._range_where(start, end)
+        for word, _ in terms:
+            pattern = "%" + word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            where += " AND (lower(category) LIKE ? ESCAPE '\\' OR lower(description) LIKE ? ESCAPE '\\')"
+            params += (pattern, pattern)
+        sql = ("SELECT date, amount, category, description, type FROM transactions "
+               "WHERE profile_id = ?" + where + " ORDER BY date, id")
+        return [tx for tx in map(_build, self.conn.execute(sql, params)) if matches(tx, terms)]
+
+    def latest_transactions(self, n):
+        if n <= 0:
+            return []
+        rows = self.conn.execute(
+            "SELECT date, amount, category, description, type FROM transactions "
+            "WHERE profile_id = ? ORDER BY date DESC, id DESC LIMIT ?",
+            (self.storage_key, n),
+        ).fetchall()
+        return [_build(row) for row in reversed(rows)]
+
+    def top_transactions(self, n, tx_type=None, month=None, year=None, category=None):
+        """Largest n transactions, as ORDER BY amount ... LIMIT n in SQL."""
+        if n <= 0:
+            return []
+        where, params = "", ()
+        if year is not None:
+            if month is None:
+                start, end = month_bounds(year, 1)[0], month_bounds(year, 12)[1]
+            else:
+                start, end = month_bounds(year, month)
+            where, params = " AND date >= ? AND date < ?", (start, end)
+        if tx_type is not None:
+            where, params = where + " AND type = ?", params + (tx_type,)
+        if category is not None:
+            where, params = where + " AND category = ?", params + (category,)
+        rows = self.conn.execute(
+            "SELECT date, amount, category, description, type FROM transactions "
+            "WHERE profile_id = ?" + where + " ORDER BY amount DESC, id LIMIT ?",
+            (self.storage_key,) + params + (n,),
+        )
+        return [_build(row) for row in rows]
+
+    def month_summary(self, month, year):
+        start, end = month_bounds(year, month)
+        totals = dict(self.conn.execute(
+            "SELECT type, SUM(amount) FROM transactions "
+            "WHERE profile_id = ? AND date >= ? AND date < ? GROUP BY type",
+            (self.storage_key, start, end),
+        ).fetchall())
+        if set(totals) - {"income", "expense"}:
+            # same result Budget.month_totals gives for an unknown transaction type
+            return {"income": 0, "expense": 0, "net": 0}
+        income = totals.get("income", 0.0)
+        expense = totals.get("expense", 0.0)
+        return {"income": income, "expense": expense, "net": income - expense}
+
+    def range_summary(self, start=None, end=None):
+        """Income, expense and net for start <= date <= end, as one indexed SQL query."""
+        where, params = self._range_where(start, end)
+        totals = dict(self.conn.execute(
+            "SELECT type, SUM(amount) FROM transactions WHERE profile_id = ?" + where + " GROUP BY type",
+            params,
+        ).fetchall())
+        income = totals.get("income", 0.0)
+        expense = totals.get("expense", 0.0)
+        return {"income": income, "expense": expense, "net": income - expense}
+
+    def edit_transaction(self, tx, date=None, amount=None, category=None, description=None):
+        # convert first so a bad date or amount leaves the transaction untouched
+        ordinal = tx.ordinal if date is None else parse_date(date)
+        amount = tx.amount if amount is None else float(amount)
+        tx_id = self._find_id(tx)
+        if tx_id is None:
+            print("Error: transaction not found. Cannot edit.")
+            return
+        old = tx.to_dict()
+        tx.ordinal, tx.amount = ordinal, amount
+        if category is not None:
+            tx.category = category
+        if description is not None:
+            tx.description = description
+        self.conn.execute(
+            "UPDATE transactions SET date = ?, amount = ?, category = ?, description = ? WHERE id = ?",
+            (tx.ordinal, tx.amount, tx.category, tx.description, tx_id),
+        )
+        self._changed("edit", tx, old)
+
+    def delete_transaction(self, tx):
+        tx_id = self._find_id(tx)
+        if tx_id is None:
+            print("Error: transaction not found. Cannot delete.")
+            return
+        self.conn.execute("DELETE FROM transactions WHERE id = ?", (tx_id,))
+        self._changed("delete", tx)
+
+
+def _insert_profile(conn, name):
+    cur = conn.execute("INSERT INTO profiles (name) VALUES (?)", (name,))
+    return SQLiteProfile(conn, cur.lastrowid, name)
+
+
+def load_profiles():
+    """
+    Return a dict mapping profile name -> SQLiteProfile.
+
+    Only the profile names are read; transactions stay in the database.
+
+    Raises:
+        ProfileDataError: if the database cannot be opened or read.
+    """
+    conn = connect()
+    try:
+        rows = conn.execute("SELECT id, name FROM profiles ORDER BY id").fetchall()
+    except sqlite3.Error as e:
+        raise ProfileDataError(f"Could not read database {DB_FILE}.") from e
+    return {name: SQLiteProfile(conn, profile_id, name) for profile_id, name in rows}
+
+
+def save_profiles(profiles):
+    """
+    Commit all changes to the database.
+
+    profiles: dict mapping name -> UserProfile. Profiles that are not in the
+    database yet (e.g. loaded from JSON) are copied in and replaced in the
+    dict by their SQLiteProfile. Returns True if the save succeeded.
+    """
+    conn = connect()
+    try:
+        with conn:
+            for name, profile in list(profiles.items()):
+                if isinstance(profile, SQLiteProfile) and profile.conn is conn:
+                    profile.dirty = False
+                    continue
+                conn.execute("DELETE FROM profiles WHERE name = ?", (name,))
+                new_profile = _insert_profile(conn, name)
+                conn.executemany(
+                    "INSERT INTO transactions (profile_id, date, amount, category, description, type) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    ((new_profile.storage_key, tx.ordinal, tx.amount, tx.category, tx.description, tx.TYPE)
+                     for tx in profile.transactions),
+                )
+                profiles[name] = new_profile
+    except sqlite3.Error as e:
+        # For CLI use we just print an error message instead of crashing
+        print(f"Error: could not save data to {DB_FILE}: {e}")
+        return False
+    return True
+
+
+def create_profile(profiles, name):
+    """
+    Create a new, empty profile in the database and add it to profiles dict.
+
+    Returns the new SQLiteProfile instance.
+    """
+    conn = connect()
+    # like the dict, a new profile replaces an old one with the same name
+    conn.execute("DELETE FROM profiles WHERE name = ?", (name,))
+    profile = _insert_profile(conn, name)
+    profiles[name] = profile
+    return profile
+
+
+def rename_profile(profiles, old_name, new_name):
+    """
+    Rename a profile key in the dict and in the database.
+    """
+    if old_name not in profiles or old_name == new_name:
+        return
+
+    conn = connect()
+    profile = profiles.pop(old_name)
+    conn.execute("DELETE FROM profiles WHERE name = ?", (new_name,))
+    conn.execute("UPDATE profiles SET name = ? WHERE name = ?", (new_name, old_name))
+    profile.name = new_name
+    profiles[new_name] = profile
+
+
+def delete_profile(profiles, name):
+    """
+    Remove a profile (and its transactions) from the dict and the database.
+    """
+    if name in profiles:
+        del profiles[name]
+        connect().execute("DELETE FROM profiles WHERE name = ?", (name,))
@@ -1 +1,11 @@
-from budgetbuddy.ui.main import BudgetBuddyApp, run
+from budgetbuddy._lazy import lazy_module
+
+# imported on first use (PEP 562)
+_LAZY = {
+    "BudgetBuddyApp": "budgetbuddy.ui.main",
+    "run": "budgetbuddy.ui.main",
+}
+
+__all__ = ["BudgetBuddyApp", "run"]
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY)
@@ -3,6 +3,7 @@ import os
 from budgetbuddy.core.models import Income, Expense
 from budgetbuddy.core.budget import Budget
 from budgetbuddy.data import repository
+from budgetbuddy.data.autosave import AutoSaver
 from budgetbuddy.ui import summary
 
 MONTH_NAMES = [
@@ -16,31 +17,58 @@ class BudgetBuddyApp:
     """Main controller for the BudgetBuddy program."""
 
     def __init__(self):
-        # Load all saved profiles from the JSON file
-        self.profiles = repository.load_profiles()
+        # Profiles are loaded the first time they are needed (see the
+        # profiles property), so the main menu shows up right away
+        self._profiles = None
+        # Full saves run on a background thread once changes have been
+        # quiet for a moment (and always on Quit), so the prompt never
+        # waits for the data file to be rewritten
+        self.autosave = AutoSaver(lambda: repository.save_profiles(self.profiles))
+        # Every transaction change is appended to the journal right away;
+        # a full save (which empties the journal) is scheduled when it gets big
+        self.journal = repository.open_journal(on_full=self.autosave.schedule)
         # Keep both current month and current year for summaries
         self.current_month = 1
         self.current_year = 2025  # can be changed by the user
 
+    @property
+    def profiles(self):
+        """
+        Dict of profile name -> UserProfile, loaded on first use.
+
+        Only the profile names are read here; each profile's transactions
+        are decoded the first time it is opened.
+        """
+        if self._profiles is None:
+            self._profiles = repository.load_profiles(lazy=True)
+            self.autosave.attach_all(self._profiles)
+            self.journal.attach_all(self._profiles)
+        return self._profiles
+
     # ===== Entry point =====
 
     def run(self):
         """Start the main menu loop."""
-        while True:
-            choice = self._main_menu()
-
-            if choice == "1":
-                self.show_guide()
-            elif choice == "2":
-                self.create_profile_flow()
-            elif choice == "3":
-                self.saved_profiles_menu()
-            elif choice == "4":
-                repository.save_profiles(self.profiles)
-                print("Goodbye!")
-                break
-            else:
-                print("Invalid choice, please try again.")
+        try:
+            while True:
+                choice = self._main_menu()
+
+                if choice == "1":
+                    self.show_guide()
+                elif choice == "2":
+                    self.create_profile_flow()
+                elif choice == "3":
+                    self.saved_profiles_menu()
+                elif choice == "4":
+                    # final save of anything the autosave has not written yet
+                    self.autosave.flush()
+                    print("Goodbye!")
+                    break
+                else:
+                    print("Invalid choice, please try again.")
+        finally:
+            # also save if the loop ends any other way (e.g. Ctrl+C)
+            self.autosave.flush()
 
     # ===== Main menu =====
 
@@ -72,8 +100,13 @@ class BudgetBuddyApp:
             print("A profile with that name already exists.")
             return
 
-        repository.create_profile(self.profiles, name)
-        repository.save_profiles(self.profiles)
+        with self.autosave.lock:
+            profile = repository.create_profile(self.profiles, name)
+        self.autosave.attach(profile)
+        self.journal.attach(profile)
+        # profile changes are saved right away: journal records are keyed
+        # by profile name and must match the saved profiles
+        self.autosave.save_now()
         print("Profile '{}' created.".format(name))
 
     # ===== Saved profiles menu =====
@@ -101,6 +134,13 @@ class BudgetBuddyApp:
         if profile is None:
             print("No such profile.")
             return
+        try:
+            # decodes the profile if it was loaded lazily
+            profile.transactions
+        except ValueError as e:
+            # the saved records are left as they are, so nothing is lost on save
+            print(f"Error: could not open profile '{name}': {e}")
+            return
         self.profile_summary_loop(profile)
 
     def _rename_profile_flow(self):
@@ -112,8 +152,9 @@ class BudgetBuddyApp:
         if not new:
             print("Name cannot be empty.")
             return
-        repository.rename_profile(self.profiles, old, new)
-        repository.save_profiles(self.profiles)
+        with self.autosave.lock:
+            repository.rename_profile(self.profiles, old, new)
+        self.autosave.save_now()
         print("Profile renamed.")
 
     def _delete_profile_flow(self):
@@ -123,8 +164,9 @@ class BudgetBuddyApp:
             return
         confirm = input("Delete '{}'? (y/n): ".format(name)).strip().lower()
         if confirm == "y":
-            repository.delete_profile(self.profiles, name)
-            repository.save_profiles(self.profiles)
+            with self.autosave.lock:
+                repository.delete_profile(self.profiles, name)
+            self.autosave.save_now()
             print("Deleted.")
 
     # ===== Profile summary and actions =====
@@ -165,7 +207,7 @@ class BudgetBuddyApp:
             elif choice == "5":
                 self.view_monthly_summaries_flow(profile)
             elif choice == "6":
-                repository.save_profiles(self.profiles)
+                # changes are already scheduled for saving; just go back
                 return
             else:
                 print("Invalid choice.")
@@ -191,14 +233,24 @@ class BudgetBuddyApp:
     def view_year_transactions_flow(self, profile):
         """
         Show all transactions in the current year for this profile,
-        and provide a submenu to edit or delete.
+        and provide a submenu to search, edit or delete.
         """
         year = self.current_year
+        # words to filter the list by (None = show everything)
+        query = None
 
         while True:
-            prefix = "{:04d}-".format(year)  # matches "YYYY-"
-            txs = [t for t in profile.transactions
-                   if isinstance(t.date, str) and t.date.startswith(prefix)]
+            if query:
+                # inverted index lookup, limited to this year
+                txs = profile.search(query, "{}-01-01".format(year), "{}-12-31".format(year))
+                if not txs:
+                    print("\nNo transactions match '{}'.".format(query))
+                    query = None
+                    continue
+                print("\nTransactions matching '{}':".format(query))
+            else:
+                # month index lookup, in date order
+                txs = profile.list_transactions(year=year)
 
             print()
             summary.print_transactions(txs)
@@ -208,12 +260,17 @@ class BudgetBuddyApp:
                 input("Press Enter to go back...")
                 return
 
-            print("\nOptions: e = edit, d = delete, b = back")
+            print("\nOptions: e = edit, d = delete, s = search, b = back")
             choice = input("Choose: ").strip().lower()
 
             if choice == "b":
                 return
 
+            if choice == "s":
+                # blank search shows every transaction again
+                query = input("Search (words, end with * for a prefix): ").strip() or None
+                continue
+
             if choice not in ("e", "d"):
                 print("Invalid choice.")
                 continue
@@ -239,23 +296,32 @@ class BudgetBuddyApp:
                 new_cat = input("Category [{}]: ".format(target.category)).strip()
                 new_desc = input("Description [{}]: ".format(target.description)).strip()
 
+                changes = {}
                 if new_date:
-                    target.date = new_date
+                    changes["date"] = new_date
                 if new_amount:
                     try:
-                        target.amount = float(new_amount)
+                        changes["amount"] = float(new_amount)
                     except ValueError:
                         print("Invalid amount, keeping original.")
                 if new_cat:
-                    target.category = new_cat
+                    changes["category"] = new_cat
                 if new_desc:
-                    target.description = new_desc
+                    changes["description"] = new_desc
+
+                # go through the profile so its month index stays in sync
+                try:
+                    with self.autosave.lock:
+                        profile.edit_transaction(target, **changes)
+                except ValueError as e:
+                    print("{} Keeping original.".format(e))
 
             elif choice == "d":
                 # Delete the selected transaction
                 confirm = input("Delete this transaction? (y/n): ").strip().lower()
                 if confirm == "y":
-                    profile.delete_transaction(target)
+                    with self.autosave.lock:
+                        profile.delete_transaction(target)
                     print("Transaction deleted.")
 
     # === View monthly summaries for the current year ===
@@ -267,14 +333,23 @@ class BudgetBuddyApp:
 
         print("\n=== Summary for {} ({}) ===".format(profile.name, year))
 
+        # all twelve months at once instead of one month_totals call per month
+        summaries = budget.year_summary(year)
+
         for month in range(1, 13):
-            totals = budget.month_totals(month, year)
+            totals = summaries[month]
             month_name = MONTH_NAMES[month - 1]
 
             print("\n{}".format(month_name))
             print("Total income : {:.2f}".format(totals["income"]))
             print("Total expense: {:.2f}".format(totals["expense"]))
 
+        print("\n=== Spending by category ({}) ===".format(year))
+        summary.print_group_summary(budget.group_by("category", year=year, tx_type="expense"))
+
+        print("\n=== Largest expenses ({}) ===".format(year))
+        summary.print_transactions(budget.top_expenses(5, year=year))
+
     # === Change year (keeps month as-is) ===
 
     # def change_year_flow(self):
@@ -321,8 +396,13 @@ class BudgetBuddyApp:
         category = input("Source/category: ").strip()
         desc = input("Description (optional): ").strip()
 
-        income = Income(date, amount, category, desc)
-        profile.add_transaction(income)
+        try:
+            income = Income(date, amount, category, desc)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return  # Do not add a transaction
+        with self.autosave.lock:
+            profile.add_transaction(income)
         print("Income recorded.")
 
     def record_expense_flow(self, profile):
@@ -339,8 +419,13 @@ class BudgetBuddyApp:
         category = input("Category: ").strip()
         desc = input("Description (optional): ").strip()
 
-        expense = Expense(date, amount, category, desc)
-        profile.add_transaction(expense)
+        try:
+            expense = Expense(date, amount, category, desc)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return  # Do not add a transaction
+        with self.autosave.lock:
+            profile.add_transaction(expense)
         print("Expense recorded.")
 
 
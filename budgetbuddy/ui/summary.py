@@ -22,7 +22,7 @@ def print_transactions(transactions):
         line = "[{}] {} | {:7} | {:10} | {:8.2f} | {}".format(
             i,
             t.date,
-            t.get_type(),
+            t.TYPE,
             t.category,
             t.amount,
             t.description,
@@ -30,6 +30,29 @@ def print_transactions(transactions):
         print(line)
 
 
+def print_group_summary(groups, heading="category"):
+    """
+    Pretty-print Budget.group_by() results, one line per group.
+    """
+    if not groups:
+        print("  (no transactions)")
+        return
+
+    print(" {} | count | total | average | min | max".format(heading))
+    for group, stats in groups.items():
+        if isinstance(group, tuple):
+            group = " / ".join(str(part) for part in group)
+        line = "{:12} | {:5} | {:9.2f} | {:9.2f} | {:8.2f} | {:8.2f}".format(
+            str(group),
+            stats["count"],
+            stats["total"],
+            stats["avg"],
+            stats["min"],
+            stats["max"],
+        )
+        print(line)
+
+
 def print_profiles_list(profiles):
     """Print all saved profile names."""
     print("\n=== Saved profiles ===")
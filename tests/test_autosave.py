@@ -0,0 +1,58 @@
+# tests/test_autosave.py
+
+import threading
+import unittest
+
+from budgetbuddy.core.models import UserProfile, Expense
+from budgetbuddy.data.autosave import AutoSaver
+
+
+class TestAutoSaver(unittest.TestCase):
+    def setUp(self):
+        self.saves = 0
+        self.saved = threading.Event()
+        self.result = True
+        self.profile = UserProfile("janet")
+
+    def _save(self):
+        self.saves += 1
+        self.saved.set()
+        return self.result
+
+    def test_changes_are_saved_once_after_quiet_period(self):
+        autosave = AutoSaver(self._save, delay=0.05)
+        autosave.attach(self.profile)
+
+        for day in range(1, 4):
+            self.profile.add_transaction(Expense("2025-01-0{}".format(day), 5.0, "Food"))
+        self.assertEqual(self.saves, 0)
+
+        self.assertTrue(self.saved.wait(2))
+        self.assertEqual(self.saves, 1)
+        self.assertFalse(autosave.pending)
+
+    def test_flush_saves_pending_changes_only(self):
+        autosave = AutoSaver(self._save, delay=60)
+        autosave.attach(self.profile)
+
+        self.assertTrue(autosave.flush())
+        self.assertEqual(self.saves, 0)
+
+        self.profile.add_transaction(Expense("2025-01-01", 5.0, "Food"))
+        self.assertTrue(autosave.flush())
+        self.assertEqual(self.saves, 1)
+
+    def test_failed_save_stays_pending(self):
+        autosave = AutoSaver(self._save, delay=60)
+        self.result = False
+
+        self.assertFalse(autosave.save_now())
+        self.assertTrue(autosave.pending)
+
+        self.result = True
+        self.assertTrue(autosave.flush())
+        self.assertEqual(self.saves, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+# tests/test_benchmarks.py
+
+import io
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from benchmarks import generate, run
+from budgetbuddy.data import repository
+
+
+class TestBenchmarks(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_generator_is_deterministic(self):
+        records = list(generate.generate_records(500, seed=7))
+        self.assertEqual(records, list(generate.generate_records(500, seed=7)))
+        self.assertNotEqual(records, list(generate.generate_records(500, seed=8)))
+        self.assertEqual({r[4] for r in records}, {"income", "expense"})
+
+        profile = generate.generate_profile("bench", 500, seed=7)
+        months = set(generate.generated_months())
+        self.assertEqual(len(months), 60)
+        self.assertTrue(all((int(tx.date[:4]), int(tx.date[5:7])) in months for tx in profile.transactions))
+
+    def test_measure_and_compare(self):
+        data_file = repository.DATA_FILE
+        result = run.measure(run.BENCHMARKS["load_profiles"], 200, repeat=1)
+        self.assertEqual(repository.DATA_FILE, data_file)
+        self.assertGreater(result["throughput"], 0)
+        self.assertGreater(result["peak_kb"], 0)
+
+        results = {"load_profiles": {"200": result}}
+        slower = {"load_profiles": {"200": dict(result, seconds=result["seconds"] * 2)}}
+        self.assertEqual(run.compare(results, results), [])
+        self.assertEqual([r[2] for r in run.compare(slower, results)], ["seconds"])
+
+    def test_main_saves_and_checks_baseline(self):
+        baseline = self.tmp_dir / "baseline.json"
+        args = ["--sizes", "100", "--ops", "export_csv,month_totals", "--repeat", "1"]
+        with patch("sys.stdout", new_callable=io.StringIO):
+            self.assertEqual(run.main(args + ["--save-baseline", str(baseline)]), 0)
+            data = json.loads(baseline.read_text(encoding="utf-8"))
+            self.assertEqual(sorted(data["results"]), ["export_csv", "month_totals"])
+
+            # make the baseline impossibly fast so the comparison fails
+            for by_size in data["results"].values():
+                by_size["100"]["seconds"] = 0.0
+            baseline.write_text(json.dumps(data), encoding="utf-8")
+            self.assertEqual(run.main(args + ["--baseline", str(baseline)]), 1)
@@ -1,6 +1,9 @@
 # %%
 import unittest
+from unittest.mock import patch
+from budgetbuddy.core import budget as budget_module
 from budgetbuddy.core.budget import Budget
+from budgetbuddy.core.models import UserProfile, Income, Expense
 
 class TestTransaction:
     def __init__(self, amount, tx_type):
@@ -66,6 +69,184 @@ class TestBudget(unittest.TestCase):
         self.assertTrue(len(txs) > 0)
         self.assertNotEqual(txs[0].amount, 100)
 
+class TestBudgetRunningTotals(unittest.TestCase):
+    def setUp(self):
+        self.profile = UserProfile("janet")
+        self.pay = Income("2025-12-01", 2000, "Salary")
+        self.rent = Expense("2025-12-03", 800, "Rent")
+        self.profile.add_transaction(self.pay)
+        self.profile.add_transaction(self.rent)
+        self.budget = Budget(self.profile)
+
+    def test_totals_follow_add_delete_and_edit(self):
+        self.assertEqual(self.budget.month_totals(12, 2025),
+                         {"income": 2000, "expense": 800, "net": 1200})
+
+        self.profile.edit_transaction(self.rent, date="2025-11-30", amount=900)
+        self.assertEqual(self.budget.month_totals(12, 2025)["expense"], 0)
+        self.assertEqual(self.budget.month_totals(11, 2025)["net"], -900)
+
+        self.profile.delete_transaction(self.pay)
+        self.assertEqual(self.budget.month_totals(12, 2025),
+                         {"income": 0, "expense": 0, "net": 0})
+
+    def test_year_summary_matches_month_totals(self):
+        self.profile.add_transaction(Income("2024-12-24", 50, "Gift"))
+        summary = self.budget.year_summary(2025)
+
+        self.assertEqual(sorted(summary), list(range(1, 13)))
+        self.assertEqual(summary[12], self.budget.month_totals(12, 2025))
+        self.assertEqual(summary[1]["net"], 0)
+
+        both = self.budget.years_summary([2024, 2025])
+        self.assertEqual(both[2024][12]["income"], 50)
+        self.assertEqual(both[2025][12]["expense"], 800)
+
+    def test_years_summary_single_pass_without_running_totals(self):
+        # A profile object that only exposes its transaction list
+        class PlainProfile:
+            transactions = [Income("2025-02-01", 10, "Gift"), Expense("2025-02-02", 4, "Food"),
+                            Expense("2026-02-02", 99, "Food")]
+
+        summary = Budget(PlainProfile()).year_summary(2025)
+        self.assertEqual(summary[2], {"income": 10, "expense": 4, "net": 6})
+        self.assertEqual(summary[3]["net"], 0)
+
+class TestBudgetGroupBy(unittest.TestCase):
+    def setUp(self):
+        self.profile = UserProfile("janet")
+        self.profile.extend_transactions([
+            Income("2025-03-01", 2000, "Salary"),
+            Expense("2025-03-02", 40, "Food"),
+            Expense("2025-03-20", 10, "Food"),
+            Expense("2025-04-03", 800, "Rent"),
+            Expense("2024-03-05", 25, "Food"),
+        ])
+        self.budget = Budget(self.profile)
+
+    def test_group_by_category_for_month(self):
+        groups = self.budget.group_by("category", year=2025, month=3, tx_type="expense")
+
+        self.assertEqual(groups, {"Food": {"total": 50, "count": 2, "min": 10, "max": 40, "avg": 25}})
+
+    def test_group_by_several_keys_for_year(self):
+        groups = self.budget.group_by(("month", "type"), year=2025)
+
+        self.assertEqual(list(groups), [((2025, 3), "expense"), ((2025, 3), "income"), ((2025, 4), "expense")])
+        self.assertEqual(groups[((2025, 4), "expense")]["total"], 800)
+        self.assertEqual(self.budget.group_by("year")[2024]["count"], 1)
+
+    def test_group_by_columnar_matches_list(self):
+        columnar = UserProfile.from_dict(self.profile.to_dict(), columnar=True)
+
+        self.assertEqual(Budget(columnar).group_by(("category", "type")),
+                         self.budget.group_by(("category", "type")))
+
+class TestBudgetTopN(unittest.TestCase):
+    def setUp(self):
+        self.profile = UserProfile("janet")
+        self.profile.extend_transactions([
+            Expense("2025-03-09", 40, "Food"),
+            Income("2025-03-01", 2000, "Salary"),
+            Expense("2025-03-02", 900, "Rent"),
+            Expense("2025-03-20", 15, "Food"),
+            Expense("2025-04-03", 60, "Food"),
+            Income("2024-12-24", 3000, "Bonus"),
+        ])
+        self.budget = Budget(self.profile)
+
+    def test_top_expenses_and_incomes(self):
+        self.assertEqual([t.amount for t in self.budget.top_expenses(2)], [900, 60])
+        self.assertEqual([t.amount for t in self.budget.top_expenses(5, month=3, year=2025, category="Food")],
+                         [40, 15])
+        self.assertEqual([t.category for t in self.budget.top_incomes(1, year=2025)], ["Salary"])
+        self.assertEqual(self.budget.top_incomes(0), [])
+
+    def test_recent_honours_n_and_latest_spans_months(self):
+        self.assertEqual(len(self.budget.recent_transactions(3, 2025)), 4)
+        self.assertEqual([t.date for t in self.budget.recent_transactions(3, 2025, 2)],
+                         ["2025-03-09", "2025-03-20"])
+        self.assertEqual([t.date for t in self.budget.latest_transactions(3)],
+                         ["2025-03-09", "2025-03-20", "2025-04-03"])
+
+    def test_columnar_and_plain_profiles_agree(self):
+        columnar = Budget(UserProfile.from_dict(self.profile.to_dict(), columnar=True))
+
+        class PlainProfile:
+            transactions = list(self.profile.transactions)
+
+            def list_transactions(self, month, year):
+                return [t for t in self.transactions if t.date.startswith("{}-{:02d}".format(year, month))]
+
+        plain = Budget(PlainProfile())
+        for budget in (columnar, plain):
+            self.assertEqual([t.to_dict() for t in budget.top_expenses(3, month=3, year=2025)],
+                             [t.to_dict() for t in self.budget.top_expenses(3, month=3, year=2025)])
+            self.assertEqual([t.date for t in budget.latest_transactions(2)], ["2025-03-20", "2025-04-03"])
+            self.assertEqual([t.date for t in budget.recent_transactions(3, 2025, 1)], ["2025-03-20"])
+
+class TestBudgetCache(unittest.TestCase):
+    def setUp(self):
+        self.profile = UserProfile("janet")
+        self.rent = Expense("2025-03-02", 900, "Rent")
+        self.profile.extend_transactions([Income("2025-03-01", 2000, "Salary"), self.rent])
+
+    def test_repeated_queries_hit_cache_across_budget_objects(self):
+        first = Budget(self.profile).year_summary(2025)
+        second = Budget(self.profile).year_summary(2025)
+
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        cache = budget_module._caches[self.profile]
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_any_change_invalidates(self):
+        budget = Budget(self.profile)
+        self.assertEqual(budget.group_by("category", tx_type="expense")["Rent"]["total"], 900)
+        generation = self.profile.generation
+
+        self.profile.edit_transaction(self.rent, amount=950)
+        self.assertEqual(self.profile.generation, generation + 1)
+        self.assertEqual(budget.group_by("category", tx_type="expense")["Rent"]["total"], 950)
+
+        self.profile.delete_transaction(self.rent)
+        self.assertEqual(budget.top_expenses(1), [])
+        self.assertEqual(budget.range_totals()["expense"], 0)
+
+    def test_lru_keeps_most_recent_queries(self):
+        budget = Budget(self.profile)
+        with patch.object(budget_module, "CACHE_SIZE", 2):
+            for year in (2023, 2024, 2025):
+                budget.year_summary(year)
+            cache = budget_module._caches[self.profile]
+            self.assertEqual([key[1] for key in cache.entries], [(2024,), (2025,)])
+
+    def test_changing_a_returned_list_does_not_change_the_cache(self):
+        budget = Budget(self.profile)
+        first = budget.month_transactions(3, 2025)
+        first.clear()
+        budget.top_expenses(1).append("junk")
+
+        self.assertEqual(len(budget.month_transactions(3, 2025)), 2)
+        self.assertEqual(budget.top_expenses(1), [self.rent])
+
+    def test_changing_a_returned_summary_does_not_change_the_cache(self):
+        budget = Budget(self.profile)
+        budget.range_totals()["net"] = 999
+        budget.year_summary(2025)[3]["income"] = 0
+        budget.group_by("category")["Rent"]["total"] = 1
+        flow = budget.cash_flow("month")
+        flow.net.clear()
+        flow.balance[0] = -1
+
+        self.assertEqual(budget.range_totals()["net"], 1100)
+        self.assertEqual(budget.year_summary(2025)[3]["income"], 2000)
+        self.assertEqual(budget.group_by("category")["Rent"]["total"], 900)
+        self.assertEqual(budget.cash_flow("month").net, [1100])
+        self.assertEqual(budget.cash_flow("month").balance, [1100])
+        cache = budget_module._caches[self.profile]
+        self.assertEqual(cache.misses, 4)
+
 unittest.main(argv=[''], verbosity=2, exit=False) 
 
 
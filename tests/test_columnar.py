@@ -0,0 +1,73 @@
+# tests/test_columnar.py
+
+import unittest
+
+from budgetbuddy.core.columnar import TransactionColumns
+from budgetbuddy.core.models import UserProfile, Income, Expense
+
+
+class TestColumnarProfile(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pass
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+    def setUp(self):
+        # Same data as test_models, added out of date order on purpose
+        self.profile = UserProfile("janet", columnar=True)
+        self.profile.add_transaction(Income("2025-02-10", 1500.0, "Salary", "Bonus"))
+        self.profile.add_transaction(Income("2025-01-01", 500.0, "Salary", "January pay"))
+        self.profile.add_transaction(Expense("2025-03-01", 60.0, "Transport", "Bus pass"))
+        self.profile.add_transaction(Expense("2025-01-05", 25.0, "Food", "Snacks"))
+
+    def tearDown(self):
+        pass
+
+    def test_rows_are_date_sorted_and_materialized(self):
+        store = self.profile.transactions
+
+        self.assertIsInstance(store, TransactionColumns)
+        self.assertEqual(len(store), 4)
+        self.assertEqual([t.date for t in store],
+                         ["2025-01-01", "2025-01-05", "2025-02-10", "2025-03-01"])
+        self.assertIsInstance(store[0], Income)
+        self.assertEqual(store[-1].get_type(), "expense")
+        # "Salary" is stored once in the string table
+        self.assertEqual(store.strings.count("Salary"), 1)
+
+    def test_list_transactions_by_month(self):
+        jan = self.profile.list_transactions(1, 2025)
+
+        self.assertEqual(len(jan), 2)
+        self.assertEqual(jan[0].category, "Salary")
+        self.assertEqual(jan[1].amount, 25.0)
+        self.assertEqual(self.profile.list_transactions(12, 2025), [])
+
+    def test_iter_records_date_range(self):
+        records = list(self.profile.iter_records("2025-01-05", "2025-02-10"))
+
+        self.assertEqual(records, [("2025-01-05", 25.0, "Food", "Snacks", "expense"),
+                                   ("2025-02-10", 1500.0, "Salary", "Bonus", "income")])
+        self.assertEqual([t.date for t in self.profile.iter_transactions(start="2025-02-01")],
+                         ["2025-02-10", "2025-03-01"])
+
+    def test_delete_and_round_trip(self):
+        self.profile.delete_transaction(Expense("2025-01-05", 25.0, "Food", "Snacks"))
+        self.assertEqual(len(self.profile.transactions), 3)
+        self.assertNotIn(Expense("2025-01-05", 25.0, "Food", "Snacks"), self.profile.transactions)
+
+        data = self.profile.to_dict()
+        self.assertEqual(data["transactions"][0]["type"], "income")
+
+        loaded = UserProfile.from_dict(data, columnar=True)
+        self.assertEqual(loaded.to_dict(), data)
+
+        with self.assertRaises(ValueError):
+            self.profile.add_transaction(Income("not-a-date", 1.0, "Gift"))
+
+
+if __name__ == "__main__":
+    unittest.main()
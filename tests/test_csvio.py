@@ -2,6 +2,8 @@
 
 import unittest
 import csv
+import gzip
+import tempfile
 from pathlib import Path
 
 from budgetbuddy.data import csvio
@@ -106,6 +108,150 @@ class TestCsvIO(unittest.TestCase):
         self.assertEqual(last_tx.category, "Food")
         self.assertEqual(last_tx.description, "Valid row")
 
+    def test_bulk_import_reports_and_writes_rejects(self):
+        """Bulk import adds valid rows in one batch and writes bad rows to a reject file."""
+        with self.invalid_csv_path.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["date", "amount", "category", "description", "type"])
+            writer.writerow(["2025-02-01", "10.0", "Food", "Lunch", "expense"])
+            writer.writerow(["2025-02-02", "oops", "Food", "Bad amount", "expense"])
+            writer.writerow(["02/03/2025", "5.0", "Food", "Bad date", "expense"])
+            writer.writerow(["2025-01-15", "200.0", "Salary", "Bonus", "income"])
+        reject_path = Path(str(self.invalid_csv_path) + ".rejects.csv")
+        ops = []
+        self.profile.listeners.append(lambda profile, op, tx, old: ops.append(op))
+
+        try:
+            report = csvio.import_transactions_bulk(self.profile, self.invalid_csv_path, chunk_size=2)
+
+            self.assertEqual((report.rows_read, report.accepted, report.rejected), (4, 2, 2))
+            self.assertEqual(report.reject_path, reject_path)
+            self.assertEqual(ops, ["add_many"])
+            self.assertEqual(len(self.profile.transactions), 4)
+            self.assertEqual([tx.get_type() for tx in self.profile.list_transactions(1, 2025)],
+                             ["income", "expense", "income"])
+
+            with reject_path.open("r", newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual([(r["line"], r["reason"]) for r in rows],
+                             [("3", "invalid amount"), ("4", "invalid date")])
+            self.assertEqual(rows[0]["description"], "Bad amount")
+        finally:
+            reject_path.unlink(missing_ok=True)
+
+    def test_bulk_import_missing_file_returns_report(self):
+        """A missing file gives an empty report with the error set."""
+        report = csvio.import_transactions_bulk(self.profile, "this_file_does_not_exist.csv")
+
+        self.assertEqual(report.rows_read, 0)
+        self.assertIsNotNone(report.error)
+        self.assertIsNone(report.reject_path)
+        self.assertEqual(len(self.profile.transactions), 2)
+
+    def test_bulk_import_skips_blank_lines(self):
+        """Blank lines (e.g. a trailing one) are neither rows nor rejects."""
+        self.invalid_csv_path.write_text(
+            "date,amount,category,description,type\r\n"
+            "2025-02-01,10.0,Food,Lunch,expense\r\n"
+            "\r\n"
+            "2025-02-02,4.5,Food,Coffee,expense\r\n"
+            "\r\n",
+            encoding="utf-8")
+        reject_path = Path(str(self.invalid_csv_path) + ".rejects.csv")
+
+        report = csvio.import_transactions_bulk(self.profile, self.invalid_csv_path)
+        self.assertEqual((report.rows_read, report.accepted, report.rejected), (2, 2, 0))
+        self.assertIsNone(report.reject_path)
+        self.assertFalse(reject_path.exists())
+
+        reports = csvio.import_csv_files(self.profile, [self.invalid_csv_path], workers=1)
+        self.assertEqual((reports[0].rows_read, reports[0].rejected), (2, 0))
+        self.assertEqual(len(self.profile.transactions), 6)
+
+    def test_bulk_import_rejects_file_without_date_column(self):
+        """A file with no date column is refused as a whole instead of crashing."""
+        with self.invalid_csv_path.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["when", "amount", "category"])
+            writer.writerow(["2025-02-01", "10.0", "Food"])
+
+        report = csvio.import_transactions_bulk(self.profile, self.invalid_csv_path)
+        self.assertIsInstance(report.error, ValueError)
+        self.assertIn("date", str(report.error))
+        self.assertEqual((report.accepted, report.rejected), (0, 0))
+
+        reports = csvio.import_csv_files(self.profile, [self.invalid_csv_path, self.csv_path], workers=1)
+        self.assertIsInstance(reports[0].error, ValueError)
+        self.assertIsInstance(reports[1].error, OSError)
+        self.assertEqual(len(self.profile.transactions), 2)
+
+    def test_import_csv_files_matches_serial_import(self):
+        """A parallel multi-file import equals importing the files in order, then sorting by date."""
+        files = {
+            "01.csv": [["2025-03-05", "10.0", "Food", "a", "expense"],
+                       ["2025-03-01", "20.0", "Pay", "b", "income"]],
+            "02.csv": [["2025-03-01", "30.0", "Food", "c", "expense"],
+                       ["bad-date", "1.0", "Food", "d", "expense"]],
+            "03.csv": [["2025-02-28", "40.0", "Rent", "e", "expense"]],
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, rows in files.items():
+                with open(Path(tmp) / name, "w", newline="", encoding="utf-8") as f:
+                    writer = csv.writer(f)
+                    writer.writerow(["date", "amount", "category", "description", "type"])
+                    writer.writerows(rows)
+
+            profile = UserProfile("parallel")
+            reports = csvio.import_csv_files(profile, str(Path(tmp) / "*.csv"), workers=2)
+
+            serial = UserProfile("serial")
+            for name in sorted(files):
+                csvio.import_transactions_bulk(serial, Path(tmp) / name)
+
+            self.assertEqual([r.accepted for r in reports], [2, 1, 1])
+            self.assertEqual(reports[1].rejected, 1)
+            self.assertTrue(reports[1].reject_path.exists())
+
+        expected = sorted(serial.transactions, key=lambda tx: tx.ordinal)
+        self.assertEqual([tx.to_dict() for tx in profile.transactions],
+                         [tx.to_dict() for tx in expected])
+        self.assertEqual([tx.description for tx in profile.list_transactions(3, 2025)],
+                         ["b", "c", "a"])
+
+    def test_export_transactions_filters_and_gzips(self):
+        """Filtered export only writes matching rows, gzipped when the path ends in .gz."""
+        self.profile.add_transaction(Expense("2025-02-10", 5.0, "Food", "Coffee"))
+        self.profile.add_transaction(Expense("2025-02-11", 60.0, "Fuel", "Car"))
+        self.profile.add_transaction(Expense("2025-04-01", 7.0, "Food", "Too late"))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "q1.csv.gz"
+            written = csvio.export_transactions(self.profile, path, start="2025-01-02", end="2025-03-31",
+                                                tx_type="expense", category=["Food"])
+            with gzip.open(path, "rt", newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+
+        self.assertEqual(written, 2)
+        self.assertEqual([(r["date"], r["description"]) for r in rows],
+                         [("2025-01-02", "Snacks"), ("2025-02-10", "Coffee")])
+        self.assertEqual(rows[0]["type"], "expense")
+
+    def test_export_transactions_bad_date_leaves_existing_file(self):
+        """Invalid bounds are refused before the target file is touched."""
+        self.csv_path.write_text("previous export\n", encoding="utf-8")
+
+        with self.assertRaises(ValueError):
+            csvio.export_transactions(self.profile, self.csv_path, start="2025-13-01")
+        with self.assertRaises(ValueError):
+            csvio.export_transactions(self.profile, self.csv_path, end="yesterday")
+
+        self.assertEqual(self.csv_path.read_text(encoding="utf-8"), "previous export\n")
+        self.assertFalse(Path(str(self.csv_path) + ".tmp").exists())
+
+        self.assertEqual(csvio.export_transactions(self.profile, self.csv_path), 2)
+        with self.csv_path.open("r", newline="", encoding="utf-8") as f:
+            self.assertEqual(len(list(csv.DictReader(f))), 2)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,122 @@
+# tests/test_duplicates.py
+
+import csv
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from budgetbuddy.core.budget import Budget
+from budgetbuddy.core.duplicates import fingerprint, fingerprint_index
+from budgetbuddy.core.models import UserProfile, Income, Expense
+from budgetbuddy.data import csvio
+
+
+class TestDuplicates(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.csv_path = self.tmp_dir / "statement.csv"
+        with self.csv_path.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["date", "amount", "category", "description", "type"])
+            writer.writerow(["2025-01-01", "2000.0", "Salary", "Jan pay", "income"])
+            writer.writerow(["2025-01-02", "4.5", "Food", "Coffee", "expense"])
+            writer.writerow(["2025-01-02", "4.5", "Food", "Coffee", "expense"])
+        self.profile = UserProfile("janet")
+        self.profile.add_transaction(Income("2025-01-01", 2000.0, "Salary", "Jan pay"))
+        self.profile.add_transaction(Expense("2025-01-02", 4.5, "Food", "Coffee"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_index_follows_changes(self):
+        index = fingerprint_index(self.profile)
+        coffee = self.profile.transactions[1]
+        self.assertIn(coffee, index)
+
+        copy = Expense("2025-01-02", 4.5, "Food", "Coffee")
+        self.profile.add_transaction(copy)
+        self.assertEqual(index.duplicates(), {fingerprint(coffee): 2})
+
+        self.profile.edit_transaction(copy, amount=5.0)
+        self.assertEqual(index.duplicates(), {})
+        self.profile.delete_transaction(copy)
+        self.assertNotIn(copy, index)
+        self.assertEqual(sum(index.counts.values()), 2)
+
+    def test_import_skip_and_flag(self):
+        with self.assertRaises(ValueError):
+            csvio.import_transactions_from_csv(self.profile, self.csv_path, duplicates="drop")
+
+        #the profile already has the salary and one coffee: only the second coffee is new
+        found = csvio.import_transactions_from_csv(self.profile, self.csv_path, duplicates="skip")
+        self.assertEqual(len(found), 2)
+        self.assertEqual(len(self.profile.transactions), 3)
+
+        with patch("builtins.print") as mock_print:
+            found = csvio.import_transactions_from_csv(self.profile, self.csv_path, duplicates="flag")
+        self.assertEqual(len(found), 3)
+        self.assertEqual(mock_print.call_count, 3)
+        self.assertEqual(len(self.profile.transactions), 6)
+
+    def test_bulk_imports_skip_duplicates(self):
+        report = csvio.import_transactions_bulk(self.profile, self.csv_path, duplicates="skip")
+        self.assertEqual((report.rows_read, report.accepted, report.duplicates), (3, 1, 2))
+
+        second = self.tmp_dir / "statement2.csv"
+        shutil.copy(self.csv_path, second)
+        reports = csvio.import_csv_files(self.profile, [self.csv_path, second], workers=1, duplicates="flag")
+        self.assertEqual([(r.accepted, r.duplicates) for r in reports], [(3, 3), (3, 3)])
+        self.assertEqual(len(self.profile.transactions), 9)
+
+    def test_overlapping_files_match_serial_import(self):
+        #december and january statements both hold the new year's day rows
+        december = self.tmp_dir / "01-december.csv"
+        with december.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["date", "amount", "category", "description", "type"])
+            writer.writerow(["2024-12-31", "30.0", "Food", "Dinner", "expense"])
+            writer.writerow(["2025-01-01", "12.0", "Taxi", "Ride home", "expense"])
+            writer.writerow(["2025-01-01", "12.0", "Taxi", "Ride home", "expense"])
+        january = self.tmp_dir / "02-january.csv"
+        with january.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["date", "amount", "category", "description", "type"])
+            writer.writerow(["2025-01-01", "12.0", "Taxi", "Ride home", "expense"])
+            writer.writerow(["2025-01-01", "12.0", "Taxi", "Ride home", "expense"])
+            writer.writerow(["2025-01-01", "12.0", "Taxi", "Ride home", "expense"])
+            writer.writerow(["2025-01-01", "2000.0", "Salary", "Jan pay", "income"])
+
+        for mode in ("flag", "skip"):
+            serial = UserProfile.from_dict(self.profile.to_dict())
+            serial_reports = [csvio.import_transactions_bulk(serial, path, duplicates=mode)
+                              for path in (december, january)]
+            parallel = UserProfile.from_dict(self.profile.to_dict())
+            reports = csvio.import_csv_files(parallel, [december, january], workers=2, duplicates=mode)
+
+            self.assertEqual([(r.accepted, r.duplicates) for r in reports],
+                             [(r.accepted, r.duplicates) for r in serial_reports])
+            self.assertEqual(sorted(map(fingerprint, parallel.transactions)),
+                             sorted(map(fingerprint, serial.transactions)))
+        #skip: december's two rides are new, january only adds a third one
+        self.assertEqual([(r.accepted, r.duplicates) for r in reports], [(3, 0), (1, 3)])
+        self.assertEqual(len(Budget(parallel).month_transactions(1, 2025)), 2 + 3)
+
+    def test_remove_duplicates(self):
+        self.profile.extend_transactions([Expense("2025-01-02", 4.5, "Food", "Coffee") for _ in range(3)])
+        columnar = UserProfile.from_dict(self.profile.to_dict(), columnar=True)
+        ops = []
+        self.profile.listeners.append(lambda profile, op, tx, old: ops.append((op, len(tx))))
+
+        for profile in (self.profile, columnar):
+            index = fingerprint_index(profile)
+            self.assertEqual(len(index.duplicates()), 1)
+            removed = profile.remove_duplicates()
+
+            self.assertEqual([tx.description for tx in removed], ["Coffee"] * 3)
+            self.assertEqual(len(profile.transactions), 2)
+            self.assertEqual(index.duplicates(), {})
+            self.assertEqual(Budget(profile).month_totals(1, 2025)["expense"], 4.5)
+            self.assertEqual(profile.remove_duplicates(), [])
+        self.assertEqual(ops, [("delete_many", 3)])
@@ -0,0 +1,49 @@
+# tests/test_household.py
+
+import unittest
+from unittest.mock import patch
+
+from budgetbuddy.core import household
+from budgetbuddy.core.budget import Budget
+from budgetbuddy.core.household import Household
+from budgetbuddy.core.models import UserProfile, Income, Expense
+
+
+class TestHousehold(unittest.TestCase):
+    def setUp(self):
+        self.janet = UserProfile("janet")
+        self.janet.extend_transactions([
+            Income("2025-01-01", 2000.0, "Salary"),
+            Expense("2025-01-03", 800.0, "Rent"),
+            Expense("2025-02-04", 40.0, "Food"),
+        ])
+        self.sam = UserProfile.from_dict({"name": "sam", "transactions": [
+            {"date": "2025-01-15", "amount": 1500.0, "category": "Salary", "type": "income"},
+            {"date": "2025-01-20", "amount": 60.0, "category": "Food", "type": "expense"},
+            {"date": "2025-02-01", "amount": 10.0, "category": "Food", "type": "expense"},
+            {"date": "2024-12-31", "amount": 25.0, "category": "Food", "type": "expense"},
+        ]}, columnar=True)
+        self.household = Household({"janet": self.janet, "sam": self.sam}, workers=2)
+        #what a single profile holding everything would give
+        self.combined = UserProfile("all")
+        self.combined.extend_transactions(list(self.janet.transactions) + list(self.sam.transactions))
+
+    def test_totals_are_merged(self):
+        self.assertEqual(self.household.month_totals(1, 2025),
+                         {"income": 3500.0, "expense": 860.0, "net": 2640.0})
+        self.assertEqual(self.household.year_summary(2025), Budget(self.combined).year_summary(2025))
+        self.assertEqual(self.household.range_totals("2025-01-10", "2025-02-01"),
+                         {"income": 1500.0, "expense": 70.0, "net": 1430.0})
+        self.assertEqual(self.household.by_profile(2025)["sam"],
+                         {"income": 1500.0, "expense": 70.0, "net": 1430.0})
+
+    def test_group_by_matches_one_profile(self):
+        for args in (("category",), (("month", "type"),), ("category", 2025, None, "expense")):
+            self.assertEqual(self.household.group_by(*args), Budget(self.combined).group_by(*args))
+
+    def test_large_profiles_use_worker_processes(self):
+        with patch.object(household, "PROCESS_MIN_ROWS", 1):
+            groups = self.household.group_by(("year", "category"), tx_type="expense")
+        self.assertEqual(groups, Budget(self.combined).group_by(("year", "category"), tx_type="expense"))
+        self.assertEqual(groups[(2025, "Food")]["count"], 3)
+        self.assertEqual(groups[(2025, "Food")]["max"], 60.0)
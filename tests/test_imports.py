@@ -0,0 +1,69 @@
+# tests/test_imports.py
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+from budgetbuddy.ui.main import BudgetBuddyApp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Prints the modules loaded by a statement and how long it took
+PROBE = """
+import json, sys, time
+before = set(sys.modules)
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"modules": sorted(set(sys.modules) - before), "elapsed": elapsed}}))
+"""
+
+
+def _probe(statement):
+    """Run statement in a fresh interpreter; returns (new module names, seconds)."""
+    out = subprocess.run([sys.executable, "-c", PROBE.format(statement=statement)],
+                         cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    result = json.loads(out)
+    return set(result["modules"]), result["elapsed"]
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_import_package_loads_nothing_heavy(self):
+        """import budgetbuddy must not pull in the UI, data layer or csv/json."""
+        modules, elapsed = _probe("import budgetbuddy")
+
+        self.assertEqual({m for m in modules if m.startswith("budgetbuddy")}, {"budgetbuddy", "budgetbuddy._lazy"})
+        for name in ("csv", "json", "pathlib", "budgetbuddy.core", "budgetbuddy.data"):
+            self.assertNotIn(name, modules)
+        # generous bound; typically a few milliseconds
+        self.assertLess(elapsed, 1.0)
+
+    def test_names_resolve_on_first_use(self):
+        modules, _ = _probe("from budgetbuddy.core import Income")
+
+        self.assertIn("budgetbuddy.core.models", modules)
+        self.assertNotIn("budgetbuddy.core.budget", modules)
+        self.assertNotIn("budgetbuddy.core.columnar", modules)
+
+        import budgetbuddy.data
+        self.assertTrue(callable(budgetbuddy.data.import_transactions_bulk))
+        with self.assertRaises(AttributeError):
+            budgetbuddy.data.no_such_name
+
+    def test_app_does_not_load_profiles_until_needed(self):
+        with patch("budgetbuddy.ui.main.repository.load_profiles", return_value={}) as mock_load, \
+             patch("builtins.input", side_effect=["1", "4"]), \
+             patch("builtins.print"):
+            app = BudgetBuddyApp()
+            app.run()
+            self.assertFalse(mock_load.called)
+
+            app.profiles
+            self.assertEqual(mock_load.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
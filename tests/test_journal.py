@@ -0,0 +1,85 @@
+# tests/test_journal.py
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from budgetbuddy.data import repository
+from budgetbuddy.core.models import Income, Expense
+
+
+class TestJournal(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.original_data_file = repository.DATA_FILE
+
+    @classmethod
+    def tearDownClass(cls):
+        repository.DATA_FILE = cls.original_data_file
+
+    def setUp(self):
+        # Each test gets its own snapshot + journal in a temp directory
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        repository.DATA_FILE = self.tmp_dir / "data.json"
+
+        self.profiles = {}
+        self.janet = repository.create_profile(self.profiles, "janet")
+        self.rent = Expense("2025-01-03", 800.0, "Rent", "January")
+        self.janet.add_transaction(self.rent)
+        repository.save_profiles(self.profiles)
+
+        self.journal = repository.open_journal(fsync=False)
+        self.journal.attach_all(self.profiles)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_changes_survive_without_a_save(self):
+        self.janet.add_transaction(Income("2025-01-01", 2000.0, "Salary"))
+        self.janet.edit_transaction(self.rent, amount=850.0)
+        snack = Expense("2025-01-09", 4.0, "Food", "Snack")
+        self.janet.add_transaction(snack)
+        self.janet.delete_transaction(snack)
+
+        # "Crash": nothing saved, reload from snapshot + journal
+        loaded = repository.load_profiles()
+        jan = loaded["janet"].list_transactions(1, 2025)
+
+        self.assertEqual([(tx.date, tx.amount) for tx in jan],
+                         [("2025-01-01", 2000.0), ("2025-01-03", 850.0)])
+        self.assertTrue(loaded["janet"].dirty)
+
+    def test_save_compacts_and_stale_journal_is_ignored(self):
+        self.janet.add_transaction(Income("2025-01-01", 2000.0, "Salary"))
+        base, records = self.journal.records()
+        self.assertEqual(len(records), 1)
+
+        # Simulate a crash after the snapshot was written but before the
+        # journal was reset: the journal still names the old snapshot
+        repository._save_single(repository.DATA_FILE, self.profiles)
+        loaded = repository.load_profiles()
+        self.assertEqual(len(loaded["janet"].transactions), 2)
+
+        # A normal save empties the journal
+        repository.save_profiles(self.profiles)
+        self.assertEqual(self.journal.records(), (repository.snapshot_token(), []))
+
+    def test_remove_duplicates_is_replayed(self):
+        self.janet.extend_transactions([Expense("2025-01-03", 800.0, "Rent", "January") for _ in range(2)])
+        self.janet.remove_duplicates()
+
+        loaded = repository.load_profiles()
+        self.assertEqual(len(loaded["janet"].transactions), 1)
+
+    def test_torn_last_line_is_ignored(self):
+        self.janet.add_transaction(Income("2025-01-01", 2000.0, "Salary"))
+        with open(self.journal.path, "a", encoding="utf-8") as f:
+            f.write('{"op": "add", "profile": "ja')
+
+        loaded = repository.load_profiles()
+        self.assertEqual(len(loaded["janet"].transactions), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,7 +7,7 @@ from contextlib import redirect_stdout
 from unittest.mock import patch
 
 from budgetbuddy.ui.main import BudgetBuddyApp
-from budgetbuddy.core.models import UserProfile
+from budgetbuddy.core.models import UserProfile, Income, Expense
 
 
 class TestBudgetBuddyApp(unittest.TestCase):
@@ -127,6 +127,67 @@ class TestBudgetBuddyApp(unittest.TestCase):
         self.assertIn("not a valid number", output)
         self.assertEqual(len(profile.transactions), 0)
 
+    def test_record_expense_flow_invalid_date_shows_error_and_skips(self):
+        profile = UserProfile("janet")
+
+        inputs = ["2025-13-01", "10", "Food", "Lunch"]
+        with patch("builtins.input", side_effect=inputs), \
+             patch("sys.stdout", new_callable=io.StringIO) as fake_out:
+
+            self.app.record_expense_flow(profile)
+
+        self.assertIn("Invalid date", fake_out.getvalue())
+        self.assertEqual(len(profile.transactions), 0)
+
+    def test_view_monthly_summaries_flow_prints_every_month(self):
+        profile = UserProfile("janet")
+        profile.add_transaction(Income("2025-03-01", 300.0, "Salary"))
+        profile.add_transaction(Expense("2025-03-02", 40.0, "Food"))
+
+        with patch("sys.stdout", new_callable=io.StringIO) as fake_out:
+            self.app.view_monthly_summaries_flow(profile)
+
+        output = fake_out.getvalue()
+        self.assertIn("January", output)
+        self.assertIn("December", output)
+        self.assertIn("Total income : 300.00", output)
+        self.assertIn("Total expense: 40.00", output)
+        self.assertIn("Spending by category", output)
+        self.assertIn("Largest expenses", output)
+
+    def test_view_year_transactions_flow_search(self):
+        profile = UserProfile("janet")
+        profile.add_transaction(Expense("{}-01-02".format(self.app.current_year), 4.5, "Food", "Coffee"))
+        profile.add_transaction(Expense("{}-01-03".format(self.app.current_year), 800.0, "Rent"))
+
+        inputs = ["s", "coff*", "d", "0", "y", "b"]
+        with patch("builtins.input", side_effect=inputs), \
+             patch("sys.stdout", new_callable=io.StringIO) as fake_out:
+            self.app.view_year_transactions_flow(profile)
+
+        # index 0 of the search results is the coffee, not the first transaction of the year
+        self.assertIn("Transactions matching 'coff*'", fake_out.getvalue())
+        self.assertEqual([tx.category for tx in profile.transactions], ["Rent"])
+
+    def test_transaction_changes_are_saved_on_quit_not_per_action(self):
+        self.app.profiles["janet"] = UserProfile("janet")
+        self.app.autosave.attach(self.app.profiles["janet"])
+        self.app.autosave.delay = 60
+
+        inputs = [
+            "3", "o", "janet",
+            "2", "2025-01-02", "12.5", "Food", "Lunch",
+            "6", "b",
+            "4",
+        ]
+        with patch("builtins.input", side_effect=inputs), \
+             patch("budgetbuddy.ui.main.repository.save_profiles", return_value=True) as mock_save, \
+             patch("sys.stdout", new_callable=io.StringIO):
+            self.app.run()
+
+        self.assertEqual(mock_save.call_count, 1)
+        self.assertEqual(len(self.app.profiles["janet"].transactions), 1)
+
     def test_change_year_flow_invalid_year_keeps_current(self):
         app = BudgetBuddyApp()
         original_year = app.current_year
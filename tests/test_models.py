@@ -48,8 +48,9 @@
 # tests/test_models.py
 
 import unittest
+from datetime import date
 
-from budgetbuddy.core.models import UserProfile, Income, Expense
+from budgetbuddy.core.models import UserProfile, Transaction, Income, Expense
 
 
 class TestUserProfile(unittest.TestCase):
@@ -116,6 +117,81 @@ class TestUserProfile(unittest.TestCase):
         # At least one of our known transactions from Jan 2025 appears
         self.assertTrue(any(tx.date.startswith("2025-01") for tx in recent))
 
+    def test_month_index_sorted_by_date(self):
+        """Month lookups come back in date order, and recent means latest by date."""
+        late = Expense("2025-01-20", 10.0, "Food", "Lunch")
+        early = Expense("2025-01-03", 5.0, "Food", "Coffee")
+        self.profile.add_transaction(late)
+        self.profile.add_transaction(early)
+
+        jan = self.profile.list_transactions(1, 2025)
+        self.assertEqual([tx.date for tx in jan],
+                         ["2025-01-01", "2025-01-03", "2025-01-05", "2025-01-20"])
+        self.assertEqual(self.profile.recent_transactions(1, 2025, 2), [self.t2, late])
+        self.assertEqual(len(self.profile.list_transactions(year=2025)), 6)
+
+        self.profile.delete_transaction(late)
+        self.assertNotIn(late, self.profile.list_transactions(1, 2025))
+
+    def test_edit_transaction_moves_between_months(self):
+        self.profile.edit_transaction(self.t4, date="2025-01-31", amount="75")
+
+        self.assertEqual(self.profile.list_transactions(3, 2025), [])
+        self.assertIs(self.profile.list_transactions(1, 2025)[-1], self.t4)
+        self.assertEqual(self.t4.amount, 75.0)
+
+    def test_iter_transactions_date_range(self):
+        txs = list(self.profile.iter_transactions("2025-01-02", "2025-03-01"))
+
+        self.assertEqual(txs, [self.t2, self.t3, self.t4])
+        self.assertEqual(len(list(self.profile.iter_transactions())), len(self.profile.transactions))
+        with self.assertRaises(ValueError):
+            list(self.profile.iter_transactions(start="01/02/2025"))
+
+    def test_extend_transactions_keeps_months_sorted(self):
+        ops = []
+        self.profile.listeners.append(lambda profile, op, tx, old: ops.append(op))
+        self.profile.extend_transactions([
+            Expense("2025-01-20", 10.0, "Food", "Lunch"),
+            Income("2025-01-02", 40.0, "Gift", "Birthday"),
+        ])
+
+        self.assertEqual(ops, ["add_many"])
+        self.assertEqual([tx.date for tx in self.profile.list_transactions(1, 2025)],
+                         ["2025-01-01", "2025-01-02", "2025-01-05", "2025-01-20"])
+        self.assertEqual(self.profile.month_summary(1, 2025)["income"],
+                         sum(tx.amount for tx in self.profile.list_transactions(1, 2025)
+                             if tx.get_type() == "income"))
+
+
+class TestTransaction(unittest.TestCase):
+    def test_date_parsed_once_and_malformed_rejected(self):
+        tx = Expense("2025-02-28", "12.5", "Food", "Lunch")
+
+        self.assertEqual(tx.date, "2025-02-28")
+        self.assertEqual(tx.ordinal, date(2025, 2, 28).toordinal())
+        self.assertEqual(tx.TYPE, "expense")
+        self.assertEqual(tx.get_type(), "expense")
+        self.assertFalse(hasattr(tx, "__dict__"))
+
+        for bad in ("2025-02-30", "2025/02/28", "20250228", "", None):
+            with self.assertRaises(ValueError):
+                Income(bad, 1.0, "Gift")
+
+    def test_categories_are_interned_and_round_trip(self):
+        a = Income("2025-01-01", 1.0, "".join(["Sal", "ary"]))
+        b = Income("2025-01-02", 2.0, "".join(["Sala", "ry"]))
+        self.assertIs(a.category, b.category)
+
+        copy = Transaction.from_dict(a.to_dict())
+        self.assertIsInstance(copy, Income)
+        self.assertEqual(copy.to_dict(), a.to_dict())
+        # dates saved in an older form are read, unreadable ones are an error (never dropped)
+        self.assertEqual(Transaction.from_dict({"date": "2025-1-5", "amount": 1, "category": "x"}).date,
+                         "2025-01-05")
+        with self.assertRaises(ValueError):
+            Transaction.from_dict({"date": "soon", "amount": 1, "category": "x", "type": "income"})
+
 
 if __name__ == "__main__":
     unittest.main()
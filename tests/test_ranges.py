@@ -0,0 +1,60 @@
+# tests/test_ranges.py
+
+import gc
+import unittest
+
+from budgetbuddy.core.budget import Budget
+from budgetbuddy.core.models import UserProfile, Income, Expense
+from budgetbuddy.core import ranges
+
+
+class TestRangeIndex(unittest.TestCase):
+    def setUp(self):
+        self.profile = UserProfile("janet")
+        self.profile.extend_transactions([
+            Income("2024-03-01", 2000.0, "Salary"),
+            Expense("2024-03-15", 800.0, "Rent"),
+            Expense("2024-12-24", 150.0, "Gifts"),
+            Income("2025-02-10", 100.0, "Refund"),
+            Expense("2025-02-11", 40.0, "Food"),
+        ])
+        self.budget = Budget(self.profile)
+
+    def test_range_totals_inclusive_bounds(self):
+        self.assertEqual(self.budget.range_totals("2024-03-15", "2025-02-10"),
+                         {"income": 100.0, "expense": 950.0, "net": -850.0})
+        self.assertEqual(self.budget.range_totals(end="2024-03-14")["net"], 2000.0)
+        self.assertEqual(self.budget.range_totals("2026-01-01")["income"], 0.0)
+        self.assertEqual(self.budget.range_totals("2025-01-01", "2024-01-01")["net"], 0.0)
+        with self.assertRaises(ValueError):
+            self.budget.range_totals("2024/03/15")
+
+    def test_appends_extend_sums_and_other_changes_rebuild(self):
+        index = ranges.range_index(self.profile)
+        self.budget.range_totals()
+
+        self.profile.add_transaction(Income("2025-03-01", 10.0, "Gift"))
+        self.assertFalse(index.stale)
+        self.assertEqual(self.budget.range_totals("2025-03-01")["income"], 10.0)
+
+        rent = self.profile.list_transactions(3, 2024)[1]
+        self.profile.edit_transaction(rent, amount=900.0)
+        self.assertTrue(index.stale)
+        self.assertEqual(self.budget.range_totals("2024-03-15", "2024-03-15")["expense"], 900.0)
+
+        self.profile.add_transaction(Expense("2024-06-01", 5.0, "Food"))
+        self.assertEqual(self.budget.range_totals("2024-06-01", "2024-06-30")["expense"], 5.0)
+
+    def test_columnar_profile_and_index_lifetime(self):
+        columnar = UserProfile.from_dict(self.profile.to_dict(), columnar=True)
+        self.assertEqual(Budget(columnar).range_totals("2024-03-15", "2025-02-10"),
+                         self.budget.range_totals("2024-03-15", "2025-02-10"))
+
+        count = len(ranges._indexes)
+        del columnar
+        gc.collect()
+        self.assertEqual(len(ranges._indexes), count - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
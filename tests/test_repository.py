@@ -1,5 +1,9 @@
 # tests/test_repository.py
 
+import json
+import shutil
+import threading
+import time
 import unittest
 from pathlib import Path
 
@@ -91,6 +95,118 @@ class TestRepository(unittest.TestCase):
         self.assertEqual(len(self.profiles), 1)
         self.assertEqual(self.profiles["keep"].name, "keep")
 
+    def test_lazy_load_decodes_profile_on_first_use(self):
+        p1 = repository.create_profile(self.profiles, "janet")
+        p1.add_transaction(Income("2025-01-01", 100.0, "Salary", "Jan pay"))
+        repository.save_profiles(self.profiles)
+
+        loaded = repository.load_profiles(lazy=True)
+        janet = loaded["janet"]
+
+        # Nothing decoded yet, and saving again does not force it
+        self.assertFalse(janet.is_loaded)
+        self.assertEqual(janet.to_dict(), p1.to_dict())
+        self.assertFalse(janet.is_loaded)
+
+        # First real use decodes the transactions
+        self.assertEqual(janet.list_transactions(1, 2025)[0].amount, 100.0)
+        self.assertTrue(janet.is_loaded)
+        self.assertEqual(len(janet.transactions), 1)
+
+    def test_legacy_dates_survive_load_and_save(self):
+        # Older versions saved dates exactly as they were typed
+        legacy = {"janet": {"name": "janet", "transactions": [
+            {"date": "2025-01-02", "amount": 5.0, "category": "Food", "description": "", "type": "expense"},
+            {"date": "2025-1-5", "amount": 100.0, "category": "Salary", "description": "", "type": "income"},
+        ]}}
+        for lazy in (False, True):
+            repository.DATA_FILE.write_text(json.dumps(legacy), encoding="utf-8")
+            loaded = repository.load_profiles(lazy=lazy)
+            self.assertEqual(len(loaded["janet"].transactions), 2)
+            loaded["janet"].dirty = True
+            repository.save_profiles(loaded)
+
+            saved = json.loads(repository.DATA_FILE.read_text(encoding="utf-8"))
+            self.assertEqual([tx["date"] for tx in saved["janet"]["transactions"]],
+                             ["2025-01-02", "2025-01-05"])
+
+    def test_unreadable_saved_date_is_an_error_not_a_lost_row(self):
+        records = [{"date": "yesterday", "amount": 5.0, "category": "Food", "type": "expense"}]
+        repository.DATA_FILE.write_text(json.dumps({"janet": {"name": "janet", "transactions": records}}),
+                                        encoding="utf-8")
+        with self.assertRaises(ProfileDataError):
+            repository.load_profiles()
+
+        # Lazily loaded: opening fails, but a save still writes the row back
+        loaded = repository.load_profiles(lazy=True)
+        with self.assertRaises(ValueError):
+            loaded["janet"].transactions
+        self.assertFalse(loaded["janet"].is_loaded)
+        repository.save_profiles(loaded)
+        saved = json.loads(repository.DATA_FILE.read_text(encoding="utf-8"))
+        self.assertEqual(saved["janet"]["transactions"], records)
+
+    def test_save_waits_for_profile_being_decoded(self):
+        records = [Income("2025-01-{:02d}".format(day), 10.0, "Salary").to_dict() for day in range(1, 29)]
+        decoding = threading.Event()
+
+        def load_records():
+            for i, record in enumerate(records):
+                if i == len(records) // 2:
+                    # Halfway through: let the "autosave" run, then take our time
+                    decoding.set()
+                    time.sleep(0.1)
+                yield record
+
+        janet = UserProfile.deferred("janet", load_records)
+        opener = threading.Thread(target=lambda: janet.transactions)
+        opener.start()
+        self.assertTrue(decoding.wait(2))
+
+        # A save from another thread never sees the half-decoded profile
+        self.assertEqual(len(janet.to_dict()["transactions"]), len(records))
+        opener.join()
+        self.assertTrue(janet.is_loaded)
+        self.assertEqual(len(janet.transactions), len(records))
+
+    def test_sharded_layout_saves_only_dirty_profiles(self):
+        data_dir = Path("test_budgetbuddy_shards")
+        repository.DATA_FILE = data_dir
+        try:
+            self._check_sharded_saves(data_dir)
+        finally:
+            repository.DATA_FILE = self.test_data_file
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    def _check_sharded_saves(self, data_dir):
+        janet = repository.create_profile(self.profiles, "janet")
+        trip = repository.create_profile(self.profiles, "trip")
+        janet.add_transaction(Income("2025-01-01", 100.0, "Salary", "Jan pay"))
+        repository.save_profiles(self.profiles)
+        self.assertFalse(janet.dirty or trip.dirty)
+
+        # Mark trip's file so we can tell whether it gets rewritten
+        trip_file = data_dir / repository.SHARD_DIR_NAME / trip.storage_key
+        trip_file.write_text('{"transactions": [], "untouched": true}', encoding="utf-8")
+
+        janet.add_transaction(Income("2025-02-01", 50.0, "Gift"))
+        self.assertTrue(janet.dirty)
+        repository.rename_profile(self.profiles, "trip", "holiday")
+        repository.save_profiles(self.profiles)
+
+        self.assertIn("untouched", trip_file.read_text(encoding="utf-8"))
+
+        loaded = repository.load_profiles(lazy=True)
+        self.assertEqual(set(loaded), {"janet", "holiday"})
+        self.assertFalse(loaded["janet"].is_loaded)
+        self.assertEqual(len(loaded["janet"].transactions), 2)
+
+        # Deleting a profile removes its file
+        repository.delete_profile(loaded, "holiday")
+        repository.save_profiles(loaded)
+        self.assertFalse(trip_file.exists())
+        self.assertEqual(set(repository.load_profiles()), {"janet"})
+
     def test_load_profiles_corrupted_json_raises_profiledataerror(self):
         """
         If DATA_FILE exists but contains invalid JSON, load_profiles
@@ -0,0 +1,61 @@
+# tests/test_search.py
+
+import unittest
+
+from budgetbuddy.core.models import UserProfile, Income, Expense
+from budgetbuddy.core.search import parse_query, search_index
+
+
+class TestSearch(unittest.TestCase):
+    def setUp(self):
+        self.profile = UserProfile("janet")
+        self.coffee = Expense("2025-01-02", 4.5, "Food", "Coffee at Joe's")
+        self.profile.extend_transactions([
+            Income("2025-01-01", 2000.0, "Salary", "ACME payroll"),
+            self.coffee,
+            Expense("2025-02-03", 800.0, "Rent", "February rent"),
+            Expense("2025-02-10", 3.0, "Food", "coffee beans"),
+            Expense("2024-12-24", 60.0, "Gifts", "Coffee grinder"),
+        ])
+
+    def descriptions(self, txs):
+        return [tx.description for tx in txs]
+
+    def test_parse_query(self):
+        self.assertEqual(parse_query("Coffee  joe's*"), [("coffee", False), ("joe", False), ("s", True)])
+        self.assertEqual(self.profile.search("   "), [])
+
+    def test_words_prefixes_and_dates(self):
+        self.assertEqual(self.descriptions(self.profile.search("COFFEE")),
+                         ["Coffee grinder", "Coffee at Joe's", "coffee beans"])
+        #every word must match, in the category or the description
+        self.assertEqual(self.descriptions(self.profile.search("food coffee")),
+                         ["Coffee at Joe's", "coffee beans"])
+        self.assertEqual(self.descriptions(self.profile.search("coff* be*")), ["coffee beans"])
+        self.assertEqual(self.descriptions(self.profile.search("coffee", "2025-01-01", "2025-01-31")),
+                         ["Coffee at Joe's"])
+        self.assertEqual(self.profile.search("coffe"), [])
+
+    def test_index_follows_changes(self):
+        index = search_index(self.profile)
+        self.assertEqual(len(self.profile.search("joe")), 1)
+
+        self.profile.edit_transaction(self.coffee, description="Latte")
+        self.assertEqual(self.profile.search("joe"), [])
+        self.assertNotIn("joe", index.words)
+        self.assertEqual(self.profile.search("latte"), [self.coffee])
+
+        self.profile.add_transaction(Expense("2025-03-01", 5.0, "Food", "Latte"))
+        self.profile.delete_transaction(self.coffee)
+        self.assertEqual(self.descriptions(self.profile.search("lat*")), ["Latte"])
+        self.assertEqual(index.words, sorted(index.postings))
+
+    def test_columnar_profile_matches(self):
+        columnar = UserProfile.from_dict(self.profile.to_dict(), columnar=True)
+        for query in ("coffee", "food coffee", "coff* be*", "rent"):
+            self.assertEqual([tx.to_dict() for tx in columnar.search(query, end="2025-02-28")],
+                             [tx.to_dict() for tx in self.profile.search(query, end="2025-02-28")])
+
+        #new strings are picked up on the next search
+        columnar.add_transaction(Expense("2025-03-01", 5.0, "Food", "Espresso"))
+        self.assertEqual(self.descriptions(columnar.search("espresso")), ["Espresso"])
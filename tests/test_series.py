@@ -0,0 +1,71 @@
+# tests/test_series.py
+
+import unittest
+from unittest.mock import patch
+
+from budgetbuddy.core import series
+from budgetbuddy.core.budget import Budget
+from budgetbuddy.core.models import UserProfile, Income, Expense
+
+
+class TestCashFlowSeries(unittest.TestCase):
+    def setUp(self):
+        self.profile = UserProfile("janet")
+        self.profile.extend_transactions([
+            Income("2024-12-20", 100.0, "Gift"),
+            Income("2025-01-01", 2000.0, "Salary"),
+            Expense("2025-01-06", 800.0, "Rent"),
+            Expense("2025-01-07", 50.0, "Food"),
+            Expense("2025-03-02", 30.0, "Food"),
+        ])
+        self.budget = Budget(self.profile)
+
+    def test_monthly_series_fills_gaps_and_keeps_balance(self):
+        flow = self.budget.cash_flow("month", start="2025-01-01")
+
+        self.assertEqual(flow.periods, ["2025-01", "2025-02", "2025-03"])
+        self.assertEqual(flow.income, [2000.0, 0.0, 0.0])
+        self.assertEqual(flow.net, [1150.0, 0.0, -30.0])
+        self.assertEqual(flow.opening, 100.0)
+        self.assertEqual(flow.balance, [1250.0, 1250.0, 1220.0])
+        self.assertEqual(flow.rolling_mean(2), [None, 575.0, -15.0])
+
+    def test_daily_and_weekly_periods(self):
+        weekly = self.budget.cash_flow("week", "2025-01-01", "2025-01-12")
+        self.assertEqual(weekly.periods, ["2024-12-30", "2025-01-06"])
+        self.assertEqual(weekly.expense, [0.0, 850.0])
+
+        daily = self.budget.cash_flow("day", "2025-01-05", "2025-01-07")
+        self.assertEqual([row[0] for row in daily.rows()], ["2025-01-05", "2025-01-06", "2025-01-07"])
+        self.assertEqual(daily.rolling_mean(5), [None, None, None])
+        with self.assertRaises(ValueError):
+            self.budget.cash_flow("year")
+
+    def test_columnar_profile_matches(self):
+        columnar = UserProfile.from_dict(self.profile.to_dict(), columnar=True)
+        expected = self.budget.cash_flow("week")
+        flow = Budget(columnar).cash_flow("week")
+
+        self.assertEqual(flow.periods, expected.periods)
+        self.assertEqual(flow.balance, expected.balance)
+
+    @unittest.skipIf(series.np is None, "NumPy is not installed")
+    def test_numpy_and_python_paths_agree(self):
+        # series.cash_flow directly: through Budget the second call would be a cache hit
+        for freq in series.FREQUENCIES:
+            fast = series.cash_flow(self.profile, freq)
+            with patch.object(series, "np", None):
+                slow = series.cash_flow(self.profile, freq)
+                slow_mean = slow.rolling_mean(3)
+            self.assertEqual(fast.periods, slow.periods)
+            for a, b in zip(fast.net, slow.net):
+                self.assertAlmostEqual(a, b)
+            for a, b in zip(fast.rolling_mean(3), slow_mean):
+                if a is None or b is None:
+                    self.assertIs(a, b)
+                else:
+                    self.assertAlmostEqual(a, b)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+# tests/test_snapshot.py
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from budgetbuddy.core.budget import Budget
+from budgetbuddy.core.models import UserProfile, Income, Expense
+from budgetbuddy.data import repository, snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.original_data_file = repository.DATA_FILE
+
+    @classmethod
+    def tearDownClass(cls):
+        repository.DATA_FILE = cls.original_data_file
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.profiles = {"janet": UserProfile("janet"), "trip": UserProfile("trip", columnar=True)}
+        self.profiles["janet"].add_transaction(Expense("2025-01-03", 800.0, "Rent", "January"))
+        self.profiles["janet"].add_transaction(Income("2025-01-01", 2000.0, "Salary"))
+        self.profiles["trip"].add_transaction(Expense("2025-06-01", 120.5, "Hotel", "Rome"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_write_and_lazy_read(self):
+        path = self.tmp_dir / "data.bbs"
+        snapshot.write_snapshot(self.profiles, path)
+
+        loaded = snapshot.read_snapshot(path)
+        janet = loaded["janet"]
+
+        self.assertEqual(set(loaded), {"janet", "trip"})
+        self.assertFalse(janet.is_loaded)
+        self.assertTrue(janet.columnar)
+        # rows come back in date order, totals are rebuilt from the columns
+        self.assertEqual([tx.date for tx in janet.transactions], ["2025-01-01", "2025-01-03"])
+        self.assertEqual(Budget(janet).month_totals(1, 2025)["net"], 1200.0)
+        self.assertEqual(loaded["trip"].to_dict(), self.profiles["trip"].to_dict())
+
+    def test_repository_picks_format_by_suffix_and_converts(self):
+        json_path = self.tmp_dir / "data.json"
+        bbs_path = self.tmp_dir / "data.bbs"
+        repository.DATA_FILE = json_path
+        repository.save_profiles(self.profiles)
+
+        self.assertTrue(repository.convert_data_file(json_path, bbs_path))
+        repository.DATA_FILE = bbs_path
+        loaded = repository.load_profiles(lazy=True)
+        self.assertEqual(loaded["trip"].list_transactions(6, 2025)[0].description, "Rome")
+
+        # saving back through the repository keeps the binary format
+        loaded["trip"].add_transaction(Expense("2025-06-02", 30.0, "Food"))
+        repository.save_profiles(loaded)
+        self.assertEqual(len(repository.load_profiles()["trip"].transactions), 2)
+
+        back = self.tmp_dir / "back.json"
+        repository.convert_data_file(bbs_path, back)
+        self.assertIn('"Hotel"', back.read_text(encoding="utf-8"))
+
+    def test_not_a_snapshot_raises(self):
+        path = self.tmp_dir / "data.bbs"
+        path.write_bytes(b"definitely not a snapshot file")
+        repository.DATA_FILE = path
+
+        with self.assertRaises(repository.ProfileDataError):
+            repository.load_profiles()
+
+    def test_truncated_snapshot_raises(self):
+        path = self.tmp_dir / "data.bbs"
+        snapshot.write_snapshot(self.profiles, path)
+        full = path.read_bytes()
+        # rows come back in date order, so compare against the whole file read back
+        expected = {name: p.to_dict() for name, p in snapshot.read_snapshot(path).items()}
+
+        path.write_bytes(full[:-40])
+        with self.assertRaises(snapshot.SnapshotError):
+            snapshot.read_snapshot(path)
+        repository.DATA_FILE = path
+        with self.assertRaises(repository.ProfileDataError):
+            repository.load_profiles(lazy=True)
+
+        # wherever the file is cut, it is refused or (only padding lost) reads back whole
+        for size in range(len(full)):
+            path.write_bytes(full[:size])
+            try:
+                loaded = snapshot.read_snapshot(path)
+            except snapshot.SnapshotError:
+                continue
+            self.assertEqual({name: p.to_dict() for name, p in loaded.items()}, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+# tests/test_sqlite_repository.py
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from budgetbuddy.core.budget import Budget
+from budgetbuddy.core.models import UserProfile, Income, Expense
+from budgetbuddy.data import sqlite_repository
+
+
+class TestSQLiteRepository(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.original_db_file = sqlite_repository.DB_FILE
+
+    @classmethod
+    def tearDownClass(cls):
+        sqlite_repository.DB_FILE = cls.original_db_file
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        sqlite_repository.DB_FILE = self.tmp_dir / "data.db"
+        self.profiles = {}
+
+    def tearDown(self):
+        sqlite_repository.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_create_save_and_query_month(self):
+        janet = sqlite_repository.create_profile(self.profiles, "janet")
+        janet.add_transaction(Income("2025-01-01", 2000.0, "Salary", "Jan pay"))
+        rent = Expense("2025-01-03", 800.0, "Rent")
+        janet.add_transaction(rent)
+        janet.add_transaction(Expense("2025-02-03", 800.0, "Rent"))
+        janet.edit_transaction(rent, amount=850.0)
+        self.assertTrue(sqlite_repository.save_profiles(self.profiles))
+
+        # Reopen: month queries are answered by SQL
+        sqlite_repository.close()
+        loaded = sqlite_repository.load_profiles()
+        budget = Budget(loaded["janet"])
+
+        self.assertEqual(budget.month_totals(1, 2025), {"income": 2000.0, "expense": 850.0, "net": 1150.0})
+        self.assertEqual([tx.amount for tx in budget.month_transactions(2, 2025)], [800.0])
+        self.assertEqual(budget.year_summary(2025)[2]["net"], -800.0)
+        self.assertEqual(len(loaded["janet"].list_transactions(year=2025)), 3)
+        self.assertEqual([r[0] for r in loaded["janet"].iter_records(start="2025-01-02")],
+                         ["2025-01-03", "2025-02-03"])
+        self.assertEqual(budget.range_totals("2025-01-01", "2025-01-31"),
+                         {"income": 2000.0, "expense": 850.0, "net": 1150.0})
+        self.assertEqual([tx.amount for tx in budget.top_expenses(1, year=2025)], [850.0])
+        self.assertEqual([tx.date for tx in budget.latest_transactions(2)], ["2025-01-03", "2025-02-03"])
+
+    def test_rename_delete_and_uncommitted_changes(self):
+        sqlite_repository.create_profile(self.profiles, "old")
+        sqlite_repository.create_profile(self.profiles, "keep")
+        sqlite_repository.save_profiles(self.profiles)
+
+        sqlite_repository.rename_profile(self.profiles, "old", "new")
+        self.profiles["new"].add_transaction(Income("2025-03-01", 5.0, "Gift"))
+        sqlite_repository.delete_profile(self.profiles, "keep")
+        self.assertEqual(set(self.profiles), {"new"})
+
+        # Closing without save_profiles throws the changes away
+        sqlite_repository.close()
+        self.assertEqual(set(sqlite_repository.load_profiles()), {"old", "keep"})
+
+    def test_save_copies_in_memory_profiles(self):
+        plain = UserProfile("trip")
+        plain.add_transaction(Expense("2025-06-01", 120.0, "Hotel"))
+        self.profiles["trip"] = plain
+
+        sqlite_repository.save_profiles(self.profiles)
+
+        self.assertIsInstance(self.profiles["trip"], sqlite_repository.SQLiteProfile)
+        loaded = sqlite_repository.load_profiles()
+        self.assertEqual(loaded["trip"].to_dict(), plain.to_dict())
+
+    def test_search(self):
+        janet = sqlite_repository.create_profile(self.profiles, "janet")
+        janet.add_transaction(Expense("2025-01-02", 4.5, "Food", "Coffee 100%"))
+        janet.add_transaction(Expense("2025-02-02", 3.0, "Food", "coffeehouse"))
+        janet.add_transaction(Expense("2025-02-03", 800.0, "Rent"))
+
+        self.assertEqual([tx.description for tx in janet.search("coffee")], ["Coffee 100%"])
+        self.assertEqual([tx.description for tx in janet.search("coff*", start="2025-02-01")], ["coffeehouse"])
+        self.assertEqual([tx.category for tx in janet.search("food 100")], ["Food"])
+
+    def test_remove_duplicates(self):
+        janet = sqlite_repository.create_profile(self.profiles, "janet")
+        janet.extend_transactions([Expense("2025-01-02", 4.5, "Food", "Coffee") for _ in range(3)])
+        janet.add_transaction(Income("2025-01-01", 2000.0, "Salary"))
+
+        removed = janet.remove_duplicates()
+
+        self.assertEqual(len(removed), 2)
+        self.assertEqual([tx.category for tx in janet.transactions], ["Food", "Salary"])
+        self.assertEqual(janet.remove_duplicates(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,7 +6,20 @@ from test_repository import TestRepository
 from test_csvio import TestCsvIO
 from test_summary import TestSummary
 from test_main import TestBudgetBuddyApp
-from test_models import TestUserProfile
+from test_models import TestUserProfile, TestTransaction
+from test_columnar import TestColumnarProfile
+from test_journal import TestJournal
+from test_sqlite_repository import TestSQLiteRepository
+from test_snapshot import TestSnapshot
+from test_autosave import TestAutoSaver
+from test_imports import TestLazyImports
+from test_ranges import TestRangeIndex
+from test_series import TestCashFlowSeries
+from test_validation import TestValidation
+from test_duplicates import TestDuplicates
+from test_search import TestSearch
+from test_household import TestHousehold
+from test_benchmarks import TestBenchmarks
 
 
 
@@ -21,6 +34,20 @@ def suite():
         TestSummary,
         TestBudgetBuddyApp,
         TestUserProfile,
+        TestTransaction,
+        TestColumnarProfile,
+        TestJournal,
+        TestSQLiteRepository,
+        TestSnapshot,
+        TestAutoSaver,
+        TestLazyImports,
+        TestRangeIndex,
+        TestCashFlowSeries,
+        TestValidation,
+        TestDuplicates,
+        TestSearch,
+        TestHousehold,
+        TestBenchmarks,
     ):
         test_suite.addTests(loader.loadTestsFromTestCase(test_class))
 
@@ -5,6 +5,7 @@ import unittest
 from contextlib import redirect_stdout
 
 from budgetbuddy.ui import summary
+from budgetbuddy.core.budget import Budget
 from budgetbuddy.core.models import UserProfile, Income, Expense
 
 
@@ -70,6 +71,18 @@ class TestSummary(unittest.TestCase):
         self.assertIn("Food", out2)
         self.assertIn("2025-03-01", out2)
 
+    def test_print_group_summary(self):
+        groups = Budget(self.profile).group_by(("category", "type"), year=2025)
+
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            summary.print_group_summary(groups)
+        out = buf.getvalue()
+
+        self.assertIn("count", out)
+        self.assertIn("Food / expense", out)
+        self.assertIn("300.00", out)
+
 
 if __name__ == "__main__":
     unittest.main()
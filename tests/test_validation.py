@@ -0,0 +1,54 @@
+# tests/test_validation.py
+
+import unittest
+
+from budgetbuddy.core import validation
+from budgetbuddy.core.budget import Budget
+from budgetbuddy.core.models import UserProfile, Income, Expense
+
+
+class TestValidation(unittest.TestCase):
+    def setUp(self):
+        self.profile = UserProfile("janet")
+        self.profile.extend_transactions([
+            Income("2025-01-01", 2000.0, "Salary"),
+            Expense("2025-01-06", -800.0, "Rent"),
+            Expense("2025-01-07", float("nan"), "Food"),
+            Expense("2025-01-08", 12.5, "  "),
+            Expense("0205-03-02", 30.0, "Food"),
+        ])
+        self.budget = Budget(self.profile)
+
+    def test_valid_transaction(self):
+        self.assertTrue(self.budget.valid_transaction(Income("2025-01-01", 10.0, "Job")))
+        self.assertFalse(self.budget.valid_transaction(Expense("2025-01-01", -1.0, "Food")))
+        self.assertFalse(self.budget.valid_transaction(Expense("2025-01-01", 1.0, "Food"), end="2024-12-31"))
+
+    def test_report_lists_problems_per_row(self):
+        report = self.budget.validate()
+
+        self.assertEqual(report.checked, 5)
+        self.assertFalse(report.ok)
+        self.assertEqual(report.rows, {
+            1: [validation.NEGATIVE],
+            2: [validation.NOT_FINITE],
+            3: [validation.EMPTY_CATEGORY],
+            4: [validation.OUT_OF_RANGE],
+        })
+        self.assertEqual(report.counts()[validation.NEGATIVE], 1)
+
+        #a batch that has not been added yet, with a custom date range
+        batch = [Income("2025-02-01", 5.0, "Gift"), Income("2026-01-01", 5.0, "Gift")]
+        report = self.budget.validate(batch, start="2025-01-01", end="2025-12-31")
+        self.assertEqual(report.rows, {1: [validation.OUT_OF_RANGE]})
+        self.assertTrue(self.budget.validate(batch).ok)
+
+    def test_columnar_profile_matches(self):
+        columnar = UserProfile.from_dict(self.profile.to_dict(), columnar=True)
+        #rows of a columnar profile are in date order
+        expected = validation.validate_transactions(columnar.transactions)
+
+        report = Budget(columnar).validate()
+        self.assertEqual(report.checked, 5)
+        self.assertEqual(report.rows, expected.rows)
+        self.assertEqual(report.counts(), self.budget.validate().counts())